@@ -0,0 +1,51 @@
+# Throughput of the error responses with every serializer, through the whole flask request cycle
+# and for the serialization alone (ValidationException.pretty_print).
+# Run with: PYTHONPATH=. python benchmarks/error_response.py
+import timeit
+import importlib.util
+from flask import Flask
+
+from flaskvel import Flaskvel, Serializers, ValidationException, validate_no_validator
+from flaskvel.ErrorSerializer import ErrorSerializer
+
+rules = {
+	'username': 'required|string|min:3|max:32',
+	'email': 'required|email',
+	'password': 'required|string|min:8|confirmed',
+	'age': 'required|integer|min:18',
+	'tags': 'array|max:5',
+}
+
+payload = {'username': 'a', 'email': 'not an email', 'password': 'short', 'age': 'x', 'tags': [1, 2, 3, 4, 5, 6]}
+
+def create_app(serializer):
+	app = Flask(__name__)
+	Flaskvel(app, serializer=serializer)
+
+	@app.route('/register', methods=['POST'])
+	@validate_no_validator(rules)
+	def register():
+		return 'ok'
+
+	return app
+
+def measure(serializer, number=2000):
+	app = create_app(serializer)
+	client = app.test_client()
+	errors = client.post('/register', json=payload).get_json()['errors']
+	requests_time = min(timeit.repeat(lambda: client.post('/register', json=payload), number=number, repeat=5))
+	with app.app_context():
+		exception = ValidationException(errors)
+		serialize_time = min(timeit.repeat(exception.pretty_print, number=number * 10, repeat=5))
+	return number / requests_time, number * 10 / serialize_time
+
+if __name__ == '__main__':
+	serializers = [Serializers.FLASK, Serializers.JSON]
+	# orjson is optional, its case is skipped when it isn't installed
+	if importlib.util.find_spec('orjson') is not None:
+		serializers.append(Serializers.ORJSON)
+	print('{0:<8} {1:>14} {2:>18}'.format('', 'requests/s', 'pretty_print/s'))
+	for serializer in serializers:
+		requests_rate, serialize_rate = measure(serializer)
+		print('{0:<8} {1:>14.0f} {2:>18.0f}'.format(serializer, requests_rate, serialize_rate))
+	ErrorSerializer.configure()
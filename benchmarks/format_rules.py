@@ -0,0 +1,48 @@
+# Compares the format rules handlers against the previous implementation,
+# which compiled the pattern inside the handler on every call.
+# Run from the root of the repository: PYTHONPATH=. python benchmarks/format_rules.py
+import re
+import timeit
+
+from flaskvel.Processor import Processor
+from flaskvel.Constants.Patterns import Patterns
+
+NUMBER = 100000
+
+samples = {
+	'alpha': ['HelloWorld', 'Hello World', 'Hello1'],
+	'alpha_dash': ['hello_world', 'HelloWorld', 'hello!'],
+	'alpha_num': ['Hello1234', 'Hello 1234', 'Hello!'],
+	'email': ['john.doe@example.com', 'john.doe'],
+	'ipv4': ['192.168.1.1', '999.1.1.1'],
+	'ipv6': ['2001:db8:85a3::8a2e:370:7334', 'fe80::7:8%eth0', 'not an ip'],
+	'url': ['https://example.com/path?query=1', 'example'],
+	'uuid': ['123e4567-e89b-12d3-a456-426614174000', '123e4567'],
+}
+
+def previous_handler(rule):
+	pattern = Patterns[rule]
+	def handler(value):
+		try:
+			return re.compile(pattern.pattern, pattern.flags).match(value) is not None
+		except:
+			return False
+	return handler
+
+def measure(func):
+	return min(timeit.repeat(func, number=NUMBER, repeat=3)) / NUMBER * 1e9
+
+def main():
+	processor = Processor.__new__(Processor)
+	print('{0:<12} {1:<40} {2:>10} {3:>10} {4:>8}'.format('rule', 'value', 'before ns', 'after ns', 'speedup'))
+	for rule, values in samples.items():
+		before = previous_handler(rule)
+		after = getattr(processor, 'handler_' + rule)
+		for value in values:
+			assert before(value) == after(field_name='field', value=value)
+			before_ns = measure(lambda: before(value))
+			after_ns = measure(lambda: after(field_name='field', value=value))
+			print('{0:<12} {1:<40} {2:>10.0f} {3:>10.0f} {4:>7.1f}x'.format(rule, value, before_ns, after_ns, before_ns / after_ns))
+
+if __name__ == '__main__':
+	main()
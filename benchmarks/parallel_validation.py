@@ -0,0 +1,42 @@
+# Compares Validator.validate_many in the calling process with ParallelValidation.
+# Run with: PYTHONPATH=. python benchmarks/parallel_validation.py
+import os
+import time
+
+from flaskvel import Validator
+from flaskvel.ParallelValidation import ParallelValidation
+
+rules = {
+	'sku': 'required|string|size:8',
+	'name': 'required|string|max:100',
+	'price': 'required|numeric|min:0',
+	'stock': 'nullable|integer',
+	'category': 'required|in:books,music,games',
+	'email': 'nullable|email',
+}
+
+records = [
+	{
+		'sku': 'SKU{0:05d}'.format(i % 100000),
+		'name': 'Product {0}'.format(i),
+		'price': i % 50,
+		'stock': None if i % 3 else i,
+		'category': ['books', 'music', 'games', 'food'][i % 4],
+		'email': 'seller{0}@example.com'.format(i) if i % 7 else 'not an email',
+	}
+	for i in range(200000)
+]
+
+def measure(label):
+	start = time.perf_counter()
+	errors = Validator.validate_many(records, rules=rules)
+	print('{0:<24} {1:.2f}s'.format(label, time.perf_counter() - start))
+	return errors
+
+if __name__ == '__main__':
+	print('{0} records, {1} cpus'.format(len(records), os.cpu_count()))
+	expected = measure('single process')
+	ParallelValidation.configure(enabled=True, threshold=50000, chunk_size=10000)
+	ParallelValidation.get_executor().submit(int).result() # the workers are started once per application
+	assert measure('process pool') == expected
+	ParallelValidation.shutdown()
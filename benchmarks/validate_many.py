@@ -0,0 +1,58 @@
+# Compares Validator.validate_many with validating every record through its own request and validator.
+# Run with: PYTHONPATH=. python benchmarks/validate_many.py
+import timeit
+
+from flaskvel import Flaskvel, Validator
+
+class RecordRequest():
+	def __init__(self, record):
+		self.json = record
+		self.form = {}
+		self.files = {}
+		self.is_json = True
+
+class ProductValidator(Validator):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.rules = {
+			'sku': 'required|string|size:8',
+			'name': 'required|string|max:100',
+			'price': 'required|numeric|min:0',
+			'stock': 'nullable|integer',
+			'category': 'required|in:books,music,games',
+			'email': 'nullable|email',
+		}
+
+records = [
+	{
+		'sku': 'SKU{0:05d}'.format(i),
+		'name': 'Product {0}'.format(i),
+		'price': i % 50,
+		'stock': None if i % 3 else i,
+		'category': ['books', 'music', 'games', 'food'][i % 4],
+		'email': 'seller{0}@example.com'.format(i) if i % 7 else 'not an email',
+	}
+	for i in range(10000)
+]
+
+def validate_one_by_one():
+	errors = []
+	for record in records:
+		try:
+			ProductValidator(RecordRequest(record)).validate()
+			errors.append({})
+		except Flaskvel._exception_class as e:
+			errors.append(e.args[0])
+	return errors
+
+def validate_many():
+	return ProductValidator.validate_many(records)
+
+if __name__ == '__main__':
+	assert validate_one_by_one() == validate_many()
+	for compile_rules in [False, True]:
+		Flaskvel._compile_rules = compile_rules
+		print('compile_rules={0}'.format(compile_rules))
+		for benchmark in [validate_one_by_one, validate_many]:
+			seconds = min(timeit.repeat(benchmark, number=1, repeat=3))
+			print('  {0:<20} {1:8.1f} records/s'.format(benchmark.__name__, len(records) / seconds))
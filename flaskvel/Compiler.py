@@ -0,0 +1,205 @@
+import operator
+from werkzeug.datastructures import FileStorage # comes packaged with flask
+
+from .Constants.RulesPredicates import RulesPredicates
+from .Constants.FailModes import FailModes
+from .Processor import Processor
+from .WildcardFields import WildcardFields
+
+def _is_integer(value):
+	if isinstance(value, int):
+		return True
+	try:
+		int(value)
+		return True
+	except:
+		return False
+
+def _is_numeric(value):
+	if isinstance(value, int) or isinstance(value, float):
+		return True
+	try:
+		float(value)
+		return True
+	except:
+		return False
+
+# Turns parsed rules into the source code of a single function equivalent to Processor._run:
+# handlers are resolved once, simple predicates are inlined and constant params are converted upfront.
+# The rules of a field are laid out from the same plan as Processor._validate_field (see Processor.plan_field)
+# and the errors are recorded through Processor._end_field, so the outcome can't differ from the interpreter.
+class Compiler():
+	# predicate -> (inlined check, keys of err_msg_params); {params} is replaced by the constant params tuple
+	_inline_checks = {
+		RulesPredicates.ACCEPTED: ("value in _ACCEPTED", ['field_name']),
+		RulesPredicates.BOOLEAN: ("(isinstance(value, bool) or value in _BOOLEANS)", ['field_name']),
+		RulesPredicates.FILE: ("isinstance(value, FileStorage)", ['field_name']),
+		RulesPredicates.IN: ("value in {params}", ['all_params', 'field_name']),
+		RulesPredicates.INTEGER: ("_is_integer(value)", ['field_name']),
+		RulesPredicates.NOT_IN: ("value not in {params}", ['all_params', 'field_name']),
+		RulesPredicates.NUMERIC: ("_is_numeric(value)", ['field_name']),
+		RulesPredicates.STRING: ("isinstance(value, str)", ['field_name']),
+	}
+
+	# predicate -> operators applied to the size of the field, one for every int param
+	_size_checks = {
+		RulesPredicates.BETWEEN: [operator.ge, operator.le],
+		RulesPredicates.MAX: [operator.le],
+		RulesPredicates.MIN: [operator.ge],
+		RulesPredicates.SIZE: [operator.eq],
+	}
+
+	def __init__(self, parsed_rules, fail_mode=FailModes.COLLECT_ALL):
+		self._parsed_rules = parsed_rules
+		self._fail_mode = fail_mode
+		self._namespace = {
+			'FileStorage': FileStorage,
+			'_ACCEPTED': ('yes', 1, '1', 'on', True, 'true'),
+			'_BOOLEANS': (1, 0, '1', '0', True, False, 'true', 'false'),
+			'_is_integer': _is_integer,
+			'_is_numeric': _is_numeric,
+		}
+		self._lines = []
+
+	@staticmethod
+	def compile(parsed_rules, fail_mode=FailModes.COLLECT_ALL):
+		return Compiler(parsed_rules, fail_mode)._compile()
+
+	def get_source(self):
+		return '\n'.join(self._lines)
+
+	def _compile(self):
+		self._emit(0, 'def validate(processor):')
+		self._emit(1, 'get_field_value = processor.get_field_value')
+		self._emit(1, 'end_field = processor._end_field')
+		self._emit(1, 'compare_size = processor._compare_single_field_size')
+		self._emit(1, 'validation_passed = True')
+		wildcard_groups = WildcardFields.group(self._parsed_rules)
+		plans = Processor.plan_fields(self._parsed_rules, self._fail_mode)
+		if wildcard_groups:
+			self._emit(1, 'run_wildcard_group = processor._run_wildcard_group')
+		for field_index, field_name in enumerate(self._parsed_rules):
+			if field_name in wildcard_groups:
+				group = wildcard_groups[field_name]
+				if group is not None:
+					self._compile_wildcard_group(field_index, group[0], Processor.plan_wildcard_fields(group[1], plans))
+				continue
+			self._compile_field(field_index, field_name, plans[field_name])
+		self._emit(1, 'return validation_passed')
+
+		code = compile(self.get_source(), '<flaskvel compiled rules>', 'exec')
+		exec(code, self._namespace)
+		validate = self._namespace['validate']
+		validate.source = self.get_source()
+		return validate
+
+	def _compile_field(self, field_index, field_name, plan):
+		rules, nullable, stop, first_per_field, checks = plan
+		field = self._constant('F{0}'.format(field_index), field_name)
+		rules_name = self._constant('R{0}'.format(field_index), rules)
+		first_check = True
+
+		self._emit(1, '# {0}'.format(field_name.replace('\n', ' ')))
+		self._emit(1, 'value = get_field_value({0})'.format(field))
+		self._emit(1, 'failed_validations = {}')
+		for rule_index, (parsed_rule, predicate_name, params, compiled_params, handler, is_method, null_tolerant) in enumerate(checks):
+			prefix = 'P{0}_{1}'.format(field_index, rule_index)
+			params_name = self._constant(prefix, params)
+			compiled_params_name = self._constant(prefix + '_compiled', compiled_params)
+
+			if not is_method: # registered rules and callables
+				check, err_msg_params = self._compile_handler_call(prefix, handler, False, field, compiled_params_name, nullable, rules_name)
+			elif predicate_name in self._inline_checks:
+				check, err_msg_params = self._compile_inline_check(prefix, predicate_name, field, params)
+			elif predicate_name in self._size_checks:
+				check, err_msg_params = self._compile_size_check(prefix, predicate_name, field, params)
+			else:
+				check, err_msg_params = self._compile_handler_call(prefix, handler, True, field, compiled_params_name, nullable, rules_name)
+
+			conditions = []
+			if null_tolerant:
+				conditions.append('value is not None')
+			if first_per_field and not first_check:
+				# the rest of the rules are skipped after the first error of the field
+				conditions.append('not failed_validations')
+			first_check = False
+			if conditions:
+				self._emit(1, 'if {0}:'.format(' and '.join(conditions)))
+				indent = 2
+			else:
+				indent = 1
+			predicate = self._constant(prefix + '_predicate', predicate_name)
+			if err_msg_params is None:
+				# the handler fills err_msg_params itself
+				self._emit(indent, 'err_msg_params = {}')
+				self._emit(indent, 'if not {0}:'.format(check))
+				self._emit(indent + 1, 'failed_validations[{0}] = [{1}, err_msg_params]'.format(predicate, params_name))
+			else:
+				self._emit(indent, 'if not {0}:'.format(check))
+				self._emit(indent + 1, 'failed_validations[{0}] = [{1}, {2}]'.format(predicate, params_name, err_msg_params))
+			if stop:
+				self._emit(indent + 1, 'end_field({0}, failed_validations, True)'.format(field))
+				self._emit(indent + 1, 'return False')
+
+		self._emit(1, 'if failed_validations:')
+		self._emit(2, 'validation_passed = False')
+		self._emit(2, 'if end_field({0}, failed_validations, False)[1]:'.format(field))
+		self._emit(3, 'return False')
+
+	# The elements of a list vary from one request to another, they are validated by the processor
+	# which walks the list once for all the fields of the group
+	def _compile_wildcard_group(self, field_index, list_field, fields):
+		self._emit(1, '# {0}'.format(', '.join(field[0] for field in fields).replace('\n', ' ')))
+		list_field = self._constant('G{0}'.format(field_index), list_field)
+		fields = self._constant('G{0}_fields'.format(field_index), fields)
+		self._emit(1, 'passed, stopped = run_wildcard_group({0}, {1})'.format(list_field, fields))
+		self._emit(1, 'if not passed:')
+		self._emit(2, 'validation_passed = False')
+		self._emit(1, 'if stopped:')
+		self._emit(2, 'return False')
+
+	def _compile_handler_call(self, prefix, handler, is_method, field, params, nullable, rules_name):
+		handler_name = self._constant(prefix + '_handler', handler)
+		return '{0}({1}field_name={2}, value=value, params={3}, nullable={4}, err_msg_params=err_msg_params, processor=processor, rules={5})'.format(
+			handler_name, 'processor, ' if is_method else '', field, params, nullable, rules_name), None
+
+	def _compile_inline_check(self, prefix, rule_predicate, field, params):
+		check, err_msg_keys = self._inline_checks[rule_predicate]
+		check = check.format(params=self._constant(prefix + '_tuple', tuple(params)))
+		return check, self._compile_err_msg_params(err_msg_keys, field, prefix)
+
+	def _compile_size_check(self, prefix, rule_predicate, field, params):
+		operators = self._size_checks[rule_predicate]
+		sizes = self._convert_params(params, [int for _ in operators], rule_predicate)
+		checks = []
+		for i, (size, size_operator) in enumerate(zip(sizes, operators)):
+			checks.append('compare_size({0}, {1}, {2})'.format(
+				field, size, self._constant('{0}_operator{1}'.format(prefix, i), size_operator)))
+		return '(' + ' and '.join(checks) + ')', self._compile_err_msg_params(['field_name'], field, prefix)
+
+	def _compile_err_msg_params(self, keys, field, params):
+		entries = []
+		for key in keys:
+			if key == 'field_name':
+				entries.append("'field_name': {0}".format(field))
+			elif key == 'all_params':
+				entries.append("'all_params': {0}".format(params))
+		return '{' + ', '.join(entries) + '}'
+
+	def _convert_params(self, params, params_types, rule_predicate):
+		if len(params) < len(params_types):
+			raise Exception('Rule <{0}> requires at least {1} parameter.'.format(rule_predicate, len(params_types)))
+		converted = []
+		for i in range(len(params_types)):
+			try:
+				converted.append(params_types[i](params[i]))
+			except:
+				raise Exception('Rule <{0}> requires parameter number {1} to be of type {2}.'.format(rule_predicate, i+1, params_types[i].__name__))
+		return converted
+
+	def _constant(self, name, value):
+		self._namespace[name] = value
+		return name
+
+	def _emit(self, indent, line):
+		self._lines.append('\t' * indent + line)
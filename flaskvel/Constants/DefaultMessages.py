@@ -17,6 +17,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have between {0} and {1} characters.',
 		FieldTypes.ARRAY: 'The {field_name} field must have between {0} and {1} items.',
 		FieldTypes.JSON: 'The {field_name} field must have between {0} and {1} keys.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be between {0} and {1}.',
 	},
 	'boolean': 'The {field_name} field must be true or false.',
 	'confirmed': 'The {field_name} field does not match it\'s confirmation.',
@@ -38,6 +39,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have more characters than {0} field.',
 		FieldTypes.ARRAY: 'The {field_name} field must have more items than {0} field.',
 		FieldTypes.JSON: 'The {field_name} field must have more keys than {0} field.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be greater than {0} field.',
 	},
 	'gte': {
 		FieldTypes.NUMERIC: 'The {field_name} field must be greater than or equal to {0} field.',
@@ -45,6 +47,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have at least the same number of characters as {0} field.',
 		FieldTypes.ARRAY: 'The {field_name} field must have at least the same number of items as {0} field.',
 		FieldTypes.JSON: 'The {field_name} field must have at least the same number of keys as {0} field.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be greater than or equal to {0} field.',
 	},
 	'image': 'The {field_name} field must be an image.',
 	'in': 'The {field_name} field must be one of the values: {all_params}.',
@@ -60,6 +63,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have less characters than {0} field.',
 		FieldTypes.ARRAY: 'The {field_name} field must have less items than {0} field.',
 		FieldTypes.JSON: 'The {field_name} field must have less keys than {0} field.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be lower than {0} field.',
 	},
 	'lte': {
 		FieldTypes.NUMERIC: 'The {field_name} field must lower than or equal to {0} field.',
@@ -67,6 +71,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have at most the same number of characters as {0} field.',
 		FieldTypes.ARRAY: 'The {field_name} field must have at most the same number of items as {0} field.',
 		FieldTypes.JSON: 'The {field_name} field must have at most the same number of keys as {0} field.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be lower than or equal to {0} field.',
 	},
 	'max': {
 		FieldTypes.NUMERIC: 'The {field_name} field must be lower than {0}.',
@@ -74,6 +79,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have less than {0} characters.',
 		FieldTypes.ARRAY: 'The {field_name} field must have less than {0} items.',
 		FieldTypes.JSON: 'The {field_name} field must have less than {0} keys.',
+		FieldTypes.UNKOWN: 'The {field_name} field must not be greater than {0}.',
 	},
 	'mimetypes': 'The {field_name} field must be a file of type: {0}.',
 	'min': {
@@ -82,6 +88,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have more than {0} characters.',
 		FieldTypes.ARRAY: 'The {field_name} field must have more than {0} items.',
 		FieldTypes.JSON: 'The {field_name} field must have more than {0} keys.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be at least {0}.',
 	},
 	'not_in': 'The {field_name} field must not exist in {all_params}.',
 	'not_in_array': 'The {field_name} field must not exist in {0}\'s values.',
@@ -103,6 +110,7 @@ DefaultMessages = {
 		FieldTypes.STRING: 'The {field_name} field must have {0} characters.',
 		FieldTypes.ARRAY: 'The {field_name} field must have {0} items.',
 		FieldTypes.JSON: 'The {field_name} field must have {0} keys.',
+		FieldTypes.UNKOWN: 'The {field_name} field must be of size {0}.',
 	},
 	'starts_with': 'The {field_name} field must start with one of the following: {all_params}',
 	'string': 'The {field_name} field must be a string.',
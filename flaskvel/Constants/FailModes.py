@@ -0,0 +1,4 @@
+class FailModes():
+	COLLECT_ALL = 'collect_all' # every rule of every field is checked
+	FIRST_PER_FIELD = 'first_per_field' # the other rules of a field are skipped after its first error
+	STOP_AT_FIRST = 'stop_at_first' # the validation stops at the first error
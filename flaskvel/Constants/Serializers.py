@@ -0,0 +1,4 @@
+class Serializers():
+	FLASK = 'flask' # flask.jsonify, uses the JSON provider of the app
+	JSON = 'json' # compact json.dumps
+	ORJSON = 'orjson' # requires orjson to be installed
@@ -0,0 +1,3 @@
+class TimezoneProviders():
+	PYTZ = 'pytz'
+	ZONEINFO = 'zoneinfo'
@@ -0,0 +1,118 @@
+from types import MappingProxyType
+
+from .Constants.RulesPredicates import RulesPredicates
+
+# Fields referenced by the rules of other fields (required_if:other,value, same:other, gt:other...).
+# Built once per schema, it can be used to find references to undeclared fields or circular references.
+# The processor resolves the referenced fields when a rule needs them, once per request (see Processor._field_values).
+class DependencyGraph():
+	# predicate -> function returning the referenced fields from (field_name, params)
+	_references = {
+		RulesPredicates.CONFIRMED: lambda field_name, params: ['{0}_confirmation'.format(field_name)],
+		RulesPredicates.DIFFERENT: lambda field_name, params: params,
+		RulesPredicates.GT: lambda field_name, params: params[:1],
+		RulesPredicates.GTE: lambda field_name, params: params[:1],
+		RulesPredicates.IN_ARRAY: lambda field_name, params: params[:1],
+		RulesPredicates.LT: lambda field_name, params: params[:1],
+		RulesPredicates.LTE: lambda field_name, params: params[:1],
+		RulesPredicates.NOT_IN_ARRAY: lambda field_name, params: params[:1],
+		RulesPredicates.REQUIRED_IF: lambda field_name, params: params[:1],
+		RulesPredicates.REQUIRED_UNLESS: lambda field_name, params: params[:1],
+		RulesPredicates.REQUIRED_WITH: lambda field_name, params: params,
+		RulesPredicates.REQUIRED_WITH_ALL: lambda field_name, params: params,
+		RulesPredicates.REQUIRED_WITHOUT: lambda field_name, params: params,
+		RulesPredicates.REQUIRED_WITHOUT_ALL: lambda field_name, params: params,
+		RulesPredicates.SAME: lambda field_name, params: params,
+	}
+
+	# comparisons of two values, fields referencing each other with them don't depend on each other
+	_symmetric_references = frozenset([RulesPredicates.SAME, RulesPredicates.DIFFERENT])
+
+	def __init__(self, parsed_rules):
+		self._fields = tuple(parsed_rules.keys())
+		self._edges = {} # field -> {referenced field -> [predicates]}
+		self._referrers = {} # referenced field -> [fields]
+		for field_name, rules in parsed_rules.items():
+			for parsed_rule in rules:
+				predicate = parsed_rule.get_predicate()
+				if parsed_rule.has_unregistered_handler() or predicate not in DependencyGraph._references:
+					continue
+				for referenced_field in DependencyGraph._references[predicate](field_name, parsed_rule.get_params()):
+					self._add_edge(field_name, referenced_field, predicate)
+		self._resolution_order, self._cycles = self._sort()
+
+	def _add_edge(self, field_name, referenced_field, predicate):
+		predicates = self._edges.setdefault(field_name, {}).setdefault(referenced_field, [])
+		if predicate not in predicates:
+			predicates.append(predicate)
+		referrers = self._referrers.setdefault(referenced_field, [])
+		if field_name not in referrers:
+			referrers.append(field_name)
+
+	# Returns {referenced field: [predicates]} for the rules of field_name
+	def get_references(self, field_name):
+		return MappingProxyType(self._edges.get(field_name, {}))
+
+	# Returns the fields whose rules reference field_name
+	def get_referrers(self, field_name):
+		return tuple(self._referrers.get(field_name, []))
+
+	def get_referenced_fields(self):
+		return tuple(self._referrers.keys())
+
+	# The referenced fields, each one after the fields it references itself (same/different references aside)
+	def get_resolution_order(self):
+		return self._resolution_order
+
+	# Referenced fields without rules of their own, usually a misspelled field name
+	# (the confirmation field of the confirmed rule usually has no rules, so it is not reported)
+	def get_undeclared_references(self):
+		undeclared = []
+		for referenced_field, referrers in self._referrers.items():
+			if referenced_field in self._fields:
+				continue
+			confirmation = referenced_field.endswith('_confirmation') and all(
+				RulesPredicates.CONFIRMED in self._edges[referrer].get(referenced_field, [])
+				for referrer in referrers)
+			if not confirmation:
+				undeclared.append(referenced_field)
+		return tuple(undeclared)
+
+	# Each cycle is a tuple of fields, the first one references the second and so on, the last one references the first.
+	# References made only with same/different aren't part of the cycles.
+	def get_cycles(self):
+		return self._cycles
+
+	def _get_dependencies(self, field_name):
+		return [
+			referenced_field for referenced_field, predicates in self._edges.get(field_name, {}).items()
+			if any(predicate not in DependencyGraph._symmetric_references for predicate in predicates)
+		]
+
+	def _sort(self):
+		# depth first search over the referenced fields, references are visited before their referrers
+		order = []
+		cycles = []
+		state = {} # field -> 1 while being visited, 2 once visited
+		for root in self._referrers.keys():
+			if root in state:
+				continue
+			path = []
+			stack = [(root, iter(self._get_dependencies(root)))]
+			state[root] = 1
+			path.append(root)
+			while stack:
+				field_name, references = stack[-1]
+				referenced_field = next(references, None)
+				if referenced_field is None:
+					stack.pop()
+					path.pop()
+					state[field_name] = 2
+					order.append(field_name)
+				elif referenced_field not in state:
+					state[referenced_field] = 1
+					path.append(referenced_field)
+					stack.append((referenced_field, iter(self._get_dependencies(referenced_field))))
+				elif state[referenced_field] == 1:
+					cycles.append(tuple(path[path.index(referenced_field):]))
+		return tuple(order), tuple(cycles)
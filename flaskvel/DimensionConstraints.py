@@ -0,0 +1,57 @@
+import re
+
+# Constraints of the dimensions rule, parsed once from params like 'min_width=100' or 'ratio=3/2'.
+# Images are checked with integer arithmetic only.
+class DimensionConstraints():
+	_param = re.compile(r'(min_width|max_width|min_height|max_height|width|height)=(\d+)|(ratio)=(\d+)/(\d+)')
+
+	def __init__(self, params):
+		self._params = list(params)
+		self.min_width = None
+		self.max_width = None
+		self.min_height = None
+		self.max_height = None
+		self.width = None
+		self.height = None
+		self.ratio = None # (width, height)
+
+	def get_params(self):
+		return self._params
+
+	@staticmethod
+	def parse(params):
+		constraints = DimensionConstraints(params)
+		invalid_params = []
+		for param in params:
+			match = DimensionConstraints._param.fullmatch(param) if isinstance(param, str) else None
+			if match is None:
+				invalid_params.append(param)
+			elif match.group(3) is not None:
+				ratio = (int(match.group(4)), int(match.group(5)))
+				if ratio[0] == 0 or ratio[1] == 0:
+					invalid_params.append(param)
+				else:
+					constraints.ratio = ratio
+			else:
+				setattr(constraints, match.group(1), int(match.group(2)))
+		if invalid_params:
+			raise ValueError(str(invalid_params))
+		return constraints
+
+	def check(self, width, height):
+		if self.min_width is not None and width < self.min_width:
+			return False
+		if self.max_width is not None and width > self.max_width:
+			return False
+		if self.min_height is not None and height < self.min_height:
+			return False
+		if self.max_height is not None and height > self.max_height:
+			return False
+		if self.width is not None and width != self.width:
+			return False
+		if self.height is not None and height != self.height:
+			return False
+		# width / ratio_width == height / ratio_height, without float division
+		if self.ratio is not None and width * self.ratio[1] != height * self.ratio[0]:
+			return False
+		return True
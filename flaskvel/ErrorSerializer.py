@@ -0,0 +1,69 @@
+import json
+from flask import current_app, has_app_context, jsonify
+
+from .Constants.Serializers import Serializers
+
+# Turns the errors of a failed validation into the body of the response.
+# The envelope around the errors never changes, so it is encoded once and only the errors are serialized for every response.
+class ErrorSerializer():
+	status = 'Validation failure'
+
+	_serializer = Serializers.FLASK
+	_dumps = None # errors -> str or bytes, None when flask.jsonify is used
+	_envelope = None # (encoded prefix, encoded suffix)
+
+	@staticmethod
+	def configure(serializer=Serializers.FLASK):
+		if serializer == Serializers.FLASK:
+			dumps = None
+		elif serializer == Serializers.JSON:
+			dumps = ErrorSerializer._dumps_json
+		elif serializer == Serializers.ORJSON:
+			import orjson # optional dependency, only needed by this serializer
+			dumps = orjson.dumps
+		elif callable(serializer):
+			dumps = serializer
+		else:
+			raise Exception("Invalid serializer: {0}".format(serializer))
+		ErrorSerializer._serializer = serializer
+		ErrorSerializer._dumps = dumps
+		# the keys are in the order used by jsonify, which sorts them
+		ErrorSerializer._envelope = (
+			b'{"errors":',
+			',"status":{0}}}'.format(json.dumps(ErrorSerializer.status)).encode('utf-8'),
+		)
+
+	@staticmethod
+	def make_response(errors):
+		if ErrorSerializer._dumps is None:
+			return jsonify({
+				'status': ErrorSerializer.status,
+				'errors': errors
+			})
+		return current_app.response_class(ErrorSerializer.encode(errors), mimetype='application/json')
+
+	# The body of the response for errors, as bytes
+	@staticmethod
+	def encode(errors):
+		if ErrorSerializer._dumps is None:
+			if has_app_context():
+				return ErrorSerializer.make_response(errors).get_data()
+			# what jsonify returns outside of the debug mode
+			return (json.dumps({'status': ErrorSerializer.status, 'errors': errors}, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+		body = ErrorSerializer._dumps(errors)
+		if isinstance(body, str):
+			body = body.encode('utf-8')
+		prefix, suffix = ErrorSerializer._envelope
+		return prefix + body + suffix
+
+	# True when the active serializer escapes the characters that aren't ASCII, as json.dumps does by default;
+	# also for the custom serializers, whose output is then over-estimated rather than under-estimated
+	@staticmethod
+	def escapes_non_ascii():
+		if ErrorSerializer._dumps is None:
+			return getattr(current_app.json, 'ensure_ascii', True) if has_app_context() else True
+		return ErrorSerializer._serializer not in (Serializers.JSON, Serializers.ORJSON)
+
+	@staticmethod
+	def _dumps_json(value):
+		return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,6 @@
+# Raised while the body is being parsed, as soon as a file is larger than its max/size/between rule allows
+class UploadTooLargeException(Exception):
+	def __init__(self, field_name, parsed_rule):
+		super().__init__('Upload of field {0} exceeds rule <{1}>'.format(field_name, parsed_rule.get_predicate()))
+		self.field_name = field_name
+		self.parsed_rule = parsed_rule
@@ -1,4 +1,4 @@
-from flask import jsonify
+from ..ErrorSerializer import ErrorSerializer
 
 class ValidationException(Exception):
 	def __init__(self, message):
@@ -6,7 +6,4 @@ class ValidationException(Exception):
 		self._message = message
 
 	def pretty_print(self):
-		return jsonify({
-			'status': 'Validation failure',
-			'errors': self._message
-		})
\ No newline at end of file
+		return ErrorSerializer.make_response(self._message)
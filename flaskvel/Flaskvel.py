@@ -1,8 +1,17 @@
 import traceback
+from flask import make_response
 from werkzeug.exceptions import BadRequest
 
 from .Constants.RulesPredicates import RulesPredicates
+from .Constants.TimezoneProviders import TimezoneProviders
+from .Constants.FailModes import FailModes
+from .Constants.Serializers import Serializers
 from .Exceptions.ValidationException import ValidationException
+from .Timezones import Timezones
+from .UrlChecker import UrlChecker
+from .ParallelValidation import ParallelValidation
+from .ErrorSerializer import ErrorSerializer
+from .MessageCatalogs import MessageCatalogs
 
 class Flaskvel():
 	_error_code = 400
@@ -21,10 +30,48 @@ class Flaskvel():
 	]
 
 	_exception_class = ValidationException
+	_compile_rules = False
+	_fail_mode = FailModes.COLLECT_ALL
+	_optimize_rules = False # see RuleOptimizer
+	_max_drain_size = 64 * 1024 # bytes
+	_limit_uploads = True
+	_max_failed_fields = None # the validation stops once this many fields failed
+	_max_field_errors = None # messages kept per field
+	_max_errors_size = None # bytes, of the body of the response holding the errors
+	_truncation_key = '_truncated'
+	_truncation_message = 'Too many errors, some of them were left out.'
+	_locale = MessageCatalogs.default_locale # of the default messages, see MessageCatalogs
+	_locale_selector = None # request -> locale, None for Flaskvel._locale
 
-	def __init__(self, app, exception_class=ValidationException, error_code=400):
+	def __init__(self, app, exception_class=ValidationException, error_code=400, compile_rules=False,
+		timezone_provider=TimezoneProviders.PYTZ, preload_timezones=False, active_url_options=None,
+		max_drain_size=64 * 1024, limit_uploads=True, fail_mode=FailModes.COLLECT_ALL,
+		optimize_rules=False, parallel_options=None, serializer=Serializers.FLASK,
+		max_failed_fields=None, max_field_errors=None, max_errors_size=None,
+		locale=MessageCatalogs.default_locale, locale_selector=None):
+		for name, limit in [('max_failed_fields', max_failed_fields), ('max_field_errors', max_field_errors), ('max_errors_size', max_errors_size)]:
+			if limit is not None and limit < 1:
+				raise Exception("{0} must be at least 1".format(name))
 		Flaskvel._error_code = error_code
 		Flaskvel._exception_class = exception_class
+		Flaskvel._compile_rules = compile_rules
+		Flaskvel._max_drain_size = max_drain_size
+		Flaskvel._limit_uploads = limit_uploads
+		Flaskvel._fail_mode = fail_mode
+		Flaskvel._optimize_rules = optimize_rules
+		Flaskvel._max_failed_fields = max_failed_fields
+		Flaskvel._max_field_errors = max_field_errors
+		Flaskvel._max_errors_size = max_errors_size
+		Flaskvel._locale = locale
+		Flaskvel._locale_selector = locale_selector
+		Timezones.configure(timezone_provider, preload_timezones)
+		ErrorSerializer.configure(serializer)
+		if max_errors_size is not None and max_errors_size < len(ErrorSerializer.encode({Flaskvel._truncation_key: [Flaskvel._truncation_message]})):
+			raise Exception("max_errors_size is too small to hold the truncation marker")
+		if active_url_options is not None:
+			UrlChecker.configure(**active_url_options)
+		if parallel_options is not None:
+			ParallelValidation.configure(**parallel_options)
 		app.register_error_handler(
 			exception_class,
 			Flaskvel._error_handler
@@ -37,7 +84,7 @@ class Flaskvel():
 	@staticmethod
 	def _error_handler(exception):
 		if isinstance(exception, ValidationException):
-			return exception.pretty_print(), Flaskvel._error_code
+			return make_response(exception.pretty_print(), Flaskvel._error_code)
 		else:
 			traceback.print_exc()
 			return exception, Flaskvel._error_code
@@ -52,4 +99,10 @@ class Flaskvel():
 		if not is_null_tolerant:
 			Flaskvel._null_intolerant_rules.append(rule)
 
-		Flaskvel._registered_rules[rule] = handler
\ No newline at end of file
+		Flaskvel._registered_rules[rule] = handler
+
+	# source: a module name (holding a Messages dict), the path of a JSON file, a function returning
+	# the messages or the messages themselves. The catalog is only loaded when the locale is first used.
+	@staticmethod
+	def register_catalog(locale, source):
+		MessageCatalogs.register(locale, source)
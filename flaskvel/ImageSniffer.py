@@ -0,0 +1,206 @@
+import os
+import struct
+
+# Reads the format and the size of an image from its header, without decoding it.
+# PNG, JPEG, GIF, WebP and BMP are handled here, Pillow is imported only for the other formats.
+class ImageSniffer():
+	header_size = 32 # bytes read to identify the format
+	svg_prolog_size = 64 * 1024 # bytes of XML declaration, comments and DOCTYPE skipped before the <svg root element
+	max_jpeg_segments = 1000 # markers skipped before giving up on a JPEG file
+
+	PNG = 'png'
+	JPEG = 'jpeg'
+	GIF = 'gif'
+	WEBP = 'webp'
+	BMP = 'bmp'
+	SVG = 'svg'
+
+	# start of frame markers, the others (DHT, JPG, DAC) don't hold the size of the image
+	_jpeg_sof_markers = frozenset([0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF])
+	# markers without a length
+	_jpeg_standalone_markers = frozenset([0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8])
+	# sizes of the known DIB headers (BITMAPCOREHEADER, BITMAPINFOHEADER... BITMAPV5HEADER)
+	_bmp_dib_header_sizes = frozenset([12, 40, 52, 56, 64, 108, 124])
+
+	@staticmethod
+	def get_format(file):
+		return ImageSniffer._with_stream(file, ImageSniffer._read_format)
+
+	# Returns (width, height) or None if the file isn't an image
+	@staticmethod
+	def get_dimensions(file):
+		result = ImageSniffer._with_stream(file, ImageSniffer._read_dimensions)
+		if result is None:
+			result = ImageSniffer._with_stream(file, ImageSniffer._read_dimensions_with_pillow)
+		return result
+
+	# Runs reader on the stream from its beginning and restores the position afterwards
+	@staticmethod
+	def _with_stream(file, reader):
+		stream = getattr(file, 'stream', file)
+		if not hasattr(stream, 'read') or not hasattr(stream, 'seek'):
+			return None
+		try:
+			position = stream.tell()
+			stream.seek(0)
+		except (OSError, ValueError):
+			return None
+		try:
+			return reader(stream)
+		finally:
+			stream.seek(position)
+
+	@staticmethod
+	def _read_format(stream):
+		header = stream.read(ImageSniffer.header_size)
+		image_format = ImageSniffer._match_format(header)
+		if image_format is None and ImageSniffer._is_svg(stream, header):
+			return ImageSniffer.SVG
+		return image_format
+
+	@staticmethod
+	def _match_format(header):
+		if header[:8] == b'\x89PNG\r\n\x1a\n':
+			return ImageSniffer.PNG
+		if header[:3] == b'\xff\xd8\xff':
+			return ImageSniffer.JPEG
+		if header[:6] in (b'GIF87a', b'GIF89a'):
+			return ImageSniffer.GIF
+		if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+			return ImageSniffer.WEBP
+		# BM alone is too common (any text starting with it), the DIB header must be valid as well
+		if header[:2] == b'BM' and len(header) >= 26 and ImageSniffer._read_bmp_dimensions(header) is not None:
+			return ImageSniffer.BMP
+		return None
+
+	# The root element must be <svg, after the optional XML declaration, processing instructions, comments and DOCTYPE
+	@staticmethod
+	def _is_svg(stream, header):
+		data = header
+		position = len(data) - len(data.lstrip(b'\xef\xbb\xbf'))
+		while True:
+			while position < len(data) and data[position:position + 1] in b' \t\r\n':
+				position += 1
+			if data.startswith(b'<?', position):
+				end = data.find(b'?>', position + 2)
+				end = -1 if end < 0 else end + 2
+			elif data.startswith(b'<!--', position):
+				end = data.find(b'-->', position + 4)
+				end = -1 if end < 0 else end + 3
+			elif data[position:position + 9].upper() == b'<!DOCTYPE':
+				end = ImageSniffer._find_doctype_end(data, position + 9)
+			elif len(data) - position >= 5:
+				return data[position:position + 4].lower() == b'<svg' and data[position + 4:position + 5] in b' \t\r\n>/:'
+			else:
+				end = -1
+			if end >= 0:
+				position = end
+				continue
+			# the current node goes on after what was read so far
+			if len(data) >= ImageSniffer.svg_prolog_size:
+				return False
+			chunk = stream.read(min(4096, ImageSniffer.svg_prolog_size - len(data)))
+			if not chunk:
+				return False
+			data += chunk
+
+	# Returns the position after the DOCTYPE, or -1 when its end wasn't read yet
+	@staticmethod
+	def _find_doctype_end(data, position):
+		end = data.find(b'>', position)
+		subset = data.find(b'[', position)
+		if subset >= 0 and (end < 0 or subset < end):
+			# the internal subset may hold > characters
+			subset_end = data.find(b']', subset)
+			if subset_end < 0:
+				return -1
+			end = data.find(b'>', subset_end)
+		return -1 if end < 0 else end + 1
+
+	@staticmethod
+	def _read_dimensions(stream):
+		header = stream.read(ImageSniffer.header_size)
+		image_format = ImageSniffer._match_format(header)
+		if image_format == ImageSniffer.PNG:
+			if header[12:16] != b'IHDR':
+				return None
+			return ImageSniffer._positive(struct.unpack('>II', header[16:24]))
+		if image_format == ImageSniffer.GIF:
+			return ImageSniffer._positive(struct.unpack('<HH', header[6:10]))
+		if image_format == ImageSniffer.BMP:
+			return ImageSniffer._read_bmp_dimensions(header)
+		if image_format == ImageSniffer.WEBP:
+			return ImageSniffer._read_webp_dimensions(header)
+		if image_format == ImageSniffer.JPEG:
+			return ImageSniffer._read_jpeg_dimensions(stream)
+		return None
+
+	@staticmethod
+	def _read_bmp_dimensions(header):
+		header_size = struct.unpack('<I', header[14:18])[0]
+		if header_size not in ImageSniffer._bmp_dib_header_sizes:
+			return None
+		if header_size == 12: # OS/2 BITMAPCOREHEADER
+			return ImageSniffer._positive(struct.unpack('<HH', header[18:22]))
+		width, height = struct.unpack('<ii', header[18:26])
+		# a negative height is used by top-down bitmaps
+		return ImageSniffer._positive((width, abs(height)))
+
+	@staticmethod
+	def _read_webp_dimensions(header):
+		chunk = header[12:16]
+		if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a' and len(header) >= 30:
+			width, height = struct.unpack('<HH', header[26:30])
+			return ImageSniffer._positive((width & 0x3FFF, height & 0x3FFF))
+		if chunk == b'VP8L' and header[20:21] == b'\x2f' and len(header) >= 25:
+			bits = struct.unpack('<I', header[21:25])[0]
+			return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+		if chunk == b'VP8X' and len(header) >= 30:
+			width = int.from_bytes(header[24:27], 'little') + 1
+			height = int.from_bytes(header[27:30], 'little') + 1
+			return (width, height)
+		return None
+
+	# Walks the segments up to the first start of frame, the others are skipped without being read
+	@staticmethod
+	def _read_jpeg_dimensions(stream):
+		stream.seek(2)
+		for _ in range(ImageSniffer.max_jpeg_segments):
+			marker = stream.read(2)
+			if len(marker) < 2 or marker[0] != 0xFF:
+				return None
+			while marker[1] == 0xFF: # fill bytes
+				marker = marker[1:] + stream.read(1)
+				if len(marker) < 2:
+					return None
+			if marker[1] in ImageSniffer._jpeg_standalone_markers:
+				continue
+			length = stream.read(2)
+			if len(length) < 2:
+				return None
+			length = struct.unpack('>H', length)[0]
+			if length < 2:
+				return None
+			if marker[1] in ImageSniffer._jpeg_sof_markers:
+				frame = stream.read(5)
+				if len(frame) < 5:
+					return None
+				height, width = struct.unpack('>HH', frame[1:5])
+				return ImageSniffer._positive((width, height))
+			stream.seek(length - 2, os.SEEK_CUR)
+		return None
+
+	@staticmethod
+	def _read_dimensions_with_pillow(stream):
+		from PIL import Image # heavy import, only needed for uncommon formats
+		try:
+			with Image.open(stream) as image:
+				return image.size
+		except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+			return None
+
+	@staticmethod
+	def _positive(dimensions):
+		if dimensions[0] <= 0 or dimensions[1] <= 0:
+			return None
+		return dimensions
@@ -0,0 +1,110 @@
+import json
+import importlib
+import string
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from .Constants.DefaultMessages import DefaultMessages
+
+# The default messages of every locale. A catalog is only loaded the first time its locale is used,
+# its templates are checked and completed with the ones of the default locale, and the least recently
+# used catalogs are dropped when there are more than cache_size of them.
+class MessageCatalogs():
+	default_locale = 'en'
+	cache_size = 8
+
+	# locale -> source: a module name (imported when needed, holding a Messages dict),
+	# the path of a JSON file, a function returning the messages or the messages themselves
+	_sources = {}
+	_catalogs = OrderedDict() # locale -> catalog
+	_lock = threading.Lock()
+
+	@staticmethod
+	def register(locale, source):
+		if not isinstance(source, (str, dict)) and not callable(source):
+			raise Exception("A catalog must be a module name, the path of a JSON file, a function or a dictionary")
+		with MessageCatalogs._lock:
+			MessageCatalogs._sources[locale] = source
+			MessageCatalogs._catalogs.pop(locale, None)
+
+	@staticmethod
+	def clear_cache():
+		with MessageCatalogs._lock:
+			MessageCatalogs._catalogs.clear()
+
+	# A source of the catalog of locale that can be sent to other processes (see ParallelValidation),
+	# None for the default locale
+	@staticmethod
+	def get_portable_source(locale):
+		source = MessageCatalogs._sources.get(locale)
+		if source is None or isinstance(source, (str, dict)):
+			return source
+		catalog = MessageCatalogs.get(locale)
+		return {predicate: dict(message) if isinstance(message, dict) else message
+			for predicate, message in catalog.items()}
+
+	# False when locale uses the messages of the default locale
+	@staticmethod
+	def has_catalog(locale):
+		return locale != MessageCatalogs.default_locale and locale in MessageCatalogs._sources
+
+	# Returns the read-only messages of locale, the ones of the default locale when it has no catalog
+	@staticmethod
+	def get(locale):
+		if not MessageCatalogs.has_catalog(locale):
+			return MessageCatalogs._default_catalog
+		with MessageCatalogs._lock:
+			catalog = MessageCatalogs._catalogs.get(locale)
+			if catalog is not None:
+				MessageCatalogs._catalogs.move_to_end(locale)
+				return catalog
+			source = MessageCatalogs._sources[locale]
+		# loaded outside of the lock, two threads may load the same catalog at once but the result is the same
+		catalog = MessageCatalogs.compile(MessageCatalogs._load(source), locale)
+		with MessageCatalogs._lock:
+			MessageCatalogs._catalogs[locale] = catalog
+			while len(MessageCatalogs._catalogs) > MessageCatalogs.cache_size:
+				MessageCatalogs._catalogs.popitem(last=False)
+		return catalog
+
+	# Checks the templates of messages and completes them with the default ones
+	@staticmethod
+	def compile(messages, locale, defaults=DefaultMessages):
+		catalog = {}
+		for predicate, default in defaults.items():
+			message = messages.get(predicate, default)
+			if isinstance(default, dict) and isinstance(message, dict):
+				# types missing from the translation keep their default message
+				message = dict(default, **message)
+			catalog[predicate] = message
+		for predicate, message in messages.items():
+			if predicate not in catalog:
+				catalog[predicate] = dict(message) if isinstance(message, dict) else message
+		for predicate, message in catalog.items():
+			for template in (message.values() if isinstance(message, dict) else [message]):
+				MessageCatalogs._check_template(template, locale, predicate)
+		return MappingProxyType(catalog)
+
+	@staticmethod
+	def _check_template(template, locale, predicate):
+		try:
+			if not isinstance(template, str):
+				raise ValueError('not a string')
+			for _ in string.Formatter().parse(template):
+				pass
+		except ValueError as e:
+			raise Exception("Invalid message for the rule <{0}> of the locale <{1}>: {2}".format(predicate, locale, e))
+
+	@staticmethod
+	def _load(source):
+		if isinstance(source, dict):
+			return source
+		if callable(source):
+			return source()
+		if source.endswith('.json'):
+			with open(source, encoding='utf-8') as file:
+				return json.load(file)
+		return importlib.import_module(source).Messages
+
+MessageCatalogs._default_catalog = MessageCatalogs.compile({}, MessageCatalogs.default_locale)
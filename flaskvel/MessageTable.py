@@ -0,0 +1,47 @@
+import warnings
+
+from .Constants.DefaultMessages import DefaultMessages
+from .Constants.RulesPredicates import RulesPredicates
+
+# The message template of every rule of every field, resolved once from the custom messages of the validator
+# and the default messages of the locale (DefaultMessages unless a catalog is given, see MessageCatalogs). The templates of the rules whose message depends on the type of the field (min, size...)
+# are kept as {field type: template}. Rules without any template are reported when the table is built.
+class MessageTable():
+	# rules that never fail
+	_without_message = frozenset([RulesPredicates.NULLABLE, RulesPredicates.BAIL])
+
+	def __init__(self, parsed_rules, messages, catalog=DefaultMessages):
+		self._templates = {} # field -> {predicate -> template or {field type -> template}}
+		self._missing = [] # (field, predicate)
+		for field_name, rules in parsed_rules.items():
+			templates = {}
+			for parsed_rule in rules:
+				predicate = parsed_rule.get_predicate()
+				if parsed_rule.has_unregistered_handler():
+					predicate = predicate.__name__
+				if predicate in templates or predicate in MessageTable._without_message:
+					continue
+				template = messages.get('{0}.{1}'.format(field_name, predicate)) or catalog.get(predicate)
+				if not template:
+					self._missing.append((field_name, predicate))
+					template = MessageTable.get_fallback(predicate)
+				templates[predicate] = template
+			self._templates[field_name] = templates
+
+	# {predicate: template} for the rules of field_name
+	def get_templates(self, field_name):
+		return self._templates.get(field_name, {})
+
+	# The rules that don't have a message, neither a custom one nor a default one
+	def get_missing(self):
+		return tuple(self._missing)
+
+	def warn_missing(self):
+		if self._missing:
+			warnings.warn('No validation message for: {0}. "Validation failed for: <rule>" will be used instead.'.format(
+				', '.join('{0}.{1}'.format(field_name, predicate) for field_name, predicate in self._missing)), stacklevel=3)
+
+	# Used when there's no template, the predicate isn't a template itself
+	@staticmethod
+	def get_fallback(predicate):
+		return ('Validation failed for: ' + str(predicate)).replace('{', '{{').replace('}', '}}')
@@ -0,0 +1,89 @@
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Validates large batches of records (Validator.validate_many) in a pool of processes.
+# The schema is pickled once per batch and sent with every chunk of records, each worker unpickles
+# and compiles it once. Smaller batches aren't worth the cost of sending the records to other processes.
+class ParallelValidation():
+	enabled = False
+	max_workers = None # os.cpu_count() when None
+	threshold = 50000 # records, smaller batches are validated in the calling process
+	chunk_size = 10000 # records sent to a worker at once
+	mp_context = None # see multiprocessing.get_context
+
+	_executor = None
+	_lock = threading.Lock()
+	_schemas = OrderedDict() # pickled schema -> schema, kept by the workers
+	_schemas_size = 8
+
+	@staticmethod
+	def configure(enabled=False, max_workers=None, threshold=50000, chunk_size=10000, mp_context=None):
+		if chunk_size < 1:
+			raise Exception("The chunk size of the parallel validation must be at least 1")
+		ParallelValidation.shutdown()
+		ParallelValidation.enabled = enabled
+		ParallelValidation.max_workers = max_workers
+		ParallelValidation.threshold = threshold
+		ParallelValidation.chunk_size = chunk_size
+		ParallelValidation.mp_context = mp_context
+
+	@staticmethod
+	def shutdown():
+		with ParallelValidation._lock:
+			if ParallelValidation._executor is not None:
+				ParallelValidation._executor.shutdown()
+				ParallelValidation._executor = None
+
+	@staticmethod
+	def get_executor():
+		if ParallelValidation._executor is None:
+			with ParallelValidation._lock:
+				if ParallelValidation._executor is None:
+					ParallelValidation._executor = ProcessPoolExecutor(
+						max_workers=ParallelValidation.max_workers, mp_context=ParallelValidation.mp_context)
+		return ParallelValidation._executor
+
+	# Only lists and tuples can be split, the records of other iterables are read one after the other
+	@staticmethod
+	def should_run(records):
+		return (ParallelValidation.enabled and isinstance(records, (list, tuple))
+			and len(records) >= max(ParallelValidation.threshold, 1))
+
+	# Runs worker(task, chunk) for every chunk of records and returns the results of all the records in their order,
+	# or None when the schema or the context can't be pickled (rules or a serializer holding lambdas for example).
+	# context holds whatever else the worker needs, it is passed back by load_task.
+	@staticmethod
+	def run(schema, context, records, worker):
+		try:
+			schema = pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)
+			pickle.dumps(context, pickle.HIGHEST_PROTOCOL)
+		except (pickle.PicklingError, AttributeError, TypeError):
+			return None
+		size = ParallelValidation.chunk_size
+		chunks = (records[start:start + size] for start in range(0, len(records), size))
+		results = []
+		# map returns the results in the order of the chunks, so every result stays at the index of its record
+		for chunk_results in ParallelValidation.get_executor().map(worker, repeat((schema, context)), chunks):
+			results.extend(chunk_results)
+		return results
+
+	# In the worker: returns (schema, context) for a task built by run
+	@staticmethod
+	def load_task(task):
+		schema, context = task
+		return ParallelValidation._load_schema(schema), context
+
+	@staticmethod
+	def _load_schema(data):
+		schemas = ParallelValidation._schemas
+		if data in schemas:
+			schemas.move_to_end(data)
+			return schemas[data]
+		schema = pickle.loads(data)
+		schemas[data] = schema
+		while len(schemas) > ParallelValidation._schemas_size:
+			schemas.popitem(last=False)
+		return schema
@@ -1,9 +1,10 @@
-
+from .Parsers.ParamsParser import ParamsParser
 
 class ParsedRule():
 	def __init__(self, predicate, params=[]):
 		self._predicate = predicate
 		self._params = params
+		self._compiled_params = ParamsParser.parse(predicate, params)
 
 	def __str__(self):
 		self.__repr__()
@@ -27,5 +28,9 @@ class ParsedRule():
 	def get_params(self):
 		return self._params
 
+	# params converted by ParamsParser, these are the ones passed to the handlers
+	def get_compiled_params(self):
+		return self._compiled_params
+
 	def has_unregistered_handler(self):
 		return callable(self._predicate)
\ No newline at end of file
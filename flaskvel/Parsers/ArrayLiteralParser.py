@@ -0,0 +1,177 @@
+import re
+import json
+
+# Parses array literals sent as strings ('[1, "a", [true, null], {"b": 2.5}]').
+# Both JSON and Python spellings are accepted (single quoted strings, True/False/None, trailing commas).
+# Unlike ast.literal_eval, it runs in linear time and rejects the input as soon as one of the limits is exceeded.
+class ArrayLiteralParser():
+	# limits applied when the caller doesn't provide its own
+	max_length = 1000000 # characters
+	max_depth = 32 # nested arrays/objects
+	max_items = 100000 # values at all levels
+
+	_token = re.compile(r'''
+		[ \t\n\r]*(?:
+			(?P<punct>[\[\]{},:])|
+			"(?P<dq_string>[^"\\]*(?:\\.[^"\\]*)*)"|
+			'(?P<sq_string>[^'\\]*(?:\\.[^'\\]*)*)'|
+			(?P<number>[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)|
+			(?P<keyword>true|false|null|True|False|None)
+		)''', re.VERBOSE | re.DOTALL)
+	_trailing_whitespace = re.compile(r'[ \t\n\r]*')
+	_escape = re.compile(r'\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.DOTALL)
+	_escapes = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '0': '\0', '\\': '\\', '/': '/', '"': '"', "'": "'"}
+	_keywords = {'true': True, 'false': False, 'null': None, 'True': True, 'False': False, 'None': None}
+
+	@staticmethod
+	def parse(text, max_length=None, max_depth=None, max_items=None):
+		result = ArrayLiteralParser.parse_value(text, max_length, max_depth, max_items)
+		if not isinstance(result, list):
+			raise ValueError('Expected an array but got {0}'.format(type(result)))
+		return result
+
+	# Like parse, but any literal is accepted at the top level ('5', "'a'", '{"b": 1}')
+	@staticmethod
+	def parse_value(text, max_length=None, max_depth=None, max_items=None):
+		if max_length is None:
+			max_length = ArrayLiteralParser.max_length
+		if max_depth is None:
+			max_depth = ArrayLiteralParser.max_depth
+		if max_items is None:
+			max_items = ArrayLiteralParser.max_items
+
+		if not isinstance(text, str):
+			raise ValueError('Expected a string but got {0}'.format(type(text)))
+		if len(text) > max_length:
+			raise ValueError('Array literal is longer than {0} characters'.format(max_length))
+
+		# most clients send valid JSON, which the C decoder handles much faster
+		try:
+			result = json.loads(text)
+		except (ValueError, RecursionError):
+			result = None
+		if isinstance(result, (list, dict)):
+			ArrayLiteralParser._check_limits(result, max_depth, max_items)
+			return result
+
+		token = ArrayLiteralParser._token
+		position = 0
+		items = 0
+		# every frame is [container, key of the pending object entry, expected token]
+		stack = []
+		result = None
+		while True:
+			match = token.match(text, position)
+			if match is None:
+				raise ValueError('Invalid array literal at position {0}'.format(position))
+			position = match.end()
+			punct = match.group('punct')
+
+			if not stack:
+				if punct == '[' or punct == '{':
+					result = [] if punct == '[' else {}
+					stack.append([result, None, 'value_or_end' if punct == '[' else 'key_or_end'])
+					continue
+				if punct is not None:
+					raise ValueError('Unexpected "{0}" at position {1}'.format(punct, match.start()))
+				result = ArrayLiteralParser._scalar(match)
+				break
+
+			frame = stack[-1]
+			expected = frame[2]
+			container = frame[0]
+
+			if expected == 'separator_or_end':
+				if punct == ',':
+					frame[2] = 'value_or_end' if isinstance(container, list) else 'key_or_end'
+					continue
+				if punct != (']' if isinstance(container, list) else '}'):
+					raise ValueError('Expected a separator at position {0}'.format(match.start()))
+				stack.pop()
+				if not stack:
+					break
+				continue
+
+			if expected == 'colon':
+				if punct != ':':
+					raise ValueError('Expected ":" at position {0}'.format(match.start()))
+				frame[2] = 'value'
+				continue
+
+			if punct == ']' and expected == 'value_or_end' or punct == '}' and expected == 'key_or_end':
+				stack.pop()
+				if not stack:
+					break
+				continue
+
+			# a value (or the key of an object entry) is expected from here on
+			if punct == '[' or punct == '{':
+				if expected == 'key_or_end':
+					raise ValueError('Invalid object key at position {0}'.format(match.start()))
+				if len(stack) >= max_depth:
+					raise ValueError('Array literal is nested deeper than {0} levels'.format(max_depth))
+				value = [] if punct == '[' else {}
+				child = [value, None, 'value_or_end' if punct == '[' else 'key_or_end']
+			elif punct is not None:
+				raise ValueError('Unexpected "{0}" at position {1}'.format(punct, match.start()))
+			else:
+				value = ArrayLiteralParser._scalar(match)
+				child = None
+
+			if expected == 'key_or_end':
+				frame[1] = value
+				frame[2] = 'colon'
+				continue
+
+			items += 1
+			if items > max_items:
+				raise ValueError('Array literal has more than {0} items'.format(max_items))
+			if isinstance(container, list):
+				container.append(value)
+			else:
+				container[frame[1]] = value
+			frame[2] = 'separator_or_end'
+			if child is not None:
+				stack.append(child)
+
+		if ArrayLiteralParser._trailing_whitespace.match(text, position).end() != len(text):
+			raise ValueError('Unexpected data after the array literal at position {0}'.format(position))
+		return result
+
+	@staticmethod
+	def _check_limits(result, max_depth, max_items):
+		items = 0
+		stack = [(result, 1)]
+		while stack:
+			container, depth = stack.pop()
+			if depth > max_depth:
+				raise ValueError('Array literal is nested deeper than {0} levels'.format(max_depth))
+			values = container if isinstance(container, list) else container.values()
+			items += len(values)
+			if items > max_items:
+				raise ValueError('Array literal has more than {0} items'.format(max_items))
+			for value in values:
+				if isinstance(value, (list, dict)):
+					stack.append((value, depth + 1))
+
+	@staticmethod
+	def _scalar(match):
+		kind = match.lastgroup
+		raw = match.group(kind)
+		if kind == 'dq_string' or kind == 'sq_string':
+			if '\\' in raw:
+				return ArrayLiteralParser._escape.sub(ArrayLiteralParser._unescape, raw)
+			return raw
+		if kind == 'number':
+			if '.' in raw or 'e' in raw or 'E' in raw:
+				return float(raw)
+			return int(raw)
+		return ArrayLiteralParser._keywords[raw]
+
+	@staticmethod
+	def _unescape(match):
+		escape = match.group(1)
+		if len(escape) > 1:
+			return chr(int(escape[1:], 16))
+		# unknown escapes are kept as they are, like python does
+		return ArrayLiteralParser._escapes.get(escape, '\\' + escape)
@@ -1,6 +1,10 @@
 from ..ParsedRule import ParsedRule
+from ..Constants.RulesPredicates import RulesPredicates
 
 class ArrayParser():
+	# rules whose single param may contain commas
+	_unsplit_params = [RulesPredicates.REGEX, RulesPredicates.NOT_REGEX]
+
 	@staticmethod
 	def parse(rules):
 		parsed_rules = []
@@ -11,10 +15,12 @@ class ArrayParser():
 			elif isinstance(rule, ParsedRule):
 				parsed_rules.append(rule)
 				continue
-			tmp = rule.split(":")
-			predicate = tmp[0]
+			predicate, separator, raw_params = rule.partition(":")
 			params = []
-			if len(tmp) > 1:
-				params = tmp[1].split(',')
+			if separator:
+				if predicate in ArrayParser._unsplit_params:
+					params = [raw_params]
+				else:
+					params = raw_params.split(',')
 			parsed_rules.append(ParsedRule(predicate, params))
 		return parsed_rules
@@ -0,0 +1,31 @@
+from datetime import datetime
+from dateutil.parser import parse as parse_date
+
+class DateParser():
+	# dateutil fills the missing parts of a date from the current day (at midnight),
+	# two different days are used to detect the dates that depend on it
+	_defaults = [datetime(2000, 1, 1), datetime(2001, 2, 2)]
+
+	@staticmethod
+	def parse(value):
+		# ISO 8601 calendar dates are handled by the much faster datetime.fromisoformat
+		if isinstance(value, str) and len(value) >= 10 and value[4] == '-' and value[7] == '-':
+			try:
+				return datetime.fromisoformat(value)
+			except ValueError:
+				pass
+		return parse_date(value)
+
+	# Returns the datetime of a constant rule param, or None if it depends on the current day ('10:00', 'monday')
+	# and has to be parsed on every request.
+	@staticmethod
+	def parse_constant(value):
+		if isinstance(value, str) and len(value) >= 10 and value[4] == '-' and value[7] == '-':
+			try:
+				return datetime.fromisoformat(value)
+			except ValueError:
+				pass
+		parsed = [parse_date(value, default=default) for default in DateParser._defaults]
+		if parsed[0] != parsed[1]:
+			return None
+		return parsed[0]
@@ -0,0 +1,61 @@
+import re
+from datetime import datetime
+
+from ..Constants.RulesPredicates import RulesPredicates
+from .DateParser import DateParser
+from ..DimensionConstraints import DimensionConstraints
+
+# Converts the constant params of a rule into the objects used by its handler,
+# so that the conversion runs once when the rules are parsed instead of on every request.
+class ParamsParser():
+	@staticmethod
+	def parse(predicate, params):
+		parser = ParamsParser._parsers.get(predicate) if isinstance(predicate, str) else None
+		if parser is None:
+			return params
+		return parser(predicate, params)
+
+	@staticmethod
+	def parse_pattern(predicate, params):
+		if len(params) < 1:
+			raise Exception('Rule <{0}> requires at least 1 parameter.'.format(predicate))
+		if isinstance(params[0], re.Pattern):
+			return params
+		try:
+			return [re.compile(params[0])] + list(params[1:])
+		except re.error as e:
+			raise Exception('Rule <{0}> has an invalid pattern {1!r}: {2}'.format(predicate, params[0], e))
+
+	@staticmethod
+	def parse_date(predicate, params):
+		if len(params) < 1:
+			raise Exception('Rule <{0}> requires at least 1 parameter.'.format(predicate))
+		if isinstance(params[0], datetime):
+			return params
+		try:
+			date = DateParser.parse_constant(params[0])
+		except (ValueError, OverflowError, TypeError) as e:
+			raise Exception('Rule <{0}> has an invalid date {1!r}: {2}'.format(predicate, params[0], e))
+		if date is None:
+			return params
+		return [date] + list(params[1:])
+
+	@staticmethod
+	def parse_dimensions(predicate, params):
+		if len(params) == 1 and isinstance(params[0], DimensionConstraints):
+			return params
+		try:
+			return [DimensionConstraints.parse(params)]
+		except ValueError as e:
+			raise Exception("Invalid parameters for rule '{0}': {1}".format(predicate, e))
+
+ParamsParser._parsers = {
+	RulesPredicates.AFTER: ParamsParser.parse_date,
+	RulesPredicates.AFTER_OR_EQUAL: ParamsParser.parse_date,
+	RulesPredicates.BEFORE: ParamsParser.parse_date,
+	RulesPredicates.BEFORE_OR_EQUAL: ParamsParser.parse_date,
+	RulesPredicates.DATE_EQUALS: ParamsParser.parse_date,
+	RulesPredicates.DIMENSIONS: ParamsParser.parse_dimensions,
+	RulesPredicates.REGEX: ParamsParser.parse_pattern,
+	RulesPredicates.NOT_REGEX: ParamsParser.parse_pattern,
+}
@@ -1,33 +1,129 @@
-import re
-import ast
 import json
 from copy import deepcopy
-import pytz
-import requests
 import os
 import operator
-from dateutil.parser import parse as parse_date
 from datetime import datetime
 from werkzeug.datastructures import FileStorage # comes packaged with flask
-from PIL import Image
 
 from .Constants.RulesPredicates import RulesPredicates
-from .Constants.DefaultMessages import DefaultMessages
+from .Constants.Patterns import Patterns
 from .Constants.FieldTypes import FieldTypes
+from .Constants.FailModes import FailModes
 from .Flaskvel import Flaskvel
+from .Timezones import Timezones
+from .UrlChecker import UrlChecker
+from .ImageSniffer import ImageSniffer
+from .WildcardFields import WildcardFields
+from .MessageTable import MessageTable
+from .MessageCatalogs import MessageCatalogs
+from .ErrorSerializer import ErrorSerializer
+from .Parsers.ParamsParser import ParamsParser
+from .Parsers.ArrayLiteralParser import ArrayLiteralParser
+from .Parsers.DateParser import DateParser
 
 class Processor():
-	def __init__(self, validator):
+	_imply_nullable = [
+		RulesPredicates.NULLABLE,
+		RulesPredicates.REQUIRED_IF,
+		RulesPredicates.REQUIRED_UNLESS,
+		RulesPredicates.REQUIRED_WITH,
+		RulesPredicates.REQUIRED_WITH_ALL,
+		RulesPredicates.REQUIRED_WITHOUT,
+		RulesPredicates.REQUIRED_WITHOUT_ALL
+	]
+
+	_ignored_predicates = [RulesPredicates.NULLABLE, RulesPredicates.BAIL]
+
+	# rules declaring the type of a field, the first matching group wins
+	_type_rules = [
+		(FieldTypes.NUMERIC, [
+			RulesPredicates.DIGITS,
+			RulesPredicates.DIGITS_BETWEEN,
+			RulesPredicates.INTEGER,
+			RulesPredicates.NUMERIC,]),
+		(FieldTypes.FILE, [
+			RulesPredicates.FILE,
+			RulesPredicates.IMAGE,
+			RulesPredicates.DIMENSIONS,]),
+		(FieldTypes.STRING, [
+			RulesPredicates.STRING,
+			RulesPredicates.ALPHA,
+			RulesPredicates.ALPHA_DASH,]),
+		(FieldTypes.ARRAY, [
+			RulesPredicates.ARRAY,
+			RulesPredicates.DISTINCT,]),
+		(FieldTypes.JSON, [
+			RulesPredicates.JSON,]),
+	]
+
+	# body is given when validating a record instead of the request, see Validator.validate_many
+	def __init__(self, validator, body=None):
 		self._validator = validator
-		self._errors = {} # error messages already formated
+		self._errors = None # error messages, rendered from the failed validations when read
+		self._truncated = False # some errors weren't collected, see Flaskvel._max_failed_fields
 		self._failed_validations = {} # info about failed validations
 		self._parsed_rules = None
 		self._messages = None
+		self._message_table = None
 		self._request = validator.get_request()
+		# request scoped caches
+		self._body = body
+		self._files = None if body is None else {}
+		self._field_values = {}
+		self._present_fields = {}
+		self._field_types = {}
+		self._decoded_values = {}
+		self._declared_types = {}
+		self._wildcard_patterns = {} # field name -> wildcard field name, for the elements being validated and the failed ones
+		self._active_urls = {} # url -> result, checked ahead by _prefetch_active_urls
 
 	def get_errors(self):
+		if self._errors is None:
+			self._errors = self._render_errors()
 		return self._errors
 
+	# The fields that would take the response over Flaskvel._max_errors_size bytes, once encoded by the active
+	# serializer, are left out; a marker is added when some errors were left out or weren't collected
+	def _render_errors(self):
+		errors = {}
+		for field_name in self._failed_validations:
+			errors[field_name] = self._generate_errors(field_name)
+		marker = [Flaskvel._truncation_message]
+		if Flaskvel._max_errors_size is not None:
+			return self._limit_errors_size(errors, marker, Flaskvel._max_errors_size)
+		if self._truncated:
+			errors[Flaskvel._truncation_key] = marker
+		return errors
+
+	def _limit_errors_size(self, errors, marker, max_size):
+		ensure_ascii = ErrorSerializer.escapes_non_ascii()
+		# the size of every entry and of the comma separating it from the previous one, without indentation
+		sizes = [
+			len(json.dumps(field_name, ensure_ascii=ensure_ascii).encode('utf-8'))
+			+ len(json.dumps(messages, ensure_ascii=ensure_ascii, separators=(',', ':')).encode('utf-8')) + 2 # : and ,
+			for field_name, messages in errors.items()
+		]
+		if not self._truncated and len(ErrorSerializer.encode({})) + sum(sizes) - 1 <= max_size:
+			if len(ErrorSerializer.encode(errors)) <= max_size:
+				return errors
+		# the room of the marker is kept aside, it is the first entry so that it needs no comma
+		marker_size = len(ErrorSerializer.encode({Flaskvel._truncation_key: marker}))
+		budget = max_size
+		while True:
+			kept = {}
+			size = marker_size
+			for (field_name, messages), entry_size in zip(errors.items(), sizes):
+				size += entry_size
+				if size > budget:
+					break
+				kept[field_name] = messages
+			kept[Flaskvel._truncation_key] = marker
+			overflow = len(ErrorSerializer.encode(kept)) - max_size
+			if overflow <= 0 or len(kept) == 1:
+				return kept
+			# the output is indented (flask in debug mode), the sizes were under-estimated
+			budget -= overflow
+
 	def get_failed_validations(self):
 		return self._failed_validations
 
@@ -38,95 +134,291 @@ class Processor():
 		if self._parsed_rules is None:
 			self._parsed_rules = self._validator.get_parsed_rules()
 
-		ignored_predicates = [RulesPredicates.NULLABLE, RulesPredicates.BAIL]
+		fail_mode = self._validator.get_fail_mode()
+		if UrlChecker.parallel_checks:
+			self._prefetch_active_urls(fail_mode)
+
+		schema = self._validator.get_schema()
+		if schema is not None:
+			self._declared_types = schema.get_declared_types()
+		if Flaskvel._compile_rules and schema is not None and schema.is_cacheable():
+			return schema.get_compiled(fail_mode)(self)
+
+		if schema is None:
+			execution_rules = self._parsed_rules
+			wildcard_groups = WildcardFields.group(execution_rules)
+			plans = Processor.plan_fields(execution_rules, fail_mode)
+		else:
+			execution_rules = schema.get_execution_rules()
+			wildcard_groups = schema.get_wildcard_groups()
+			plans = schema.get_field_plans(fail_mode)
 
 		validation_passed = True
-		for field_name, rules in self._parsed_rules.items():
-			failed_validations = {}
+		for field_name in execution_rules:
+			if field_name in wildcard_groups:
+				# the whole group is run with the first of its fields
+				group = wildcard_groups[field_name]
+				if group is None:
+					continue
+				passed, stopped = self._run_wildcard_group(group[0], Processor.plan_wildcard_fields(group[1], plans))
+			else:
+				passed, stopped = self._validate_field(field_name, self.get_field_value(field_name), plans[field_name])
+			if not passed:
+				validation_passed = False
+			if stopped:
+				return validation_passed
 
-			field_value = self.get_field_value(field_name)
-			nullable = self.is_field_nullable(field_name)
-			bail = self.should_bail(field_name)
+		return validation_passed
 
-			for parsed_rule in rules:
-				rule_predicate = parsed_rule.get_predicate()
-				params = parsed_rule.get_params()
-				if ((rule_predicate in ignored_predicates) or
-					(nullable and field_value is None and not rule_predicate in Flaskvel._null_intolerant_rules)):
+	# How the rules of a field run, shared by _validate_field and the Compiler so that they can't drift apart:
+	# (rules, nullable, stop, first_per_field, checks), stop meaning that the validation stops at the first error
+	# of the field, every check being (parsed_rule, predicate name, params, compiled params, handler, is_method,
+	# skipped when the value is None).
+	@staticmethod
+	def plan_field(rules, fail_mode=FailModes.COLLECT_ALL):
+		nullable = any(rule in rules for rule in Processor._imply_nullable)
+		checks = []
+		for parsed_rule in rules:
+			rule_predicate = parsed_rule.get_predicate()
+			if rule_predicate in Processor._ignored_predicates:
+				continue
+			null_tolerant = nullable and not rule_predicate in Flaskvel._null_intolerant_rules
+			if parsed_rule.has_unregistered_handler():
+				handler, is_method = rule_predicate, False
+				rule_predicate = rule_predicate.__name__
+			else:
+				handler, is_method = Processor._get_class_rule_handler(rule_predicate)
+			checks.append((parsed_rule, rule_predicate, parsed_rule.get_params(), parsed_rule.get_compiled_params(), handler, is_method, null_tolerant))
+		stop = fail_mode == FailModes.STOP_AT_FIRST or RulesPredicates.BAIL in rules
+		return (rules, nullable, stop, fail_mode == FailModes.FIRST_PER_FIELD, tuple(checks))
+
+	@staticmethod
+	def plan_fields(parsed_rules, fail_mode=FailModes.COLLECT_ALL):
+		return {field_name: Processor.plan_field(rules, fail_mode) for field_name, rules in parsed_rules.items()}
+
+	# The fields of a wildcard group (see WildcardFields.group) with their plans: ((pattern, keys, plan), ...)
+	@staticmethod
+	def plan_wildcard_fields(fields, plans):
+		return tuple((pattern, keys, plans[pattern]) for pattern, keys, rules in fields)
+
+	# Runs the rules of a single field. Returns (passed, stopped), stopped meaning that the rest of the validation is skipped.
+	def _validate_field(self, field_name, field_value, plan):
+		rules, nullable, stop, first_per_field, checks = plan
+		failed_validations = {}
+		for parsed_rule, rule_predicate, params, compiled_params, handler, is_method, null_tolerant in checks:
+			if null_tolerant and field_value is None:
+				continue
+			err_msg_params = {}
+			if is_method:
+				passed = handler(self, field_name=field_name, value=field_value, params=compiled_params, nullable=nullable, err_msg_params=err_msg_params, processor=self, rules=rules)
+			else:
+				passed = handler(field_name=field_name, value=field_value, params=compiled_params, nullable=nullable, err_msg_params=err_msg_params, processor=self, rules=rules)
+			if not passed:
+				failed_validations[rule_predicate] = [params, err_msg_params]
+				if stop or first_per_field:
+					break
+		if not failed_validations:
+			return True, False
+		return self._end_field(field_name, failed_validations, stop)
+
+	# Records the errors of a field once its rules have run (or stopped at the first error when stop is set).
+	# Returns (passed, stopped) like _validate_field, the compiled validators call it as well.
+	def _end_field(self, field_name, failed_validations, stop):
+		if not failed_validations:
+			return True, False
+		stopped = self._add_failed_validations(field_name, failed_validations)
+		return False, stop or stopped
+
+	# Validates the wildcard fields walking the list list_field, fields being the result of plan_wildcard_fields.
+	# The list is walked once, the values of an element are forgotten once its rules have run
+	# so that long lists don't fill the caches of the request. Returns (passed, stopped) like _validate_field.
+	def _run_wildcard_group(self, list_field, fields):
+		elements = ()
+		if list_field:
+			is_valid, decoded = self._decode_field_value(list_field, FieldTypes.ARRAY)
+			if is_valid:
+				elements = decoded
+
+		validation_passed = True
+		for index, element in enumerate(elements):
+			element_name = '{0}.{1}'.format(list_field, index)
+			for pattern, keys, plan in fields:
+				for field_name, field_value in WildcardFields.expand(element, keys, element_name):
+					self._field_values[field_name] = field_value
+					self._wildcard_patterns[field_name] = pattern
+					passed, stopped = self._validate_field(field_name, field_value, plan)
+					self._forget_field(field_name)
+					if not passed:
+						validation_passed = False
+					if stopped:
+						return validation_passed, True
+		return validation_passed, False
+
+	def _forget_field(self, field_name):
+		self._present_fields.pop(field_name, None)
+		self._field_types.pop(field_name, None)
+		self._decoded_values.pop((field_name, FieldTypes.ARRAY), None)
+		self._decoded_values.pop((field_name, FieldTypes.JSON), None)
+		# the messages of the failed fields are rendered later, from their value and their rules
+		if field_name not in self._failed_validations:
+			self._field_values.pop(field_name, None)
+			self._wildcard_patterns.pop(field_name, None)
+
+	# The name the rules and messages of a field are declared under: items.*.price for items.3.price
+	def _get_rules_key(self, field_name):
+		return self._wildcard_patterns.get(field_name, field_name)
+
+	# Validates many records at once, field by field: the plans of the fields are shared by all the records
+	# instead of being looked up once per record. Returns the result of every record.
+	@staticmethod
+	def _run_many(processors, validator):
+		messages = validator.get_messages()
+		parsed_rules = validator.get_parsed_rules()
+		schema = validator.get_schema()
+		fail_mode = validator.get_fail_mode()
+		declared_types = schema.get_declared_types()
+		for processor in processors:
+			processor._messages = messages
+			processor._parsed_rules = parsed_rules
+			processor._declared_types = declared_types
+			if UrlChecker.parallel_checks:
+				processor._prefetch_active_urls(fail_mode)
+
+		if Flaskvel._compile_rules and schema.is_cacheable():
+			validate = schema.get_compiled(fail_mode)
+			return [validate(processor) for processor in processors]
+
+		wildcard_groups = schema.get_wildcard_groups()
+		plans = schema.get_field_plans(fail_mode)
+
+		results = [True] * len(processors)
+		active = list(range(len(processors))) # records whose validation hasn't stopped
+		for field_name in schema.get_execution_rules():
+			group = wildcard_groups.get(field_name)
+			if field_name in wildcard_groups:
+				if group is None:
 					continue
-				
-				handler = None
-				if parsed_rule.has_unregistered_handler():
-					handler = rule_predicate
-					rule_predicate = rule_predicate.__name__
+				wildcard_fields = Processor.plan_wildcard_fields(group[1], plans)
+			plan = plans[field_name]
+			still_active = []
+			for index in active:
+				processor = processors[index]
+				if group is None:
+					passed, stopped = processor._validate_field(field_name, processor.get_field_value(field_name), plan)
 				else:
-					handler = self._get_rule_handler(rule_predicate)
-
-				err_msg_params = {}
-				if not handler(field_name=field_name, value=field_value, params=params, nullable=nullable, err_msg_params=err_msg_params, processor=self, rules=rules):
-					validation_passed = False
-					failed_validations[rule_predicate] = [params, err_msg_params]
-					if bail:
-						self._failed_validations[field_name] = failed_validations
-						self._errors[field_name] = self._generate_errors(field_name)
-						return validation_passed
-
-			if len(failed_validations) > 0:
-				self._failed_validations[field_name] = failed_validations
-				self._errors[field_name] = self._generate_errors(field_name)
+					passed, stopped = processor._run_wildcard_group(group[0], wildcard_fields)
+				if not passed:
+					results[index] = False
+				if not stopped:
+					still_active.append(index)
+			active = still_active
+
+		return results
+
+	# URLs are only checked ahead when every rule runs: when the validation may stop before reaching
+	# an active_url rule (bail, fail modes, max_failed_fields), the URLs are checked by the rule itself.
+	def _prefetch_active_urls(self, fail_mode):
+		if fail_mode != FailModes.COLLECT_ALL or Flaskvel._max_failed_fields is not None:
+			return
+		urls = []
+		for field_name, rules in self._parsed_rules.items():
+			if RulesPredicates.BAIL in rules:
+				return
+			if RulesPredicates.ACTIVE_URL in rules:
+				value = self.get_field_value(field_name)
+				if isinstance(value, str):
+					urls.append(value)
+		if len(urls) > 1:
+			self._active_urls = UrlChecker.check_many(urls)
+
+	# Returns True when the validation must stop because too many fields failed, see Flaskvel._max_failed_fields
+	def _add_failed_validations(self, field_name, failed_validations):
+		if len(failed_validations) > 1:
+			failed_validations = self._sort_failed_validations(field_name, failed_validations)
+			max_field_errors = Flaskvel._max_field_errors
+			if max_field_errors is not None and len(failed_validations) > max_field_errors:
+				failed_validations = dict(list(failed_validations.items())[:max_field_errors])
+				self._truncated = True
+		self._failed_validations[field_name] = failed_validations
+		self._errors = None
+		max_failed_fields = Flaskvel._max_failed_fields
+		if max_failed_fields is not None and len(self._failed_validations) >= max_failed_fields:
+			self._truncated = True
+			return True
+		return False
 
-		return validation_passed
+	# The rules may have run in a different order, the errors follow the order they were written in
+	def _sort_failed_validations(self, field_name, failed_validations):
+		sorted_failed_validations = {}
+		for parsed_rule in self.get_field_rules(field_name):
+			predicate = parsed_rule.get_predicate()
+			if parsed_rule.has_unregistered_handler():
+				predicate = predicate.__name__
+			if predicate in failed_validations:
+				sorted_failed_validations[predicate] = failed_validations[predicate]
+		# failures recorded under any other name keep their place at the end
+		for predicate, failed_validation in failed_validations.items():
+			if predicate not in sorted_failed_validations:
+				sorted_failed_validations[predicate] = failed_validation
+		return sorted_failed_validations
+
+	# The upload was aborted while being received, so the other fields can't be validated
+	def _reject_upload(self, field_name, parsed_rule):
+		if self._messages is None:
+			self._messages = self._validator.get_messages()
+		self._field_types[field_name] = FieldTypes.FILE
+		self._add_failed_validations(field_name, {
+			parsed_rule.get_predicate(): [parsed_rule.get_params(), {'field_name': field_name}]
+		})
+		return False
 
 	def get_field_type(self, field_name):
-		rules = self._parsed_rules.get(field_name, [])
+		if field_name not in self._field_types:
+			self._field_types[field_name] = self._infer_field_type(field_name)
+		return self._field_types[field_name]
+
+	# The type declared by the rules of a field, only depends on the rules so it is shared between the records/requests
+	def _get_declared_type(self, field_name):
+		field_name = self._get_rules_key(field_name)
+		if field_name not in self._declared_types:
+			self._declared_types[field_name] = Processor.find_declared_type(self._parsed_rules.get(field_name, []))
+		return self._declared_types[field_name]
+
+	@staticmethod
+	def find_declared_type(rules):
+		for field_type, type_rules in Processor._type_rules:
+			for rule in type_rules:
+				if rule in rules:
+					return field_type
+		return None
+
+	def _infer_field_type(self, field_name):
 		value = self.get_field_value(field_name)
+		declared_type = self._get_declared_type(field_name)
 
-		for rule in [
-			RulesPredicates.DIGITS,
-			RulesPredicates.DIGITS_BETWEEN,
-			RulesPredicates.INTEGER,
-			RulesPredicates.NUMERIC,]:
-			if rule in rules:
-				if self.handler_numeric(field_name=field_name, value=value) or self.handler_integer(field_name=field_name, value=value) :
-					return FieldTypes.NUMERIC
-				else:
-					return FieldTypes.UNKOWN
-
-		for rule in [
-			RulesPredicates.FILE,
-			RulesPredicates.IMAGE,
-			RulesPredicates.DIMENSIONS,]:
-			if rule in rules:
-				if self.handler_file(field_name=field_name, value=value):
-					return FieldTypes.FILE
-				else:
-					return FieldTypes.UNKOWN
+		if declared_type == FieldTypes.NUMERIC:
+			if self.handler_numeric(field_name=field_name, value=value) or self.handler_integer(field_name=field_name, value=value) :
+				return FieldTypes.NUMERIC
+			else:
+				return FieldTypes.UNKOWN
 
-		for rule in [
-			RulesPredicates.STRING,
-			RulesPredicates.ALPHA,
-			RulesPredicates.ALPHA_DASH,]:
-			if rule in rules:
-				if self.handler_string(field_name=field_name, value=value):
-					return FieldTypes.STRING
-				else:
-					return FieldTypes.UNKOWN
+		if declared_type == FieldTypes.FILE:
+			if self.handler_file(field_name=field_name, value=value):
+				return FieldTypes.FILE
+			else:
+				return FieldTypes.UNKOWN
 
-		for rule in [
-			RulesPredicates.ARRAY,
-			RulesPredicates.DISTINCT,]:
-			if rule in rules:
-				if self.handler_array(field_name=field_name, value=value):
-					return FieldTypes.ARRAY
-				else:
-					return FieldTypes.UNKOWN
+		if declared_type == FieldTypes.STRING:
+			if self.handler_string(field_name=field_name, value=value):
+				return FieldTypes.STRING
+			else:
+				return FieldTypes.UNKOWN
 
-		for rule in [RulesPredicates.JSON,]:
-			if rule in rules:
-				if self.handler_json(field_name=field_name, value=value):
-					return FieldTypes.JSON
-				else:
-					return FieldTypes.UNKOWN
+		if declared_type == FieldTypes.ARRAY or declared_type == FieldTypes.JSON:
+			if self._decode_field_value(field_name, declared_type)[0]:
+				return declared_type
+			else:
+				return FieldTypes.UNKOWN
 
 		if isinstance(value, int) or isinstance(value, float):
 			return FieldTypes.NUMERIC
@@ -144,70 +436,119 @@ class Processor():
 			if self.handler_numeric(field_name=field_name, value=value) or self.handler_integer(field_name=field_name, value=value):
 				return FieldTypes.NUMERIC
 
-			if self.handler_array(field_name=field_name, value=value):
+			if self._decode_field_value(field_name, FieldTypes.ARRAY)[0]:
 				return FieldTypes.ARRAY
 
-			if self.handler_json(field_name=field_name, value=value):
+			if self._decode_field_value(field_name, FieldTypes.JSON)[0]:
 				return FieldTypes.JSON
 
 			return FieldTypes.STRING
 
 		return FieldTypes.UNKOWN
 
-	def get_field_value(self, field_name):
-		if field_name in self._request.files:
-			return self._request.files.get(field_name)
+	# Returns (is_valid, decoded_value) for an array/json field sent either as an object or as a string.
+	# The result is cached so that the string is parsed at most once per request.
+	def _decode_field_value(self, field_name, field_type):
+		key = (field_name, field_type)
+		if key in self._decoded_values:
+			return self._decoded_values[key]
 
-		result = self._request.json if self._request.is_json else self._request.form
+		value = self.get_field_value(field_name)
+		result = (False, None)
+		if field_type == FieldTypes.ARRAY:
+			if isinstance(value, list):
+				result = (True, value)
+			elif isinstance(value, str):
+				try:
+					decoded = ArrayLiteralParser.parse(value)
+					if isinstance(decoded, list):
+						result = (True, decoded)
+				except:
+					pass
+		elif field_type == FieldTypes.JSON:
+			if isinstance(value, dict):
+				result = (True, value)
+			elif isinstance(value, str):
+				try:
+					result = (True, json.loads(value))
+				except:
+					pass
+		self._decoded_values[key] = result
+		return result
+
+	def get_field_value(self, field_name):
+		# resolved once per request, most fields are read by several rules
+		if field_name in self._field_values:
+			return self._field_values[field_name]
+		value = self._resolve_field_value(field_name)
+		self._field_values[field_name] = value
+		return value
+
+	def _resolve_field_value(self, field_name):
+		files = self._get_files()
+		if field_name in files:
+			return files.get(field_name)
+
+		result = self._get_body()
 		keys = field_name.split('.')
-		for key in keys:
-			if not isinstance(result, dict):
-				return None
-			result = result.get(key)
+		last = len(keys) - 1
+		for index, key in enumerate(keys):
+			result = WildcardFields.get_child(result, key, index == last)
 			if result is None:
 				return None
-			try:
-				if isinstance(result, str): # parse json strings within forms
-					json_obj = json.loads(result)
-					if isinstance(json_obj, dict):
-						result = json_obj
-			except:
-				continue
 		return result
 
 	def get_field_rules(self, field_name):
-		return self._parsed_rules.get(field_name, [])
+		return self._parsed_rules.get(self._get_rules_key(field_name), [])
 
 	def is_field_present(self, field_name):
-		if field_name in self._request.files:
+		if field_name in self._present_fields:
+			return self._present_fields[field_name]
+		present = self._resolve_field_presence(field_name)
+		self._present_fields[field_name] = present
+		return present
+
+	def _resolve_field_presence(self, field_name):
+		if field_name in self._get_files():
 			return True
 
-		result = self._request.json if self._request.is_json else self._request.form
+		result = self._get_body()
 		keys = field_name.split('.')
 		for key in keys:
-			if key not in result:
+			if isinstance(result, list):
+				if not key.isdecimal() or int(key) >= len(result):
+					return False
+				result = result[int(key)]
+			elif key not in result:
 				return False
-			result = result[key]
+			else:
+				result = result[key]
 		return True
 
+	def _get_body(self):
+		if self._body is None:
+			self._body = self._request.json if self._request.is_json else self._request.form
+		return self._body
+
+	def _get_files(self):
+		if self._files is None:
+			self._files = self._request.files
+		return self._files
+
 	def is_field_nullable(self, field_name):
 		rules = self.get_field_rules(field_name)
-		imply_nullable = [
-			RulesPredicates.NULLABLE,
-			RulesPredicates.REQUIRED_IF,
-			RulesPredicates.REQUIRED_UNLESS,
-			RulesPredicates.REQUIRED_WITH,
-			RulesPredicates.REQUIRED_WITH_ALL,
-			RulesPredicates.REQUIRED_WITHOUT,
-			RulesPredicates.REQUIRED_WITHOUT_ALL
-		]
-		for rule in imply_nullable:
+		for rule in Processor._imply_nullable:
 			if rule in rules:
 				return True
 		return False
 
 	def is_field_empty(self, field_name):
 		value = self.get_field_value(field_name)
+		# the answer doesn't depend on the type of the field for these, no need to infer it
+		if value is None:
+			return True
+		if isinstance(value, str) and value != '':
+			return False
 		field_type = self.get_field_type(field_name)
 
 		if field_type == FieldTypes.STRING:
@@ -226,25 +567,29 @@ class Processor():
 		return value is None
 
 	def should_bail(self, field_name):
-		return RulesPredicates.BAIL in self._parsed_rules[field_name]
+		return RulesPredicates.BAIL in self._parsed_rules[self._get_rules_key(field_name)]
 
 	def _generate_errors(self, field_name):
+		templates = self._get_message_table().get_templates(self._get_rules_key(field_name))
 		errors_strings = []
-		for rule_predicate, params in self._failed_validations[field_name].items():
-			params, err_msg_params = params
-			message = self._messages.get('{0}.{1}'.format(field_name, rule_predicate))
-
-			if not message:
-				message = DefaultMessages.get(rule_predicate)
-				if isinstance(message, dict):
-					message = message.get(self.get_field_type(field_name))
+		for rule_predicate, (params, err_msg_params) in self._failed_validations[field_name].items():
+			template = templates.get(rule_predicate)
+			if isinstance(template, dict):
+				template = template.get(self.get_field_type(field_name))
+			if template is None:
+				template = MessageTable.get_fallback(rule_predicate)
+			errors_strings.append(template.format(*params, **err_msg_params))
+		return errors_strings
 
-			if not message:
-				errors_strings.append('Validation failed for: ' + str(rule_predicate))
+	def _get_message_table(self):
+		if self._message_table is None:
+			schema = self._validator.get_schema()
+			locale = self._validator.get_locale()
+			if schema is None:
+				self._message_table = MessageTable(self._parsed_rules, self._messages, MessageCatalogs.get(locale))
 			else:
-				errors_strings.append(message.format(*params, **err_msg_params))
-
-		return errors_strings
+				self._message_table = schema.get_message_table(self._messages, locale)
+		return self._message_table
 
 	def _assert_params_types(self, params, params_types, rule_predicate):
 		if len(params) < len(params_types):
@@ -256,6 +601,16 @@ class Processor():
 			except:
 				raise Exception('Rule <{0}> requires parameter number {1} to be of type {2}.'.format(rule_predicate, i+1, params_types[i].__name__))
 
+	def _get_date_param(self, params):
+		# constant dates are already parsed by ParamsParser, the ones relative to the current day are parsed here
+		if isinstance(params[0], datetime):
+			return params[0]
+		return DateParser.parse(params[0])
+
+	def _get_pattern_param(self, params, rule_predicate):
+		# params are normally compiled by ParamsParser, raw strings are compiled here
+		return ParamsParser.parse_pattern(rule_predicate, params)[0]
+
 	def _compare_fields_size(self, field_a_name, field_b_name, operator):
 		value_a = self.get_field_value(field_a_name)
 		value_b = self.get_field_value(field_b_name)
@@ -268,30 +623,13 @@ class Processor():
 			return operator(len(value_a), len(value_b))
 		elif field_a_type == FieldTypes.NUMERIC:
 			return operator(float(value_a), float(value_b))
-		elif field_a_type == FieldTypes.ARRAY:
-			if isinstance(value_a, str):
-				try:
-					value_a = ast.literal_eval(value_a)
-				except:
-					return False
-			if isinstance(value_b, str):
-				try:
-					value_b = ast.literal_eval(value_b)
-				except:
-					return False
-			return isinstance(value_b, list) and isinstance(value_b, list) and operator(len(value_a), len(value_b))
-		elif field_a_type == FieldTypes.JSON:
-			if isinstance(value_a, str):
-				try:
-					value_a = json.loads(value_a)
-				except:
-					return False
-			if isinstance(value_b, str):
-				try:
-					value_b = json.loads(value_b)
-				except:
-					return False
-			return isinstance(value_a, dict) and isinstance(value_b, dict) and operator(len(value_a), len(value_b))
+		elif field_a_type == FieldTypes.ARRAY or field_a_type == FieldTypes.JSON:
+			is_valid_a, value_a = self._decode_field_value(field_a_name, field_a_type)
+			is_valid_b, value_b = self._decode_field_value(field_b_name, field_a_type)
+			if not is_valid_a or not is_valid_b:
+				return False
+			expected_type = list if field_a_type == FieldTypes.ARRAY else dict
+			return isinstance(value_a, expected_type) and isinstance(value_b, expected_type) and operator(len(value_a), len(value_b))
 		elif field_a_type == FieldTypes.FILE:
 			value_a.seek(0, os.SEEK_END)
 			value_b.seek(0, os.SEEK_END)
@@ -310,23 +648,11 @@ class Processor():
 		elif field_type == FieldTypes.NUMERIC:
 			return operator(float(field_value), float(size))
 		elif field_type == FieldTypes.ARRAY:
-			if isinstance(field_value, list):
-				return operator(len(field_value), int(size))
-			if isinstance(field_value, str):
-				try:
-					field_value = ast.literal_eval(field_value)
-					return isinstance(field_value, list) and operator(len(field_value), int(size))
-				except:
-					return False
+			is_valid, field_value = self._decode_field_value(field, FieldTypes.ARRAY)
+			return is_valid and operator(len(field_value), int(size))
 		elif field_type == FieldTypes.JSON:
-			if isinstance(field_value, dict):
-				return operator(len(field_value), int(size))
-			if isinstance(field_value, str):
-				try:
-					field_value = json.loads(field_value)
-					return isinstance(field_value, dict) and operator(len(field_value), int(size))
-				except:
-					return False
+			is_valid, field_value = self._decode_field_value(field, FieldTypes.JSON)
+			return is_valid and isinstance(field_value, dict) and operator(len(field_value), int(size))
 		elif field_type == FieldTypes.FILE:
 			field_value.seek(0, os.SEEK_END)
 			file_size = round(field_value.tell() / 1024)
@@ -334,6 +660,16 @@ class Processor():
 			return operator(file_size, int(size))
 		return False
 
+	# Same as _get_rule_handler, but returns (handler, is_method) where methods must be given the processor
+	@staticmethod
+	def _get_class_rule_handler(rule_predicate):
+		if rule_predicate in Flaskvel._registered_rules:
+			return Flaskvel._registered_rules[rule_predicate], False
+		handler = getattr(Processor, 'handler_' + rule_predicate, None)
+		if handler is None:
+			raise Exception('No handler found for rule <{0}>.\nThis may be caused by a misspelled rule or by using a custom rule with an unregistered handler.'.format(rule_predicate))
+		return handler, True
+
 	def _get_rule_handler(self, rule_predicate):
 		if rule_predicate in Flaskvel._registered_rules:
 			return Flaskvel._registered_rules[rule_predicate]
@@ -350,18 +686,16 @@ class Processor():
 	def handler_active_url(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		try:
-			if requests.head(value).status_code < 400:
-				return True
-		except:
-			return False
+		if isinstance(value, str) and value in self._active_urls:
+			return self._active_urls[value]
+		return UrlChecker.is_active(value)
 
 	def handler_after(self, field_name, value, params, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.AFTER)
 		try:
-			return parse_date(value) > parse_date(params[0])
+			return DateParser.parse(value) > self._get_date_param(params)
 		except:
 			return False 
 
@@ -370,34 +704,40 @@ class Processor():
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.AFTER_OR_EQUAL)
 		try:
-			return parse_date(value) >= parse_date(params[0])
+			return DateParser.parse(value) >= self._get_date_param(params)
 		except:
 			return False
 
 	def handler_alpha(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(r"^[a-z\s]*$", re.IGNORECASE)
+		# ascii letters never need the regex
+		if isinstance(value, str) and value.isascii() and value.isalpha():
+			return True
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.ALPHA].match(value) is not None
 		except:
 			return False
 
 	def handler_alpha_dash(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(r"^[a-z\-_\s]*$", re.IGNORECASE)
+		# ascii letters never need the regex
+		if isinstance(value, str) and value.isascii() and value.isalpha():
+			return True
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.ALPHA_DASH].match(value) is not None
 		except:
 			return False
 
 	def handler_alpha_num(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(r"^[a-z0-9\s]*$", re.IGNORECASE)
+		# ascii letters and digits never need the regex
+		if isinstance(value, str) and value.isascii() and value.isalnum():
+			return True
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.ALPHA_NUM].match(value) is not None
 		except:
 			return False
 
@@ -408,7 +748,7 @@ class Processor():
 			return True
 		if isinstance(value, str):
 			try:
-				x = ast.literal_eval(value)
+				x = ArrayLiteralParser.parse(value)
 				return isinstance(x, list)
 			except:
 				return False
@@ -419,7 +759,7 @@ class Processor():
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.BEFORE)
 		try:
-			return parse_date(value) < parse_date(params[0])
+			return DateParser.parse(value) < self._get_date_param(params)
 		except:
 			return False
 
@@ -428,7 +768,7 @@ class Processor():
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.BEFORE_OR_EQUAL)
 		try:
-			return parse_date(value) <= parse_date(params[0])
+			return DateParser.parse(value) <= self._get_date_param(params)
 		except:
 			return False
 
@@ -455,7 +795,7 @@ class Processor():
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
 		try:
-			return parse_date(value) is not None
+			return DateParser.parse(value) is not None
 		except:
 			return False
 
@@ -464,7 +804,7 @@ class Processor():
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.DATE_EQUALS)
 		try:
-			return parse_date(value) == parse_date(params[0])
+			return DateParser.parse(value) == self._get_date_param(params)
 		except:
 			return False
 
@@ -519,59 +859,16 @@ class Processor():
 		return False
 
 	def handler_dimensions(self, field_name, value, params, err_msg_params=None, **kwargs):
+		# params are normally parsed by ParamsParser, raw strings are parsed here
+		constraints = ParamsParser.parse_dimensions(RulesPredicates.DIMENSIONS, params)[0]
 		if err_msg_params is not None:
-			err_msg_params['all_params'] = params
+			err_msg_params['all_params'] = constraints.get_params()
 			err_msg_params['field_name'] = field_name
-		self._assert_params_types(params, [str for _ in range(len(params))], RulesPredicates.DIMENSIONS)
-
-		valid_params = []
-		patterns = [
-			r"(min_width)=(\d+)",
-			r"(max_width)=(\d+)",
-			r"(min_height)=(\d+)",
-			r"(max_height)=(\d+)",
-			r"(width)=(\d+)",
-			r"(height)=(\d+)",
-			r"(ratio)=(\d+)/(\d+)"]
-		dim_rules = {}
-		for pattern in patterns:
-			for param in params:
-				match = re.compile(pattern).match(param)
-				if match:
-					groups = match.groups()
-					dim_rules[groups[0]] = groups[1:]
-					valid_params.append(param)
-		if not len(params) == len(valid_params):
-			raise Exception("Invalid parameters for rule 'dimensions': " + str(set(params) - set(valid_params)))
 
-		try:
-			image = Image.open(value)
-			width, height = image.size
-			for dim_rule, dim_params in dim_rules.items():
-				if dim_rule == "min_width":
-					if not int(dim_params[0]) <= width:
-						return False
-				elif dim_rule == "max_width":
-					if not int(dim_params[0]) >= width:
-						return False
-				elif dim_rule == "min_height":
-					if not int(dim_params[0]) <= height:
-						return False
-				elif dim_rule == "max_height":
-					if not int(dim_params[0]) >= height:
-						return False
-				elif dim_rule == "width":
-					if not int(dim_params[0]) == width:
-						return False
-				elif dim_rule == "height":
-					if not int(dim_params[0]) == height:
-						return False
-				elif dim_rule == "ratio":
-					if not width / int(dim_params[0]) == height / int(dim_params[1]):
-						return False
-			return True
-		except:
+		dimensions = ImageSniffer.get_dimensions(value)
+		if dimensions is None:
 			return False
+		return constraints.check(*dimensions)
 
 	def handler_distinct(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
@@ -580,7 +877,8 @@ class Processor():
 			return len(set(value)) == len(value)
 		elif isinstance(value, str):
 			try:
-				value = ast.literal_eval(value)
+				# the literals that aren't arrays fail, the strings that aren't literals pass
+				value = ArrayLiteralParser.parse_value(value)
 				return isinstance(value, list) and len(set(value)) == len(value)
 			except:
 				return True
@@ -589,9 +887,8 @@ class Processor():
 	def handler_email(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(".+@.+", re.IGNORECASE)
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.EMAIL].match(value) is not None
 		except:
 			return False
 
@@ -607,14 +904,8 @@ class Processor():
 				if value.endswith(param):
 					return True
 		elif field_type == FieldTypes.ARRAY:
-			if isinstance(value, list) and len(value) > 0:
-				return value[-1] in params
-			elif isinstance(value, str):
-				try:
-					value = ast.literal_eval(value)
-					return isinstance(value, list) and len(value) > 0 and value[-1] in params
-				except:
-					return False
+			is_valid, value = self._decode_field_value(field_name, FieldTypes.ARRAY)
+			return is_valid and len(value) > 0 and value[-1] in params
 		elif field_type == FieldTypes.FILE:
 			try:
 				CHUNK_SIZE = 16
@@ -667,10 +958,8 @@ class Processor():
 	def handler_image(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		try:
-			return value.filename.split(".")[-1] in ['jpg', 'jpeg', 'png', 'bmp', 'gif', 'svg', 'webp']
-		except:
-			return False
+		# the content is checked rather than the extension of the file
+		return ImageSniffer.get_format(value) is not None
 
 	def handler_in(self, field_name, value, params, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
@@ -682,13 +971,8 @@ class Processor():
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.IN_ARRAY)
-		other = self.get_field_value(params[0])
-		try:
-			if not isinstance(other, list):
-				other = ast.literal_eval(other)
-			return isinstance(other, list) and value in other
-		except:
-			return False
+		is_valid, other = self._decode_field_value(params[0], FieldTypes.ARRAY)
+		return is_valid and value in other
 
 	def handler_integer(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
@@ -709,35 +993,16 @@ class Processor():
 	def handler_ipv4(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(r'^(25[0-5]|2[0-4]\d|[0-1]?\d?\d)(\.(25[0-5]|2[0-4]\d|[0-1]?\d?\d)){3}$')
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.IPV4].match(value) is not None
 		except:
 			return False
 
 	def handler_ipv6(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(
-			r'([0-9a-fA-F]{1,4}:){7,7}[0-9a-fA-F]{1,4}|'				# 1:2:3:4:5:6:7:8
-			r'([0-9a-fA-F]{1,4}:){1,7}:|'								# 1::                              1:2:3:4:5:6:7::
-			r'([0-9a-fA-F]{1,4}:){1,6}:[0-9a-fA-F]{1,4}|'				# 1::8             1:2:3:4:5:6::8  1:2:3:4:5:6::8
-			r'([0-9a-fA-F]{1,4}:){1,5}(:[0-9a-fA-F]{1,4}){1,2}|'		# 1::7:8           1:2:3:4:5::7:8  1:2:3:4:5::8
-			r'([0-9a-fA-F]{1,4}:){1,4}(:[0-9a-fA-F]{1,4}){1,3}|'		# 1::6:7:8         1:2:3:4::6:7:8  1:2:3:4::8
-			r'([0-9a-fA-F]{1,4}:){1,3}(:[0-9a-fA-F]{1,4}){1,4}|'		# 1::5:6:7:8       1:2:3::5:6:7:8  1:2:3::8
-			r'([0-9a-fA-F]{1,4}:){1,2}(:[0-9a-fA-F]{1,4}){1,5}|'		# 1::4:5:6:7:8     1:2::4:5:6:7:8  1:2::8
-			r'[0-9a-fA-F]{1,4}:((:[0-9a-fA-F]{1,4}){1,6})|'				# 1::3:4:5:6:7:8   1::3:4:5:6:7:8  1::8  
-			r':((:[0-9a-fA-F]{1,4}){1,7}|:)|'							# ::2:3:4:5:6:7:8  ::2:3:4:5:6:7:8 ::8       ::     
-			r'fe80:(:[0-9a-fA-F]{0,4}){0,4}%[0-9a-zA-Z]{1,}|'			# fe80::7:8%eth0   fe80::7:8%1     (link-local IPv6 addresses with zone index)
-			r'::(ffff(:0{1,4}){0,1}:){0,1}'
-			r'((25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}'
-			r'(25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])|'				# ::255.255.255.255   ::ffff:255.255.255.255  ::ffff:0:255.255.255.255  (IPv4-mapped IPv6 addresses and IPv4-translated addresses)
-			r'([0-9a-fA-F]{1,4}:){1,4}:'
-			r'((25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}'
-			r'(25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])', re.IGNORECASE	# 2001:db8:3:4::192.0.2.33  64:ff9b::192.0.2.33 (IPv4-Embedded IPv6 Address)
-		)
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.IPV6].match(value) is not None
 		except:
 			return False
 
@@ -796,22 +1061,16 @@ class Processor():
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
 		self._assert_params_types(params, [str], RulesPredicates.NOT_IN_ARRAY)
-		other = self.get_field_value(params[0])
-		try:
-			if not isinstance(other, list):
-				other = ast.literal_eval(other)
-			return isinstance(other, list) and value not in other
-		except:
-			return False
+		is_valid, other = self._decode_field_value(params[0], FieldTypes.ARRAY)
+		return is_valid and value not in other
 
 	def handler_not_regex(self, field_name, value, params, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		self._assert_params_types(params, [str], RulesPredicates.NOT_REGEX)
+		pattern = self._get_pattern_param(params, RulesPredicates.NOT_REGEX)
 		try:
-			pattern = re.compile(params[0])
 			return pattern.match(value) is None
-		except:
+		except TypeError:
 			return False
 
 	def handler_numeric(self, field_name, value, err_msg_params=None, **kwargs):
@@ -833,11 +1092,10 @@ class Processor():
 	def handler_regex(self, field_name, value, params, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		self._assert_params_types(params, [str], RulesPredicates.REGEX)
+		pattern = self._get_pattern_param(params, RulesPredicates.REGEX)
 		try:
-			pattern = re.compile(params[0])
 			return pattern.match(value) is not None
-		except:
+		except TypeError:
 			return False
 
 	def handler_required(self, field_name, value, err_msg_params=None, **kwargs):
@@ -933,14 +1191,8 @@ class Processor():
 				if value.startswith(param):
 					return True
 		elif field_type == FieldTypes.ARRAY:
-			if isinstance(value, list) and len(value) > 0:
-				return value[0] in params
-			elif isinstance(value, str):
-				try:
-					value = ast.literal_eval(value)
-					return isinstance(value, list) and len(value) > 0 and value[0] in params
-				except:
-					return False
+			is_valid, value = self._decode_field_value(field_name, FieldTypes.ARRAY)
+			return is_valid and len(value) > 0 and value[0] in params
 		elif field_type == FieldTypes.FILE:
 			try:
 				CHUNK_SIZE = 16
@@ -971,28 +1223,20 @@ class Processor():
 	def handler_timezone(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		return value in pytz.all_timezones
+		return Timezones.is_valid(value)
 
 	def handler_url(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile(
-			r'^(?:http|ftp)s?://' # optional http:// or https://
-			r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|' #domain...
-			r'localhost|' #localhost...
-			r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})' # ...or ip
-			r'(?::\d+)?' # optional port
-			r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.URL].match(value) is not None
 		except:
 			return False
 
 	def handler_uuid(self, field_name, value, err_msg_params=None, **kwargs):
 		if err_msg_params is not None:
 			err_msg_params['field_name'] = field_name
-		pattern = re.compile("^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 		try:
-			return pattern.match(value) is not None
+			return Patterns[RulesPredicates.UUID].match(value) is not None
 		except:
 			return False
\ No newline at end of file
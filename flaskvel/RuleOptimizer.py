@@ -0,0 +1,152 @@
+from types import MappingProxyType
+
+from .Constants.RulesPredicates import RulesPredicates
+from .Flaskvel import Flaskvel
+from .Processor import Processor
+
+# Reorders the rules of every field so that the cheap ones run first and can stop the validation
+# (bail, fail modes) before the expensive ones. When every rule runs the outcome is the same and the errors
+# are still reported in the order the rules were written, but when the validation stops early the error
+# may come from another rule, which is why the optimizer is disabled unless Flaskvel(optimize_rules=True).
+class RuleOptimizer():
+	# cost classes
+	TYPE = 0
+	LENGTH = 1
+	PATTERN = 2
+	DATE = 3
+	FILE = 4
+	CUSTOM = 5 # registered rules and callables, their cost is unknown
+	NETWORK = 6
+
+	# presence and cross-field rules, kept first and in their original order
+	_leading_rules = frozenset([
+		RulesPredicates.BAIL,
+		RulesPredicates.NULLABLE,
+		RulesPredicates.REQUIRED,
+		RulesPredicates.REQUIRED_IF,
+		RulesPredicates.REQUIRED_UNLESS,
+		RulesPredicates.REQUIRED_WITH,
+		RulesPredicates.REQUIRED_WITH_ALL,
+		RulesPredicates.REQUIRED_WITHOUT,
+		RulesPredicates.REQUIRED_WITHOUT_ALL,
+		RulesPredicates.PRESENT,
+		RulesPredicates.FILLED,
+		RulesPredicates.CONFIRMED,
+		RulesPredicates.SAME,
+		RulesPredicates.DIFFERENT,
+		RulesPredicates.GT,
+		RulesPredicates.GTE,
+		RulesPredicates.LT,
+		RulesPredicates.LTE,
+		RulesPredicates.IN_ARRAY,
+		RulesPredicates.NOT_IN_ARRAY,
+	])
+
+	_costs = {
+		RulesPredicates.ACCEPTED: TYPE,
+		RulesPredicates.BOOLEAN: TYPE,
+		RulesPredicates.FILE: TYPE,
+		RulesPredicates.IN: TYPE,
+		RulesPredicates.INTEGER: TYPE,
+		RulesPredicates.NOT_IN: TYPE,
+		RulesPredicates.NUMERIC: TYPE,
+		RulesPredicates.STRING: TYPE,
+
+		RulesPredicates.BETWEEN: LENGTH,
+		RulesPredicates.DIGITS: LENGTH,
+		RulesPredicates.DIGITS_BETWEEN: LENGTH,
+		RulesPredicates.ENDS_WITH: LENGTH,
+		RulesPredicates.MAX: LENGTH,
+		RulesPredicates.MIN: LENGTH,
+		RulesPredicates.SIZE: LENGTH,
+		RulesPredicates.STARTS_WITH: LENGTH,
+
+		RulesPredicates.ALPHA: PATTERN,
+		RulesPredicates.ALPHA_DASH: PATTERN,
+		RulesPredicates.ALPHA_NUM: PATTERN,
+		RulesPredicates.ARRAY: PATTERN,
+		RulesPredicates.DISTINCT: PATTERN,
+		RulesPredicates.EMAIL: PATTERN,
+		RulesPredicates.IP: PATTERN,
+		RulesPredicates.IPV4: PATTERN,
+		RulesPredicates.IPV6: PATTERN,
+		RulesPredicates.JSON: PATTERN,
+		RulesPredicates.NOT_REGEX: PATTERN,
+		RulesPredicates.REGEX: PATTERN,
+		RulesPredicates.TIMEZONE: PATTERN,
+		RulesPredicates.URL: PATTERN,
+		RulesPredicates.UUID: PATTERN,
+
+		RulesPredicates.AFTER: DATE,
+		RulesPredicates.AFTER_OR_EQUAL: DATE,
+		RulesPredicates.BEFORE: DATE,
+		RulesPredicates.BEFORE_OR_EQUAL: DATE,
+		RulesPredicates.DATE: DATE,
+		RulesPredicates.DATE_EQUALS: DATE,
+		RulesPredicates.DATE_FORMAT: DATE,
+
+		RulesPredicates.DIMENSIONS: FILE,
+		RulesPredicates.IMAGE: FILE,
+		RulesPredicates.MIMETYPES: FILE,
+
+		RulesPredicates.ACTIVE_URL: NETWORK,
+	}
+
+	# rules whose message depends on the type of the field, they run after the rules declaring it
+	_size_rules = frozenset([
+		RulesPredicates.BETWEEN,
+		RulesPredicates.MAX,
+		RulesPredicates.MIN,
+		RulesPredicates.SIZE,
+	])
+
+	# rules declaring the type of a field, see Processor._type_rules
+	_type_rules = frozenset(rule for field_type, type_rules in Processor._type_rules for rule in type_rules)
+
+	@staticmethod
+	def optimize(parsed_rules):
+		return MappingProxyType({
+			field_name: RuleOptimizer.optimize_field(rules)
+			for field_name, rules in parsed_rules.items()
+		})
+
+	@staticmethod
+	def optimize_field(rules):
+		leading_rules = []
+		other_rules = []
+		for parsed_rule in rules:
+			if RuleOptimizer._is_leading(parsed_rule):
+				leading_rules.append(parsed_rule)
+			else:
+				other_rules.append(parsed_rule)
+		keys = {id(parsed_rule): (RuleOptimizer.get_cost(parsed_rule), 0) for parsed_rule in other_rules}
+		# a size rule running before the type is checked would fail with a message about another type
+		type_costs = [keys[id(parsed_rule)][0] for parsed_rule in other_rules if RuleOptimizer._declares_type(parsed_rule)]
+		if type_costs:
+			for parsed_rule in other_rules:
+				if RuleOptimizer._is_size_rule(parsed_rule):
+					keys[id(parsed_rule)] = (max(keys[id(parsed_rule)][0], max(type_costs)), 1)
+		# sorted is stable, rules of the same cost keep their order
+		return tuple(leading_rules + sorted(other_rules, key=lambda parsed_rule: keys[id(parsed_rule)]))
+
+	@staticmethod
+	def get_cost(parsed_rule):
+		predicate = parsed_rule.get_predicate()
+		if parsed_rule.has_unregistered_handler() or predicate in Flaskvel._registered_rules:
+			return RuleOptimizer.CUSTOM
+		return RuleOptimizer._costs.get(predicate, RuleOptimizer.CUSTOM)
+
+	@staticmethod
+	def _declares_type(parsed_rule):
+		return not parsed_rule.has_unregistered_handler() and parsed_rule.get_predicate() in RuleOptimizer._type_rules
+
+	@staticmethod
+	def _is_size_rule(parsed_rule):
+		predicate = parsed_rule.get_predicate()
+		return (not parsed_rule.has_unregistered_handler() and predicate in RuleOptimizer._size_rules
+			and predicate not in Flaskvel._registered_rules)
+
+	@staticmethod
+	def _is_leading(parsed_rule):
+		predicate = parsed_rule.get_predicate()
+		return not parsed_rule.has_unregistered_handler() and predicate in RuleOptimizer._leading_rules
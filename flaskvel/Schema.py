@@ -0,0 +1,172 @@
+import threading
+from types import MappingProxyType, FunctionType, BuiltinFunctionType, MethodType, ModuleType
+from collections import OrderedDict
+
+from .Parsers.UniversalParser import UniversalParser
+from .Compiler import Compiler
+from .Processor import Processor
+from .UploadLimiter import UploadLimiter
+from .RuleOptimizer import RuleOptimizer
+from .DependencyGraph import DependencyGraph
+from .WildcardFields import WildcardFields
+from .MessageTable import MessageTable
+from .MessageCatalogs import MessageCatalogs
+from .Flaskvel import Flaskvel
+from .Constants.FailModes import FailModes
+
+class Schema():
+	cache_size = 256
+
+	# key -> (snapshot of the source rules, compiled schema), the least recently used are dropped
+	_cache = OrderedDict()
+	_lock = threading.Lock()
+
+	def __init__(self, rules, cacheable=True):
+		self._parsed_rules = MappingProxyType({
+			field_name: tuple(field_rules)
+			for field_name, field_rules in UniversalParser.parse(rules).items()
+		})
+		self._cacheable = cacheable
+		self._reset()
+
+	def _reset(self):
+		self._optimized_rules = None
+		self._compiled = {} # (fail mode, optimized) -> compiled function
+		self._wildcard_groups = {} # optimized -> groups of the execution rules
+		self._field_plans = {} # (fail mode, optimized) -> plans of the execution rules
+		self._upload_limits = None
+		self._dependency_graph = None
+		self._declared_types = {} # filled by the processors, see Processor._get_declared_type
+		self._message_tables = OrderedDict() # locale -> (snapshot of the messages, table)
+		self._message_tables_lock = threading.Lock()
+
+	# Only the parsed rules are pickled (see ParallelValidation), the rest is built again when needed
+	def __getstate__(self):
+		return {'parsed_rules': dict(self._parsed_rules), 'cacheable': self._cacheable}
+
+	def __setstate__(self, state):
+		self._parsed_rules = MappingProxyType(state['parsed_rules'])
+		self._cacheable = state['cacheable']
+		self._reset()
+
+	def get_parsed_rules(self):
+		return self._parsed_rules
+
+	# The rules in the order they are run, see RuleOptimizer
+	def get_execution_rules(self):
+		if not Flaskvel._optimize_rules:
+			return self._parsed_rules
+		if self._optimized_rules is None:
+			self._optimized_rules = RuleOptimizer.optimize(self._parsed_rules)
+		return self._optimized_rules
+
+	def get_compiled(self, fail_mode=FailModes.COLLECT_ALL):
+		key = (fail_mode, Flaskvel._optimize_rules)
+		if key not in self._compiled:
+			self._compiled[key] = Compiler.compile(self.get_execution_rules(), fail_mode)
+		return self._compiled[key]
+
+	# The wildcard fields of the execution rules, see WildcardFields.group
+	def get_wildcard_groups(self):
+		key = Flaskvel._optimize_rules
+		if key not in self._wildcard_groups:
+			self._wildcard_groups[key] = WildcardFields.group(self.get_execution_rules())
+		return self._wildcard_groups[key]
+
+	# How the rules of every field run, see Processor.plan_field
+	def get_field_plans(self, fail_mode=FailModes.COLLECT_ALL):
+		key = (fail_mode, Flaskvel._optimize_rules)
+		if key not in self._field_plans:
+			self._field_plans[key] = MappingProxyType(Processor.plan_fields(self.get_execution_rules(), fail_mode))
+		return self._field_plans[key]
+
+	# The messages of a validator are usually created with each instance, the table is only built again when they change.
+	# As many tables as catalogs are kept, the least recently used locales are dropped.
+	def get_message_table(self, messages, locale=None):
+		# the locales without a catalog share the table of the default locale
+		if locale is None or not MessageCatalogs.has_catalog(locale):
+			locale = MessageCatalogs.default_locale
+		tables = self._message_tables
+		with self._message_tables_lock:
+			cached = tables.get(locale)
+			if cached is not None and cached[0] == messages:
+				tables.move_to_end(locale)
+				return cached[1]
+		table = MessageTable(self._parsed_rules, messages, MessageCatalogs.get(locale))
+		table.warn_missing()
+		with self._message_tables_lock:
+			tables[locale] = (dict(messages), table)
+			while len(tables) > MessageCatalogs.cache_size:
+				tables.popitem(last=False)
+		return table
+
+	def get_declared_types(self):
+		return self._declared_types
+
+	def get_dependency_graph(self):
+		if self._dependency_graph is None:
+			self._dependency_graph = DependencyGraph(self._parsed_rules)
+		return self._dependency_graph
+
+	def get_upload_limits(self):
+		if self._upload_limits is None:
+			self._upload_limits = UploadLimiter.get_limits(self._parsed_rules)
+		return self._upload_limits
+
+	def is_cacheable(self):
+		return self._cacheable
+
+	@staticmethod
+	def compile(rules, key):
+		# rules holding callables built for an instance (bound methods, lambdas, closures) can't be shared between requests
+		if Schema._has_local_rules(rules):
+			return Schema(rules, cacheable=False)
+
+		with Schema._lock:
+			cached = Schema._cache.get(key)
+			# the snapshot guards against rules that change between instances of the same class
+			if cached is not None and cached[0] == rules:
+				Schema._cache.move_to_end(key)
+				return cached[1]
+
+		schema = Schema(rules)
+		with Schema._lock:
+			Schema._cache[key] = (Schema._snapshot(rules), schema)
+			Schema._cache.move_to_end(key)
+			while len(Schema._cache) > Schema.cache_size:
+				Schema._cache.popitem(last=False)
+		return schema
+
+	@staticmethod
+	def clear_cache():
+		with Schema._lock:
+			Schema._cache.clear()
+
+	@staticmethod
+	def _snapshot(rules):
+		return {
+			field_name: list(field_rules) if isinstance(field_rules, list) else field_rules
+			for field_name, field_rules in rules.items()
+		}
+
+	@staticmethod
+	def _has_local_rules(rules):
+		for field_rules in rules.values():
+			if not isinstance(field_rules, (list, tuple)):
+				field_rules = [field_rules]
+			for rule in field_rules:
+				predicate = getattr(rule, '_predicate', rule)
+				if callable(predicate) and not Schema._is_module_level(predicate):
+					return True
+		return False
+
+	# Functions, classes and class methods defined at the level of a module are the same object for every request
+	@staticmethod
+	def _is_module_level(predicate):
+		if isinstance(predicate, MethodType):
+			return isinstance(predicate.__self__, type) and Schema._is_module_level(predicate.__self__)
+		if isinstance(predicate, BuiltinFunctionType):
+			return predicate.__self__ is None or isinstance(predicate.__self__, (ModuleType, type))
+		if isinstance(predicate, (FunctionType, type)):
+			return '<locals>' not in predicate.__qualname__ and '<lambda>' not in predicate.__qualname__
+		return False
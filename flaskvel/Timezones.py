@@ -0,0 +1,38 @@
+from .Constants.TimezoneProviders import TimezoneProviders
+
+# Index of the valid timezone identifiers used by the timezone rule.
+# The provider is imported and the index is built only when they are first needed (or on preload).
+class Timezones():
+	_provider = TimezoneProviders.PYTZ
+	_index = None
+
+	@staticmethod
+	def configure(provider=TimezoneProviders.PYTZ, preload=False):
+		if provider not in [TimezoneProviders.PYTZ, TimezoneProviders.ZONEINFO]:
+			raise Exception("Invalid timezone provider: {0}".format(provider))
+		if provider != Timezones._provider:
+			Timezones._provider = provider
+			Timezones._index = None
+		if preload:
+			Timezones.get_index()
+
+	@staticmethod
+	def get_index():
+		if Timezones._index is None:
+			Timezones._index = Timezones._build_index(Timezones._provider)
+		return Timezones._index
+
+	@staticmethod
+	def is_valid(name):
+		try:
+			return name in Timezones.get_index()
+		except TypeError: # unhashable values
+			return False
+
+	@staticmethod
+	def _build_index(provider):
+		if provider == TimezoneProviders.ZONEINFO:
+			import zoneinfo
+			return frozenset(zoneinfo.available_timezones())
+		import pytz
+		return frozenset(pytz.all_timezones)
@@ -0,0 +1,132 @@
+import inspect
+from functools import partial
+from werkzeug.formparser import FormDataParser, MultiPartParser # comes packaged with flask
+
+from .Constants.RulesPredicates import RulesPredicates
+from .Constants.FieldTypes import FieldTypes
+from .Exceptions.UploadTooLargeException import UploadTooLargeException
+from .Flaskvel import Flaskvel
+from .Processor import Processor
+
+# Enforces the max/size/between rules of file fields while the multipart body is being received,
+# so that a large upload is rejected after reading only a little more than the allowed size.
+# Only the public API of werkzeug's parsers is used: FormDataParser.parse, the MultiPartParser constructor,
+# parse and start_file_streaming(event, total_content_length) (werkzeug 2.2+). With other versions
+# the stock parser is kept and the rules are checked once the upload was received.
+class UploadLimiter():
+	# predicate -> index of the param holding the maximum size (kilobytes)
+	_upper_bound_params = {
+		RulesPredicates.MAX: 0,
+		RulesPredicates.SIZE: 0,
+		RulesPredicates.BETWEEN: 1,
+	}
+
+	# Returns {field_name: (max_bytes, parsed_rule)} for the file fields having a size limit
+	@staticmethod
+	def get_limits(parsed_rules):
+		limits = {}
+		for field_name, rules in parsed_rules.items():
+			if '.' in field_name: # only top level fields can be uploaded files
+				continue
+			if Processor.find_declared_type(rules) != FieldTypes.FILE:
+				continue
+			for parsed_rule in rules:
+				predicate = parsed_rule.get_predicate()
+				if predicate not in UploadLimiter._upper_bound_params or predicate in Flaskvel._registered_rules:
+					continue
+				try:
+					size = int(parsed_rule.get_params()[UploadLimiter._upper_bound_params[predicate]])
+				except: # invalid params are reported by the rule itself
+					continue
+				# sizes are compared in rounded kilobytes, any file above this is guaranteed to fail the rule
+				max_bytes = size * 1024 + 512
+				if field_name not in limits or max_bytes < limits[field_name][0]:
+					limits[field_name] = (max_bytes, parsed_rule)
+		return limits
+
+	@staticmethod
+	def is_supported():
+		try:
+			parameters = list(inspect.signature(MultiPartParser.start_file_streaming).parameters)
+		except (AttributeError, TypeError, ValueError):
+			return False
+		return parameters == ['self', 'event', 'total_content_length']
+
+	@staticmethod
+	def install(request, limits):
+		if not limits or not hasattr(request, 'form_data_parser_class') or not UploadLimiter._supported:
+			return
+		# Content-Length is an upper bound for the size of every file, small bodies don't need to be watched
+		content_length = request.content_length
+		if content_length is not None and content_length <= min(limit[0] for limit in limits.values()):
+			return
+		request.form_data_parser_class = partial(_LimitedFormDataParser, upload_limits=limits)
+
+UploadLimiter._supported = UploadLimiter.is_supported()
+
+class _LimitedFormDataParser(FormDataParser):
+	# the options of MultiPartParser taken from the form data parser, the ones missing from this version of werkzeug are left out
+	_parser_options = [
+		name for name in ['stream_factory', 'max_form_memory_size', 'max_form_parts', 'cls']
+		if name in inspect.signature(MultiPartParser.__init__).parameters
+	]
+
+	def __init__(self, *args, upload_limits=None, **kwargs):
+		super().__init__(*args, **kwargs)
+		self._upload_limits = upload_limits
+
+	def parse(self, stream, mimetype, content_length, options=None):
+		if mimetype != 'multipart/form-data':
+			return super().parse(stream, mimetype, content_length, options)
+		parser = _LimitedMultiPartParser(self._upload_limits, **{
+			name: getattr(self, name, None) for name in _LimitedFormDataParser._parser_options
+		})
+		try:
+			boundary = (options or {}).get('boundary', '').encode('ascii')
+			if not boundary:
+				raise ValueError('Missing boundary')
+			form, files = parser.parse(stream, boundary, content_length)
+			return stream, form, files
+		except ValueError:
+			if not self.silent:
+				raise
+		return stream, self.cls(), self.cls()
+
+class _LimitedMultiPartParser(MultiPartParser):
+	def __init__(self, upload_limits, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self._upload_limits = upload_limits
+
+	def start_file_streaming(self, event, total_content_length):
+		container = super().start_file_streaming(event, total_content_length)
+		limit = self._upload_limits.get(event.name)
+		if limit is None:
+			return container
+		max_bytes, parsed_rule = limit
+		# the part may declare its own size
+		try:
+			if int(event.headers.get('content-length', 0)) > max_bytes:
+				raise UploadTooLargeException(event.name, parsed_rule)
+		except ValueError:
+			pass
+		return _LimitedFile(container, event.name, max_bytes, parsed_rule)
+
+class _LimitedFile():
+	def __init__(self, container, field_name, max_bytes, parsed_rule):
+		self._container = container
+		self._field_name = field_name
+		self._max_bytes = max_bytes
+		self._parsed_rule = parsed_rule
+		self._written = 0
+
+	def write(self, data):
+		self._written += len(data)
+		if self._written > self._max_bytes:
+			raise UploadTooLargeException(self._field_name, self._parsed_rule)
+		return self._container.write(data)
+
+	def __getattr__(self, name):
+		return getattr(self._container, name)
+
+	def __iter__(self):
+		return iter(self._container)
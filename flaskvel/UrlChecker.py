@@ -0,0 +1,143 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# Checks the URLs of the active_url rule through a shared, pooled session
+# and keeps the results in a TTL + LRU cache.
+class UrlChecker():
+	timeout = 5 # seconds, requests without a timeout could block a worker forever
+	cache_ttl = 300 # seconds, 0 disables the cache
+	cache_size = 1024
+	cache_by_host = False # share the result between all the URLs of a host
+	parallel_checks = False # check all the active_url fields of a request at once
+	max_workers = 8
+	pool_size = 10
+
+	_session = None
+	_cache = OrderedDict()
+	_lock = threading.Lock()
+
+	@staticmethod
+	def configure(timeout=5, cache_ttl=300, cache_size=1024, cache_by_host=False, parallel_checks=False, max_workers=8, pool_size=10):
+		if timeout is None:
+			raise Exception("A timeout is required for the active_url rule")
+		UrlChecker.timeout = timeout
+		UrlChecker.cache_ttl = cache_ttl
+		UrlChecker.cache_size = cache_size
+		UrlChecker.cache_by_host = cache_by_host
+		UrlChecker.parallel_checks = parallel_checks
+		UrlChecker.max_workers = max_workers
+		UrlChecker.pool_size = pool_size
+		with UrlChecker._lock:
+			session, UrlChecker._session = UrlChecker._session, None
+		if session is not None:
+			session.close()
+		UrlChecker.clear_cache()
+
+	# The arguments of configure matching the current configuration
+	@staticmethod
+	def get_options():
+		return {
+			'timeout': UrlChecker.timeout,
+			'cache_ttl': UrlChecker.cache_ttl,
+			'cache_size': UrlChecker.cache_size,
+			'cache_by_host': UrlChecker.cache_by_host,
+			'parallel_checks': UrlChecker.parallel_checks,
+			'max_workers': UrlChecker.max_workers,
+			'pool_size': UrlChecker.pool_size,
+		}
+
+	@staticmethod
+	def clear_cache():
+		with UrlChecker._lock:
+			UrlChecker._cache.clear()
+
+	@staticmethod
+	def is_active(url):
+		key = UrlChecker._get_cache_key(url)
+		cached = UrlChecker._get_cached(key)
+		if cached is not None:
+			return cached
+		result = UrlChecker._request(url)
+		UrlChecker._set_cached(key, result)
+		return result
+
+	@staticmethod
+	def check_many(urls):
+		urls = list(dict.fromkeys(urls))
+		results = {}
+		pending = []
+		for url in urls:
+			cached = UrlChecker._get_cached(UrlChecker._get_cache_key(url))
+			if cached is None:
+				pending.append(url)
+			else:
+				results[url] = cached
+		if len(pending) == 1:
+			results[pending[0]] = UrlChecker.is_active(pending[0])
+		elif len(pending) > 1:
+			with ThreadPoolExecutor(max_workers=min(len(pending), UrlChecker.max_workers)) as executor:
+				for url, result in zip(pending, executor.map(UrlChecker.is_active, pending)):
+					results[url] = result
+		return results
+
+	@staticmethod
+	def get_session():
+		if UrlChecker._session is None:
+			with UrlChecker._lock:
+				if UrlChecker._session is None:
+					session = requests.Session()
+					adapter = HTTPAdapter(pool_connections=UrlChecker.pool_size, pool_maxsize=UrlChecker.pool_size)
+					session.mount('http://', adapter)
+					session.mount('https://', adapter)
+					UrlChecker._session = session
+		return UrlChecker._session
+
+	@staticmethod
+	def _request(url):
+		try:
+			return UrlChecker.get_session().head(url, timeout=UrlChecker.timeout).status_code < 400
+		except:
+			return False
+
+	@staticmethod
+	def _get_cache_key(url):
+		if UrlChecker.cache_by_host:
+			try:
+				parts = urlsplit(url)
+				return (parts.scheme, parts.netloc)
+			except:
+				pass
+		return url
+
+	@staticmethod
+	def _get_cached(key):
+		if UrlChecker.cache_ttl <= 0 or UrlChecker.cache_size <= 0:
+			return None
+		with UrlChecker._lock:
+			try:
+				expires_at, result = UrlChecker._cache[key]
+			except (KeyError, TypeError):
+				return None
+			if expires_at < time.monotonic():
+				del UrlChecker._cache[key]
+				return None
+			UrlChecker._cache.move_to_end(key)
+			return result
+
+	@staticmethod
+	def _set_cached(key, result):
+		if UrlChecker.cache_ttl <= 0 or UrlChecker.cache_size <= 0:
+			return
+		with UrlChecker._lock:
+			try:
+				UrlChecker._cache[key] = (time.monotonic() + UrlChecker.cache_ttl, result)
+			except TypeError: # unhashable values
+				return
+			UrlChecker._cache.move_to_end(key)
+			while len(UrlChecker._cache) > UrlChecker.cache_size:
+				UrlChecker._cache.popitem(last=False)
@@ -1,70 +1,229 @@
 from functools import wraps
-import time
 from flask import request
 
 from .Flaskvel import Flaskvel
 from .Constants.BodyFormat import BodyFormats
-from .Parsers.UniversalParser import UniversalParser
+from .Schema import Schema
 from .Processor import Processor
+from .UploadLimiter import UploadLimiter
+from .ParallelValidation import ParallelValidation
+from .Timezones import Timezones
+from .UrlChecker import UrlChecker
+from .ErrorSerializer import ErrorSerializer
+from .MessageCatalogs import MessageCatalogs
 from .ParsedRule import ParsedRule
 from .Exceptions.ValidationException import ValidationException
+from .Exceptions.UploadTooLargeException import UploadTooLargeException
 
 class Validator():
+	# configuration sent to the processes of ParallelValidation, with the timezone provider, the active_url options
+	# and the serializer measuring the errors for _max_errors_size
+	_worker_settings = ['_compile_rules', '_optimize_rules', '_max_failed_fields', '_max_field_errors', '_max_errors_size']
+
 	def __init__(self, request, expected_body_format=BodyFormats.ANY):
 		self._request = request
 		self._expected_body_format = expected_body_format
 		self._parsed_rules = {}
+		self._schema = None
+		self._body_format_error = None # message of the validation exception when the body has the wrong format
 		# override these 2 attributes in your own implemenation of validator #
 		self.rules = {}
 		self.messages = {}
 		# ------------------------------------------------------------------ #
+		self.fail_mode = None # overrides the fail_mode given to Flaskvel
+		self.locale = None # overrides the locale given to Flaskvel and its locale_selector
 		self._processor = Processor(self)
 
 	def get_parsed_rules(self):
 		return self._parsed_rules
 
+	def get_schema(self):
+		return self._schema
+
+	def get_dependency_graph(self):
+		return self._compile_schema().get_dependency_graph()
+
+	def get_fail_mode(self):
+		if self.fail_mode is None:
+			return Flaskvel._fail_mode
+		return self.fail_mode
+
+	# The locale of the default messages, only the table of its messages is shared by the validations (nothing is copied)
+	def get_locale(self):
+		if self.locale is not None:
+			return self.locale
+		if Flaskvel._locale_selector is not None and self._request is not None:
+			locale = Flaskvel._locale_selector(self._request)
+			if locale is not None:
+				return locale
+		return Flaskvel._locale
+
 	def get_request(self):
 		return self._request
 
 	def get_messages(self):
 		return self.messages
 
+	# The rules that have neither a custom message nor a default one, meant to be checked on startup
+	@classmethod
+	def get_missing_messages(cls):
+		validator = cls(None)
+		return validator._compile_schema().get_message_table(validator.get_messages()).get_missing()
+
+	# The error messages, or the message about the body format when the body has the wrong format
 	def get_validation_errors(self):
+		if self._body_format_error is not None:
+			return self._body_format_error
 		return self._processor.get_errors()
 
 	def get_processor(self):
 		return self._processor
 
 	def validate(self):
+		if not self.passes():
+			raise Flaskvel._exception_class(self.get_validation_errors())
+		return True
+
+	# Runs the validation without raising the validation exception, a body of the wrong format fails it as well.
+	# The error messages aren't rendered until they are read through get_validation_errors,
+	# so callers that only need the result don't pay for them.
+	def passes(self):
 		if not hasattr(self, '_processor'):
 			raise Exception("Base validator not initialized. Most probably you forgot to call super().__init__(*args, **kwargs) inside your validator class.")
-		self._validate_body_format()
-		self._parsed_rules = UniversalParser.parse(self.rules)
-		result = self._processor._run()
-		if not result:
-			raise Flaskvel._exception_class(self._processor.get_errors())
-		return True
+		self._body_format_error = self._validate_body_format()
+		if self._body_format_error is not None:
+			return False
+		self._parsed_rules = self._compile_schema().get_parsed_rules()
+		if Flaskvel._limit_uploads:
+			UploadLimiter.install(self._request, self._schema.get_upload_limits())
+		try:
+			return self._processor._run()
+		except UploadTooLargeException as e:
+			# the rest of the upload is left unread, the server deals with it
+			return self._processor._reject_upload(e.field_name, e.parsed_rule)
 
+	def fails(self):
+		return not self.passes()
+
+	# Validates a list of dictionaries against the rules of the validator, without a request.
+	# Returns the errors of every record, an empty dictionary when the record is valid.
+	# Large lists are split between several processes when ParallelValidation is enabled.
+	@classmethod
+	def validate_many(cls, records, rules=None, messages=None, fail_mode=None, chunk_size=1000):
+		validator = cls(None)
+		if rules is not None:
+			validator.rules = rules
+			validator._schema = Schema.compile(rules, key=id(rules))
+		if messages is not None:
+			validator.messages = messages
+		if fail_mode is not None:
+			validator.fail_mode = fail_mode
+		validator._parsed_rules = validator._compile_schema().get_parsed_rules()
+
+		if ParallelValidation.should_run(records):
+			# the workers may not share the configuration of this process (spawn)
+			settings = (
+				{name: getattr(Flaskvel, name) for name in Validator._worker_settings},
+				Timezones._provider,
+				UrlChecker.get_options(),
+				ErrorSerializer._serializer,
+			)
+			locale = validator.get_locale()
+			catalog = (locale, MessageCatalogs.get_portable_source(locale))
+			context = (validator.get_messages(), validator.get_fail_mode(), chunk_size, settings, catalog)
+			errors = ParallelValidation.run(validator.get_schema(), context, records, Validator._validate_in_worker)
+			if errors is not None:
+				return errors
+		return validator._validate_records(records, chunk_size)
+
+	# Runs in the processes of ParallelValidation
+	@staticmethod
+	def _validate_in_worker(task, records):
+		schema, (messages, fail_mode, chunk_size, settings, (locale, catalog_source)) = ParallelValidation.load_task(task)
+		flaskvel_settings, timezone_provider, active_url_options, serializer = settings
+		for name, value in flaskvel_settings.items():
+			setattr(Flaskvel, name, value)
+		Timezones.configure(timezone_provider)
+		# configure drops the cache and the session of the checker, the workers keep them between the chunks
+		if UrlChecker.get_options() != active_url_options:
+			UrlChecker.configure(**active_url_options)
+		if ErrorSerializer._serializer != serializer or ErrorSerializer._envelope is None:
+			ErrorSerializer.configure(serializer)
+		if catalog_source is not None and MessageCatalogs._sources.get(locale) != catalog_source:
+			MessageCatalogs.register(locale, catalog_source)
+		validator = Validator(None)
+		validator._schema = schema
+		validator._parsed_rules = schema.get_parsed_rules()
+		validator.messages = messages
+		validator.fail_mode = fail_mode
+		validator.locale = locale
+		return validator._validate_records(records, chunk_size)
+
+	def _validate_records(self, records, chunk_size):
+		errors = []
+		chunk = []
+		for record in records:
+			chunk.append(Processor(self, body=record if isinstance(record, dict) else {}))
+			if len(chunk) >= chunk_size:
+				errors.extend(self._validate_chunk(chunk))
+				chunk = []
+		if chunk:
+			errors.extend(self._validate_chunk(chunk))
+		return errors
+
+	def _validate_chunk(self, processors):
+		Processor._run_many(processors, self)
+		return [processor.get_errors() for processor in processors]
+
+	def _compile_schema(self):
+		if self._schema is None:
+			self._schema = Schema.compile(self.rules, key=type(self))
+		return self._schema
+
+	# Returns the error message when the body doesn't have the expected format, None otherwise
 	def _validate_body_format(self):
 		if self._expected_body_format == BodyFormats.ANY:
-			return True
+			return None
 		elif self._expected_body_format == BodyFormats.JSON:
 			if not self._request.is_json:
-				time.sleep(0.5) # this fixes a bug that triggers "write EPIPE" on client side
-				raise Flaskvel._exception_class("Request body is not a valid json")
-			return True
+				self._drain_body()
+				return "Request body is not a valid json"
+			return None
 		elif self._expected_body_format == BodyFormats.FORM:
 			if self._request.is_json:
-				time.sleep(0.5) # this fixes a bug that triggers "write EPIPE" on client side
-				raise Flaskvel._exception_class("Request body is not a valid form")
-			return True
+				self._drain_body()
+				return "Request body is not a valid form"
+			return None
 		else:
+			# a mistake in the code of the validator, not in the request
 			raise Flaskvel._exception_class("Invalid body format")
 
+	# The unread body must be consumed before answering, otherwise the server may close the connection
+	# while the client is still sending it, which triggers "write EPIPE" on client side.
+	# Bodies larger than Flaskvel._max_drain_size are left unread, the server deals with them
+	# (Connection is a hop-by-hop header, WSGI applications can't set it).
+	def _drain_body(self):
+		stream = getattr(self._request, 'stream', None)
+		if stream is None:
+			return
+		limit = Flaskvel._max_drain_size
+		content_length = self._request.content_length
+		if content_length is not None and content_length > limit:
+			return
+		drained = 0
+		while drained <= limit:
+			chunk = stream.read(min(limit + 1 - drained, 65536))
+			if not chunk:
+				return
+			drained += len(chunk)
+
 # methods: {"GET", "POST", "PUT", "DELETE"....}
 # methods can be PipedString or Array or '*'
 def validate(validator_class, expected_body_format=BodyFormats.ANY, run_on_methods="*"):
 	def decorator(func):
+		# parsed when the view is defined so that invalid rules and missing messages are reported on startup,
+		# like validate_no_validator does
+		validator_class.get_missing_messages()
 		@wraps(func)
 		def wrapper(*args, **kwargs):
 			if run_on_methods == "*" or request.method in run_on_methods:
@@ -74,7 +233,10 @@ def validate(validator_class, expected_body_format=BodyFormats.ANY, run_on_metho
 		return wrapper
 	return decorator
 
-def validate_no_validator(rules, messages={}, expected_body_format=BodyFormats.ANY, run_on_methods="*"):
+def validate_no_validator(rules, messages={}, expected_body_format=BodyFormats.ANY, run_on_methods="*", fail_mode=None):
+	# parsed at import time so that invalid rules and missing messages are reported on startup
+	schema = Schema.compile(rules, key=id(rules))
+	schema.get_message_table(messages)
 	def decorator(func):
 		@wraps(func)
 		def wrapper(*args, **kwargs):
@@ -82,6 +244,8 @@ def validate_no_validator(rules, messages={}, expected_body_format=BodyFormats.A
 				validator = Validator(request, expected_body_format)
 				validator.rules = rules
 				validator.messages = messages
+				validator.fail_mode = fail_mode
+				validator._schema = schema
 				validator.validate()
 			# else: validation ignored for other methods
 			return func(*args, **kwargs)
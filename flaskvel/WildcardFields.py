@@ -0,0 +1,80 @@
+import json
+from types import MappingProxyType
+
+from .Parsers.ArrayLiteralParser import ArrayLiteralParser
+
+# Fields such as items.*.price, where every * stands for the elements of a list.
+# The fields walking the same list are grouped, so that the list is walked once for all their rules,
+# one element at a time; the rules are never copied for every element.
+class WildcardFields():
+	WILDCARD = '*'
+
+	# Returns {field name: (list field, fields)} where fields are (field name, keys after the first *, rules)
+	# for all the wildcard fields walking the same list. Only the first field of a group maps to it, the others map to None.
+	@staticmethod
+	def group(parsed_rules):
+		groups = {}
+		starts = {}
+		for field_name, rules in parsed_rules.items():
+			keys = field_name.split('.')
+			if WildcardFields.WILDCARD not in keys:
+				continue
+			index = keys.index(WildcardFields.WILDCARD)
+			prefix = '.'.join(keys[:index])
+			starts[field_name] = None if prefix in groups else prefix
+			groups.setdefault(prefix, []).append((field_name, tuple(keys[index + 1:]), rules))
+		return MappingProxyType({
+			field_name: None if prefix is None else (prefix, tuple(groups[prefix]))
+			for field_name, prefix in starts.items()
+		})
+
+	# Yields (field name, value) for every value matched by keys within value, name being the name of value.
+	# The remaining * segments are expanded lazily, element after element.
+	@staticmethod
+	def expand(value, keys, name):
+		last = len(keys) - 1
+		for index, key in enumerate(keys):
+			if key == WildcardFields.WILDCARD:
+				rest = keys[index + 1:]
+				for element_index, element in enumerate(WildcardFields.get_elements(value)):
+					yield from WildcardFields.expand(element, rest, '{0}.{1}'.format(name, element_index))
+				return
+			if value is not None:
+				value = WildcardFields.get_child(value, key, index == last)
+			name = '{0}.{1}'.format(name, key)
+		yield name, value
+
+	# The value found at key: a key of an object or an index of a list.
+	# Strings holding JSON objects are decoded (forms), the ones holding lists only when more keys follow.
+	@staticmethod
+	def get_child(value, key, is_last=True):
+		if isinstance(value, dict):
+			value = value.get(key)
+		elif isinstance(value, list) and key.isdecimal():
+			index = int(key)
+			value = value[index] if index < len(value) else None
+		else:
+			return None
+		if isinstance(value, str):
+			start = value.lstrip()[:1]
+			if start == '{' or (start == '[' and not is_last):
+				try:
+					decoded = json.loads(value)
+					if isinstance(decoded, (dict, list)):
+						value = decoded
+				except:
+					pass
+		return value
+
+	@staticmethod
+	def get_elements(value):
+		if isinstance(value, list):
+			return value
+		if isinstance(value, str):
+			try:
+				decoded = ArrayLiteralParser.parse(value)
+				if isinstance(decoded, list):
+					return decoded
+			except:
+				pass
+		return ()
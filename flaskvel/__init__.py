@@ -3,6 +3,9 @@ from .ParsedRule import ParsedRule
 from .Constants.BodyFormat import BodyFormats
 from .Constants.RulesPredicates import RulesPredicates as Rules
 from .Constants.FieldTypes import FieldTypes
+from .Constants.TimezoneProviders import TimezoneProviders
+from .Constants.FailModes import FailModes
+from .Constants.Serializers import Serializers
 from .Flaskvel import Flaskvel
 from .Exceptions.ValidationException import ValidationException
 
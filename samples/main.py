@@ -11,7 +11,7 @@ from MyCustomException import MyCustomException
 from CustomValidator2 import CustomValidator2
 
 app = Flask(__name__)
-# todo: add DefaultMessages translation units
+# Flaskvel.register_catalog('fr', 'translations.fr') # see "Translations" in the docs
 # Flaskvel(app, exception_class=MyCustomException, error_code=403)
 Flaskvel(app)
 
@@ -30,9 +30,8 @@ setup(
 		'Topic :: Software Development :: Build Tools',
 		'License :: OSI Approved :: MIT License', 
 		'Programming Language :: Python :: 3',
-		'Programming Language :: Python :: 3.6',
 		'Programming Language :: Python :: 3.7',
 		'Programming Language :: Python :: 3.8',
 	],
-	python_requires='>=3.6'
+	python_requires='>=3.7'
 )
\ No newline at end of file
@@ -0,0 +1,26 @@
+from types import FunctionType
+import pytest
+
+from flaskvel import Flaskvel
+
+# The configuration of Flaskvel is held by class attributes, every test gets back the one it started with
+@pytest.fixture(autouse=True)
+def flaskvel_settings():
+	settings = {
+		name: dict(value) if isinstance(value, dict) else value for name, value in vars(Flaskvel).items()
+		if name.startswith('_') and not name.startswith('__') and not isinstance(value, (FunctionType, staticmethod, classmethod))
+	}
+	yield
+	for name, value in settings.items():
+		current = getattr(Flaskvel, name)
+		if isinstance(value, dict) and isinstance(current, dict):
+			# other modules may hold the same dict (the registered rules)
+			current.clear()
+			current.update(value)
+		else:
+			setattr(Flaskvel, name, value)
+
+@pytest.fixture(params=[False, True])
+def compile_rules(request):
+	Flaskvel._compile_rules = request.param
+	return request.param
@@ -0,0 +1,131 @@
+import time
+import socket
+import threading
+import pytest
+from flask import Flask, request
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+
+from flaskvel import Flaskvel, BodyFormats, validate_no_validator
+
+def create_app():
+	app = Flask(__name__)
+	Flaskvel(app)
+
+	@app.route('/json', methods=['POST'])
+	@validate_no_validator({}, expected_body_format=BodyFormats.JSON)
+	def json_endpoint():
+		return 'ok'
+
+	@app.route('/form', methods=['POST'])
+	@validate_no_validator({}, expected_body_format=BodyFormats.FORM)
+	def form_endpoint():
+		return 'ok'
+
+	return app
+
+@pytest.fixture
+def client():
+	app = create_app()
+
+	@app.after_request
+	def remaining_body(response):
+		response.headers['X-Remaining-Body'] = str(len(request.stream.read()))
+		return response
+
+	return app.test_client()
+
+class QuietRequestHandler(WSGIRequestHandler):
+	def log_message(self, *args):
+		pass
+
+@pytest.fixture
+def server():
+	# unlike werkzeug's development server, wsgiref doesn't read the rest of the body by itself
+	httpd = make_server('127.0.0.1', 0, create_app(), handler_class=QuietRequestHandler)
+	thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+	thread.start()
+	yield httpd.server_address
+	httpd.shutdown()
+	httpd.server_close()
+
+def test_wrong_format_returns_immediately(client):
+	start = time.monotonic()
+	response = client.post('/json', data={'field': 'value'})
+	assert time.monotonic() - start < 0.25
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == 'Request body is not a valid json'
+
+	start = time.monotonic()
+	response = client.post('/form', json={'field': 'value'})
+	assert time.monotonic() - start < 0.25
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == 'Request body is not a valid form'
+
+def test_right_format(client):
+	assert client.post('/json', json={'field': 'value'}).status_code == 200
+	assert client.post('/form', data={'field': 'value'}).status_code == 200
+
+def test_wrong_format_drains_body(client):
+	response = client.post('/json', data='x' * 10000, content_type='text/plain')
+	assert response.status_code == 400
+	assert response.headers['X-Remaining-Body'] == '0'
+	assert 'Connection' not in response.headers
+
+def test_wrong_format_over_drain_size(client):
+	Flaskvel._max_drain_size = 1000
+	response = client.post('/json', data='x' * 10000, content_type='text/plain')
+	assert response.status_code == 400
+	assert response.headers['X-Remaining-Body'] == '10000'
+	# hop-by-hop headers aren't allowed in WSGI responses
+	assert 'Connection' not in response.headers
+
+def send_raw_request(address, body, chunk_size=16 * 1024, delay=0.01):
+	# the body is sent slowly, so that it is still being written when the response arrives
+	connection = socket.create_connection(address)
+	try:
+		connection.sendall('POST /json HTTP/1.0\r\nHost: localhost\r\nContent-Type: text/plain\r\nContent-Length: {0}\r\n\r\n'.format(len(body)).encode())
+		for i in range(0, len(body), chunk_size):
+			connection.sendall(body[i:i + chunk_size])
+			time.sleep(delay)
+		response = b''
+		while not response.endswith(b'}\n'):
+			data = connection.recv(65536)
+			if not data:
+				break
+			response += data
+		return response
+	finally:
+		connection.close()
+
+def test_wrong_format_no_epipe(server):
+	response = send_raw_request(server, b'x' * 60 * 1024)
+	assert response.startswith(b'HTTP/1.0 400')
+	assert b'Request body is not a valid json' in response
+
+def test_wrong_format_over_drain_size_wsgiref(server):
+	# the body isn't read, the client gets the response while sending it and the server may reset the connection
+	connection = socket.create_connection(server)
+	body = b'x' * 200 * 1024
+	def send():
+		try:
+			connection.sendall('POST /json HTTP/1.0\r\nHost: localhost\r\nContent-Type: text/plain\r\nContent-Length: {0}\r\n\r\n'.format(len(body)).encode())
+			connection.sendall(body)
+		except OSError:
+			pass
+	sender = threading.Thread(target=send, daemon=True)
+	sender.start()
+	response = b''
+	try:
+		while not response.endswith(b'}\n'):
+			data = connection.recv(65536)
+			if not data:
+				break
+			response += data
+	except ConnectionResetError:
+		pass
+	finally:
+		sender.join(1)
+		connection.close()
+	# wsgiref answers with a 500 when the application sets a hop-by-hop header like Connection
+	assert response.startswith(b'HTTP/1.0 400')
+	assert b'Request body is not a valid json' in response
@@ -0,0 +1,119 @@
+import pytest
+
+from flaskvel import Flaskvel, Validator
+from flaskvel.Compiler import Compiler
+from flaskvel.Schema import Schema
+
+from tests.test_processor_handlers import RequestMockup, mockup_files
+
+def is_even(value, **kwargs):
+	return value is not None and int(value) % 2 == 0
+
+@pytest.fixture
+def rules():
+	return {
+		'username': 'required|string|min:3|max:8',
+		'age': 'required|integer|between:18,99',
+		'score': ['nullable', 'numeric', 'size:10'],
+		'accepted': 'accepted',
+		'boolean': 'boolean',
+		'genre': 'nullable|in:thriller,fantasy,romance',
+		'banned': 'not_in:root,admin',
+		'email': 'bail|required|email|max:3',
+		'password': 'required|string|confirmed',
+		'title': 'nullable|string',
+		'description': 'required_with:title|string',
+		'upload': 'file|max:2',
+		'tags': 'array|distinct',
+		'order_number': ['numeric', is_even],
+		'profile.name': 'required|string',
+	}
+
+@pytest.fixture
+def values():
+	return [
+		{
+			'username': 'john',
+			'age': '20',
+			'score': None,
+			'accepted': 'yes',
+			'boolean': 'true',
+			'genre': 'fantasy',
+			'banned': 'guest',
+			'email': 'a@b',
+			'password': 'secret',
+			'password_confirmation': 'secret',
+			'upload': mockup_files['1kb'],
+			'tags': '[1, 2, 3]',
+			'order_number': 2,
+			'profile': {'name': 'John'},
+		},
+		{
+			'username': 'jo',
+			'age': 'old',
+			'score': '11',
+			'accepted': 'no',
+			'boolean': 'maybe',
+			'genre': 'horror',
+			'banned': 'root',
+			'email': 'not an email',
+			'password': 1234,
+			'title': 'A title',
+			'upload': mockup_files['4kb'],
+			'tags': '[1, 1]',
+			'order_number': 3,
+			'profile': '{"name": 5}',
+		},
+		{
+			'username': 'a very long username',
+			'age': 100,
+			'score': 10,
+			'email': 'a@b',
+			'password': '',
+		},
+		{},
+	]
+
+def run_validation(rules, values, compile_rules, optimize_rules=False):
+	Flaskvel._compile_rules = compile_rules
+	Flaskvel._optimize_rules = optimize_rules
+	validator = Validator(RequestMockup(form=values, json=None, files=[]))
+	validator.rules = rules
+	validator._schema = Schema.compile(rules, key='test_compiler')
+	validator._parsed_rules = validator._schema.get_parsed_rules()
+	processor = validator.get_processor()
+	result = processor._run()
+	for file in values.values():
+		if hasattr(file, 'seek'):
+			file.seek(0)
+	return result, processor.get_failed_validations(), processor.get_errors()
+
+@pytest.mark.parametrize('optimize_rules', [True, False])
+def test_compiled_matches_interpreter(rules, values, optimize_rules):
+	for data in values:
+		assert run_validation(rules, data, True, optimize_rules) == run_validation(rules, data, False, optimize_rules)
+
+def test_compiled_bail(rules, values):
+	result, failed_validations, errors = run_validation(rules, values[1], True)
+	assert result == False
+	assert list(failed_validations['email'].keys()) == ['email']
+	assert 'password' not in errors
+
+def test_compiled_bail_optimized(rules, values):
+	# max is cheaper than email and runs first
+	result, failed_validations, errors = run_validation(rules, values[1], True, optimize_rules=True)
+	assert result == False
+	assert list(failed_validations['email'].keys()) == ['max']
+	assert 'password' not in errors
+
+def test_compiled_source(rules):
+	validate = Compiler.compile(Schema(rules).get_parsed_rules())
+	assert 'isinstance(value, str)' in validate.source
+	assert 'compare_size(F0, 3, P0_2_operator0)' in validate.source
+	assert 'handler_required' not in validate.source
+
+def test_compile_invalid_params():
+	with pytest.raises(Exception):
+		Compiler.compile(Schema({'field': 'max:abc'}).get_parsed_rules())
+	with pytest.raises(Exception):
+		Compiler.compile(Schema({'field': 'misspelled_rule'}).get_parsed_rules())
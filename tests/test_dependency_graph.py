@@ -0,0 +1,101 @@
+import pytest
+
+from flaskvel import Validator
+from flaskvel.DependencyGraph import DependencyGraph
+from flaskvel.Parsers.UniversalParser import UniversalParser
+
+from flaskvel.Schema import Schema
+
+from tests.test_processor_handlers import RequestMockup, generate_processor
+
+@pytest.fixture
+def rules():
+	return {
+		'password': 'required|string|confirmed',
+		'email': 'required_without:phone|email',
+		'phone': 'required_without:email|string',
+		'country': 'required_with:city',
+		'city': 'string',
+		'min_price': 'numeric|lt:max_price',
+		'max_price': 'numeric|gt:min_price|in_array:prices',
+		'prices': 'array',
+		'shipping': 'required_if:delivery,yes',
+		'username': 'different:nickname,email',
+	}
+
+def test_references(rules):
+	graph = DependencyGraph(UniversalParser.parse(rules))
+	assert dict(graph.get_references('password')) == {'password_confirmation': ['confirmed']}
+	assert dict(graph.get_references('max_price')) == {'min_price': ['gt'], 'prices': ['in_array']}
+	assert dict(graph.get_references('username')) == {'nickname': ['different'], 'email': ['different']}
+	assert dict(graph.get_references('city')) == {}
+	assert graph.get_referrers('email') == ('phone', 'username')
+	assert graph.get_referrers('city') == ('country',)
+	assert set(graph.get_referenced_fields()) == {
+		'password_confirmation', 'phone', 'email', 'city', 'max_price', 'min_price', 'prices', 'delivery', 'nickname'}
+
+def test_resolution_order(rules):
+	graph = DependencyGraph(UniversalParser.parse(rules))
+	order = graph.get_resolution_order()
+	assert sorted(order) == sorted(graph.get_referenced_fields())
+	# references come before their referrers, unless they are part of a cycle
+	assert order.index('prices') < order.index('max_price')
+
+def test_undeclared_references(rules):
+	graph = DependencyGraph(UniversalParser.parse(rules))
+	assert set(graph.get_undeclared_references()) == {'delivery', 'nickname'}
+
+def test_cycles(rules):
+	graph = DependencyGraph(UniversalParser.parse(rules))
+	cycles = {frozenset(cycle) for cycle in graph.get_cycles()}
+	assert cycles == {frozenset(['email', 'phone']), frozenset(['min_price', 'max_price'])}
+
+	graph = DependencyGraph(UniversalParser.parse({
+		'a': 'required_with:b',
+		'b': 'required_with:c',
+		'c': 'required_with:a',
+		'd': 'required_with:a',
+	}))
+	assert [set(cycle) for cycle in graph.get_cycles()] == [{'a', 'b', 'c'}]
+	assert set(graph.get_resolution_order()) == {'a', 'b', 'c'}
+
+def test_symmetric_references():
+	graph = DependencyGraph(UniversalParser.parse({
+		'password': 'same:password_again',
+		'password_again': 'same:password',
+		'old_password': 'different:new_password',
+		'new_password': 'different:old_password|required_with:old_password',
+	}))
+	# same/different compare two values, they don't make the fields depend on each other
+	assert graph.get_cycles() == ()
+	assert set(graph.get_resolution_order()) == {'password', 'password_again', 'old_password', 'new_password'}
+	assert graph.get_resolution_order().index('old_password') < graph.get_resolution_order().index('new_password')
+
+def test_validator_dependency_graph(rules):
+	validator = Validator(RequestMockup(form={}, json=None, files=[]))
+	validator.rules = rules
+	graph = validator.get_dependency_graph()
+	assert graph is validator.get_schema().get_dependency_graph()
+	assert graph.get_referrers('city') == ('country',)
+
+def test_references_resolved_lazily(rules, monkeypatch):
+	processor = generate_processor(rules, {
+		'password': 'secret',
+		'password_confirmation': 'secret',
+		'min_price': '10',
+		'max_price': '20',
+		'prices': '["20", "30"]',
+		'email': 'a@b.c',
+		'city': '[1, 2, 3]',
+		'country': 'France',
+		'username': 'john',
+	})
+	processor._validator._schema = Schema(rules)
+	calls = []
+	infer_field_type = processor._infer_field_type
+	monkeypatch.setattr(processor, '_infer_field_type', lambda field_name: calls.append(field_name) or infer_field_type(field_name))
+	assert processor._run() == True
+	# every type is inferred once at most
+	assert sorted(calls) == sorted(set(calls))
+	# required_with only needs the presence of city, its type is inferred by its own rules
+	assert 'delivery' not in calls and 'nickname' not in calls
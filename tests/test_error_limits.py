@@ -0,0 +1,130 @@
+import pytest
+from flask import Flask
+
+from flaskvel import Flaskvel, Validator, Serializers, validate_no_validator
+from flaskvel.ErrorSerializer import ErrorSerializer
+
+from tests.test_processor_handlers import RequestMockup
+
+@pytest.fixture
+def limits():
+	def set_limits(max_failed_fields=None, max_field_errors=None, max_errors_size=None):
+		Flaskvel._max_failed_fields = max_failed_fields
+		Flaskvel._max_field_errors = max_field_errors
+		Flaskvel._max_errors_size = max_errors_size
+	return set_limits
+
+rules = {'field_{0}'.format(i): 'string|min:3|alpha' for i in range(10)}
+values = {'field_{0}'.format(i): 1 for i in range(10)}
+marker = [Flaskvel._truncation_message]
+
+def validate(rules, values):
+	validator = Validator(RequestMockup(form=values, json=None, files=[]))
+	validator.rules = rules
+	passed = validator.passes()
+	return passed, validator.get_processor()
+
+def test_without_limits(compile_rules, limits):
+	passed, processor = validate(rules, values)
+	assert passed == False
+	assert len(processor.get_errors()) == 10
+	assert Flaskvel._truncation_key not in processor.get_errors()
+
+def test_max_failed_fields(compile_rules, limits):
+	limits(max_failed_fields=3)
+	passed, processor = validate(rules, values)
+	assert passed == False
+	# the validation stopped at the third failed field
+	assert list(processor.get_failed_validations().keys()) == ['field_0', 'field_1', 'field_2']
+	errors = processor.get_errors()
+	assert list(errors.keys()) == ['field_0', 'field_1', 'field_2', Flaskvel._truncation_key]
+	assert errors[Flaskvel._truncation_key] == marker
+
+def test_max_failed_fields_not_reached(compile_rules, limits):
+	limits(max_failed_fields=3)
+	passed, processor = validate({'a': 'string', 'b': 'string'}, {'a': 1, 'b': 'ok'})
+	assert processor.get_errors() == {'a': ['The a field must be a string.']}
+
+def test_max_field_errors(compile_rules, limits):
+	limits(max_field_errors=2)
+	passed, processor = validate({'name': 'string|min:3|alpha', 'age': 'integer'}, {'name': 1, 'age': 'x'})
+	assert processor.get_errors() == {
+		'name': ['The name field must be a string.', 'The name field must be at least 3.'],
+		'age': ['The age field must be an integer.'],
+		Flaskvel._truncation_key: marker,
+	}
+
+def test_max_errors_size(compile_rules, limits):
+	passed, processor = validate(rules, values)
+	full_errors = processor.get_errors()
+	size = len(ErrorSerializer.encode(dict(list(full_errors.items())[:4], **{Flaskvel._truncation_key: marker})))
+
+	limits(max_errors_size=size)
+	passed, processor = validate(rules, values)
+	errors = processor.get_errors()
+	assert list(errors.keys()) == ['field_0', 'field_1', 'field_2', 'field_3', Flaskvel._truncation_key]
+	# every field was validated, the limit only applies to the errors returned
+	assert len(processor.get_failed_validations()) == 10
+
+def test_limits_validate_many(compile_rules, limits):
+	limits(max_failed_fields=1)
+	errors = Validator.validate_many([values, {}], rules=rules)
+	assert errors[0] == errors[1]
+	assert list(errors[0].keys()) == ['field_0', Flaskvel._truncation_key]
+
+def test_max_errors_size_not_reached(compile_rules, limits):
+	passed, processor = validate(rules, values)
+	size = len(ErrorSerializer.encode(processor.get_errors()))
+	limits(max_errors_size=size)
+	passed, processor = validate(rules, values)
+	assert Flaskvel._truncation_key not in processor.get_errors()
+
+@pytest.fixture(params=[Serializers.FLASK, Serializers.JSON, Serializers.ORJSON, 'debug'])
+def create_app(request, limits):
+	if request.param == Serializers.ORJSON:
+		pytest.importorskip('orjson')
+	def create(max_errors_size):
+		app = Flask(__name__)
+		app.debug = request.param == 'debug' # indented by flask
+		Flaskvel(app, serializer=Serializers.FLASK if request.param == 'debug' else request.param, max_errors_size=max_errors_size)
+
+		@app.route('/register', methods=['POST'])
+		@validate_no_validator({'prénom': 'integer', 'ville': 'integer', 'âge': 'integer'})
+		def register():
+			return 'ok'
+
+		return app.test_client()
+	yield create
+	ErrorSerializer.configure()
+
+@pytest.mark.parametrize('max_errors_size', [140, 180, 220, 260, 300])
+def test_max_errors_size_response(create_app, max_errors_size):
+	client = create_app(max_errors_size)
+	response = client.post('/register', json={'prénom': 'x', 'ville': 'x', 'âge': 'x'})
+	assert response.status_code == 400
+	assert len(response.data) <= max_errors_size
+	errors = response.get_json()['errors']
+	fields = [name for name in ['prénom', 'ville', 'âge'] if name in errors]
+	# the fields are left out from the last one
+	assert fields == ['prénom', 'ville', 'âge'][:len(fields)]
+	assert (Flaskvel._truncation_key in errors) == (len(fields) < 3)
+
+def test_max_errors_size_too_small(limits):
+	with pytest.raises(Exception, match='max_errors_size'):
+		Flaskvel(Flask(__name__), max_errors_size=20)
+	ErrorSerializer.configure()
+
+def test_max_errors_size_encodes(create_app, monkeypatch):
+	encode = ErrorSerializer.encode
+	calls = []
+	def counting_encode(errors):
+		calls.append(len(errors))
+		return encode(errors)
+	monkeypatch.setattr(ErrorSerializer, 'encode', staticmethod(counting_encode))
+	client = create_app(2000)
+	app_rules = {'field_{0}'.format(i): 'integer' for i in range(200)}
+	client.application.view_functions['register'] = validate_no_validator(app_rules)(lambda: 'ok')
+	response = client.post('/register', json={name: 'x' for name in app_rules})
+	assert len(response.data) <= 2000
+	# the errors aren't encoded once per field
+	assert len(calls) <= 5
@@ -0,0 +1,59 @@
+import json
+import pytest
+from flask import Flask
+
+from flaskvel import Flaskvel, Serializers, BodyFormats, validate_no_validator
+from flaskvel.ErrorSerializer import ErrorSerializer
+
+def create_app(serializer):
+	app = Flask(__name__)
+	Flaskvel(app, serializer=serializer)
+
+	@app.route('/register', methods=['POST'])
+	@validate_no_validator({'name': 'required|string', 'age': 'integer'}, messages={'name.required': 'Qui êtes-vous ?'})
+	def register():
+		return 'ok'
+
+	@app.route('/json', methods=['POST'])
+	@validate_no_validator({}, expected_body_format=BodyFormats.JSON)
+	def json_endpoint():
+		return 'ok'
+
+	return app
+
+@pytest.fixture(params=[Serializers.FLASK, Serializers.JSON, Serializers.ORJSON, lambda errors: json.dumps(errors)])
+def client(request):
+	if request.param == Serializers.ORJSON:
+		pytest.importorskip('orjson')
+	yield create_app(request.param).test_client()
+	ErrorSerializer.configure()
+
+def test_error_response(client):
+	response = client.post('/register', json={'age': 'x'})
+	assert response.status_code == 400
+	assert response.mimetype == 'application/json'
+	assert response.get_json() == {
+		'status': 'Validation failure',
+		'errors': {
+			'name': ['Qui êtes-vous ?', 'The name field must be a string.'],
+			'age': ['The age field must be an integer.'],
+		},
+	}
+
+def test_body_format_response(client):
+	response = client.post('/json', data={'name': 'John'})
+	assert response.status_code == 400
+	assert response.get_json() == {'status': 'Validation failure', 'errors': 'Request body is not a valid json'}
+
+def test_compact_response():
+	client = create_app(Serializers.JSON).test_client()
+	try:
+		response = client.post('/register', json={'name': 'John', 'age': 'x'})
+		assert response.data == '{"errors":{"age":["The age field must be an integer."]},"status":"Validation failure"}'.encode('utf-8')
+	finally:
+		ErrorSerializer.configure()
+
+def test_invalid_serializer():
+	with pytest.raises(Exception):
+		ErrorSerializer.configure('yaml')
+	ErrorSerializer.configure()
@@ -0,0 +1,61 @@
+import pytest
+
+from flaskvel import Flaskvel, Validator, FailModes
+from flaskvel.Schema import Schema
+
+from tests.test_processor_handlers import RequestMockup
+from tests.test_compiler import rules, values
+
+def run_validation(rules, values, fail_mode, compile_rules=False):
+	Flaskvel._compile_rules = compile_rules
+	validator = Validator(RequestMockup(form=values, json=None, files=[]))
+	validator.rules = rules
+	validator.fail_mode = fail_mode
+	validator._schema = Schema.compile(rules, key='test_fail_modes')
+	validator._parsed_rules = validator._schema.get_parsed_rules()
+	processor = validator.get_processor()
+	return processor._run(), processor.get_failed_validations()
+
+def test_collect_all():
+	result, failed_validations = run_validation({
+		'name': 'string|min:3|alpha',
+		'age': 'integer|min:18',
+	}, {'name': 1, 'age': 'abc'}, FailModes.COLLECT_ALL)
+	assert result == False
+	assert list(failed_validations.keys()) == ['name', 'age']
+	assert list(failed_validations['name'].keys()) == ['string', 'min', 'alpha']
+
+def test_first_per_field():
+	result, failed_validations = run_validation({
+		'name': 'string|min:3|alpha',
+		'age': 'integer|min:18',
+	}, {'name': 1, 'age': 'abc'}, FailModes.FIRST_PER_FIELD)
+	assert result == False
+	assert {field_name: list(failed.keys()) for field_name, failed in failed_validations.items()} == {
+		'name': ['string'],
+		'age': ['integer'],
+	}
+
+def test_stop_at_first():
+	result, failed_validations = run_validation({
+		'title': 'required|string',
+		'name': 'string|min:3|alpha',
+		'age': 'integer|min:18',
+	}, {'title': 'A title', 'name': 1, 'age': 'abc'}, FailModes.STOP_AT_FIRST)
+	assert result == False
+	assert {field_name: list(failed.keys()) for field_name, failed in failed_validations.items()} == {
+		'name': ['string'],
+	}
+
+def test_default_fail_mode():
+	validator = Validator(RequestMockup(form={}, json=None, files=[]))
+	assert validator.get_fail_mode() == FailModes.COLLECT_ALL
+	Flaskvel._fail_mode = FailModes.STOP_AT_FIRST
+	assert validator.get_fail_mode() == FailModes.STOP_AT_FIRST
+	validator.fail_mode = FailModes.FIRST_PER_FIELD
+	assert validator.get_fail_mode() == FailModes.FIRST_PER_FIELD
+
+@pytest.mark.parametrize('fail_mode', [FailModes.COLLECT_ALL, FailModes.FIRST_PER_FIELD, FailModes.STOP_AT_FIRST])
+def test_compiled_fail_modes(rules, values, fail_mode):
+	for data in values:
+		assert run_validation(rules, data, fail_mode, True) == run_validation(rules, data, fail_mode, False)
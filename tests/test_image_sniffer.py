@@ -0,0 +1,88 @@
+import io
+import pytest
+from PIL import Image, features
+
+from flaskvel.ImageSniffer import ImageSniffer
+
+from tests.test_processor_handlers import mockup_files
+
+def generate_image(image_format, size=(321, 123), mode='RGB', **kwargs):
+	stream = io.BytesIO()
+	Image.new(mode, size).save(stream, image_format, **kwargs)
+	stream.seek(0)
+	return stream
+
+sniffed_images = [
+	('PNG', {}, ImageSniffer.PNG),
+	('JPEG', {}, ImageSniffer.JPEG),
+	('JPEG', {'progressive': True}, ImageSniffer.JPEG),
+	('GIF', {}, ImageSniffer.GIF),
+	('BMP', {}, ImageSniffer.BMP),
+	('WEBP', {}, ImageSniffer.WEBP),
+	('WEBP', {'lossless': True}, ImageSniffer.WEBP),
+	('WEBP', {'mode': 'RGBA'}, ImageSniffer.WEBP),
+]
+
+@pytest.fixture
+def no_pillow(monkeypatch):
+	def fail(stream):
+		raise AssertionError('Pillow should not be used')
+	monkeypatch.setattr(ImageSniffer, '_read_dimensions_with_pillow', fail)
+
+@pytest.mark.parametrize('image_format,options,expected_format', sniffed_images)
+def test_sniffed_images(image_format, options, expected_format, no_pillow):
+	if image_format == 'WEBP' and not features.check('webp'):
+		pytest.skip('Pillow was built without WebP support')
+	options = dict(options)
+	mode = options.pop('mode', 'RGB')
+	stream = generate_image(image_format, mode=mode, **options)
+	assert ImageSniffer.get_format(stream) == expected_format
+	assert ImageSniffer.get_dimensions(stream) == (321, 123)
+	assert stream.tell() == 0
+
+def test_jpeg_with_large_metadata(no_pillow):
+	# the size of the image comes after the ICC profile
+	assert ImageSniffer.get_dimensions(mockup_files['image']) == (1350, 900)
+	assert ImageSniffer.get_dimensions(mockup_files['1920x1080']) == (1920, 1080)
+
+def test_pillow_fallback():
+	stream = generate_image('TIFF')
+	assert ImageSniffer.get_format(stream) is None
+	assert ImageSniffer.get_dimensions(stream) == (321, 123)
+
+def test_svg():
+	stream = io.BytesIO(b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"></svg>')
+	assert ImageSniffer.get_format(stream) == ImageSniffer.SVG
+	assert ImageSniffer.get_dimensions(stream) is None
+
+def test_svg_with_long_prolog():
+	prolog = (b'<?xml version="1.0" encoding="UTF-8"?>\n<!-- ' + b'generated by a drawing tool, ' * 100 + b'-->\n'
+		+ b'<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd" [\n'
+		+ b'<!ENTITY logo "<g>x</g>">\n]>\n')
+	assert len(prolog) > 2048
+	assert ImageSniffer.get_format(io.BytesIO(prolog + b'<svg xmlns="http://www.w3.org/2000/svg"></svg>')) == ImageSniffer.SVG
+	assert ImageSniffer.get_format(io.BytesIO(prolog + b'<html><svg></svg></html>')) is None
+	assert ImageSniffer.get_format(io.BytesIO(prolog + b'<svgx/>')) is None
+	assert ImageSniffer.get_format(io.BytesIO(b'<!-- ' + b'x' * ImageSniffer.svg_prolog_size + b' --><svg/>')) is None
+
+def test_not_images():
+	assert ImageSniffer.get_format(mockup_files['2kb']) is None
+	assert ImageSniffer.get_dimensions(mockup_files['2kb']) is None
+	assert ImageSniffer.get_format(mockup_files['0kb']) is None
+	assert ImageSniffer.get_dimensions(io.BytesIO(b'\xff\xd8\xff\xe0\x00')) is None
+	assert ImageSniffer.get_dimensions(io.BytesIO(b'\x89PNG\r\n\x1a\n')) is None
+	assert ImageSniffer.get_format(1234) is None
+	# starts like a BMP file
+	text = io.BytesIO(b'BMW 320d, 2012, diesel, 180000 km, first owner')
+	assert ImageSniffer.get_format(text) is None
+	assert ImageSniffer.get_dimensions(text) is None
+	bmp = generate_image('BMP').getvalue()
+	assert ImageSniffer.get_format(io.BytesIO(bmp[:14] + b'\x99' + bmp[15:])) is None # unknown DIB header size
+	assert ImageSniffer.get_format(io.BytesIO(bmp[:18] + b'\x00\x00\x00\x00' + bmp[22:])) is None # no width
+	assert ImageSniffer.get_dimensions(None) is None
+
+def test_position_restored():
+	stream = generate_image('PNG')
+	stream.seek(10)
+	assert ImageSniffer.get_dimensions(stream) == (321, 123)
+	assert stream.tell() == 10
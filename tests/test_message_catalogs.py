@@ -0,0 +1,160 @@
+import json
+import pytest
+
+from flaskvel import Flaskvel, Validator, FieldTypes
+from flaskvel.MessageCatalogs import MessageCatalogs
+from flaskvel.ParallelValidation import ParallelValidation
+from flaskvel.Constants.DefaultMessages import DefaultMessages
+
+from tests.test_processor_handlers import RequestMockup
+
+french = {
+	'required': 'Le champ {field_name} est obligatoire.',
+	'min': {
+		FieldTypes.NUMERIC: 'Le champ {field_name} doit être supérieur à {0}.',
+	},
+}
+
+@pytest.fixture(autouse=True)
+def catalogs():
+	yield
+	MessageCatalogs._sources.clear()
+	MessageCatalogs.clear_cache()
+
+def validate(body, rules={'name': 'required', 'age': 'integer|min:18'}, locale=None, request_locale=None):
+	request = RequestMockup(form={}, json=body, files=[])
+	request.locale = request_locale
+	validator = Validator(request)
+	validator.rules = rules
+	validator.locale = locale
+	validator.passes()
+	return validator.get_validation_errors()
+
+def test_default_catalog():
+	catalog = MessageCatalogs.get('en')
+	assert catalog['required'] == DefaultMessages['required']
+	assert MessageCatalogs.get('unknown') is catalog
+	with pytest.raises(TypeError):
+		catalog['required'] = 'Changed'
+
+def test_lazy_loading():
+	loads = []
+	def load():
+		loads.append(1)
+		return french
+	Flaskvel.register_catalog('fr', load)
+	assert loads == []
+	catalog = MessageCatalogs.get('fr')
+	assert MessageCatalogs.get('fr') is catalog
+	assert loads == [1]
+	assert catalog['required'] == french['required']
+	# the missing messages are the default ones
+	assert catalog['integer'] == DefaultMessages['integer']
+	assert catalog['min'][FieldTypes.NUMERIC] == french['min'][FieldTypes.NUMERIC]
+	assert catalog['min'][FieldTypes.STRING] == DefaultMessages['min'][FieldTypes.STRING]
+
+def test_sources(tmp_path, monkeypatch):
+	path = tmp_path / 'de.json'
+	path.write_text(json.dumps({'required': 'Das Feld {field_name} ist erforderlich.'}), encoding='utf-8')
+	(tmp_path / 'test_catalog_es.py').write_text("Messages = {'required': 'El campo {field_name} es obligatorio.'}\n", encoding='utf-8')
+	monkeypatch.syspath_prepend(str(tmp_path))
+	Flaskvel.register_catalog('de', str(path))
+	Flaskvel.register_catalog('es', 'test_catalog_es')
+	Flaskvel.register_catalog('it', {'required': 'Il campo {field_name} è obbligatorio.'})
+	assert MessageCatalogs.get('de')['required'] == 'Das Feld {field_name} ist erforderlich.'
+	assert MessageCatalogs.get('es')['required'] == 'El campo {field_name} es obligatorio.'
+	assert MessageCatalogs.get('it')['required'] == 'Il campo {field_name} è obbligatorio.'
+	with pytest.raises(Exception):
+		Flaskvel.register_catalog('nl', 42)
+
+def test_invalid_templates():
+	Flaskvel.register_catalog('fr', {'required': 'Le champ {field_name est obligatoire.'})
+	with pytest.raises(Exception, match='required'):
+		MessageCatalogs.get('fr')
+
+def test_lru_eviction(monkeypatch):
+	monkeypatch.setattr(MessageCatalogs, 'cache_size', 2)
+	for locale in ['a', 'b', 'c']:
+		Flaskvel.register_catalog(locale, dict(french))
+	first = MessageCatalogs.get('a')
+	MessageCatalogs.get('b')
+	MessageCatalogs.get('a')
+	MessageCatalogs.get('c')
+	assert list(MessageCatalogs._catalogs.keys()) == ['a', 'c']
+	assert MessageCatalogs.get('a') is first
+	assert MessageCatalogs.get('b') is not None
+	assert list(MessageCatalogs._catalogs.keys()) == ['a', 'b']
+
+def test_locale_selection():
+	Flaskvel.register_catalog('fr', french)
+	body = {'age': 10}
+	assert validate(body)['name'] == ['The name field is required.']
+	assert validate(body, locale='fr') == {
+		'name': ['Le champ name est obligatoire.'],
+		'age': ['Le champ age doit être supérieur à 18.'],
+	}
+	Flaskvel._locale_selector = lambda request: request.locale
+	assert validate(body, request_locale='fr')['name'] == ['Le champ name est obligatoire.']
+	# no locale for this request
+	assert validate(body)['name'] == ['The name field is required.']
+	Flaskvel._locale = 'fr'
+	assert validate(body)['name'] == ['Le champ name est obligatoire.']
+	assert validate(body, locale='en')['name'] == ['The name field is required.']
+
+def test_custom_messages_override_catalog():
+	Flaskvel.register_catalog('fr', french)
+	validator = Validator(RequestMockup(form={}, json={}, files=[]))
+	validator.rules = {'name': 'required'}
+	validator.messages = {'name.required': 'Nom ?'}
+	validator.locale = 'fr'
+	assert not validator.passes()
+	assert validator.get_validation_errors() == {'name': ['Nom ?']}
+
+def test_tables_shared_per_locale():
+	Flaskvel.register_catalog('fr', french)
+	class LocalizedValidator(Validator):
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.rules = {'name': 'required'}
+	tables = []
+	for locale in ['fr', 'en', 'fr', 'en']:
+		validator = LocalizedValidator(RequestMockup(form={}, json={}, files=[]))
+		validator.locale = locale
+		validator.passes()
+		validator.get_validation_errors()
+		tables.append(validator.get_processor()._message_table)
+	assert tables[0] is tables[2] and tables[1] is tables[3]
+	assert tables[0] is not tables[1]
+
+def test_validate_many_in_workers():
+	Flaskvel.register_catalog('fr', lambda: french)
+	Flaskvel._locale = 'fr'
+	records = [{'name': 'a'}, {}] * 10
+	ParallelValidation.configure(enabled=True, max_workers=2, threshold=10, chunk_size=7)
+	try:
+		errors = Validator.validate_many(records, rules={'name': 'required'})
+	finally:
+		ParallelValidation.configure()
+	assert errors[1] == {'name': ['Le champ name est obligatoire.']}
+	assert errors == Validator.validate_many(records, rules={'name': 'required'})
+
+def test_unknown_locales_share_default_table():
+	Flaskvel.register_catalog('fr', french)
+	class LocalizedValidator(Validator):
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.rules = {'name': 'required'}
+	def get_table(locale):
+		validator = LocalizedValidator(RequestMockup(form={}, json={}, files=[]))
+		validator.locale = locale
+		validator.passes()
+		assert validator.get_validation_errors()
+		schemas.append(validator.get_schema())
+		return validator.get_processor()._message_table
+	schemas = []
+	french_table = get_table('fr')
+	english_table = get_table('en')
+	tables = [get_table('xx-{0}'.format(i)) for i in range(20)]
+	assert all(table is english_table for table in tables)
+	assert get_table('fr') is french_table
+	assert list(schemas[-1]._message_tables.keys()) == ['en', 'fr']
@@ -0,0 +1,90 @@
+import pytest
+
+from flaskvel import Flaskvel, Validator, FieldTypes, validate, validate_no_validator
+from flaskvel.MessageTable import MessageTable
+from flaskvel.Parsers.UniversalParser import UniversalParser
+from flaskvel.Constants.DefaultMessages import DefaultMessages
+
+from tests.test_processor_handlers import RequestMockup, generate_processor
+
+def is_even(value, **kwargs):
+	return int(value) % 2 == 0
+
+def test_templates():
+	table = MessageTable(UniversalParser.parse({
+		'name': 'required|string|min:3',
+		'age': ['integer', is_even],
+	}), {'name.required': 'Who are you?', 'age.is_even': 'Odd age'})
+	assert table.get_templates('name') == {
+		'required': 'Who are you?',
+		'string': DefaultMessages['string'],
+		'min': DefaultMessages['min'],
+	}
+	assert table.get_templates('age')['is_even'] == 'Odd age'
+	assert table.get_templates('missing') == {}
+	assert table.get_missing() == ()
+
+def test_missing_templates():
+	Flaskvel.register_rule('test_message_table_rule', lambda **kwargs: False)
+	try:
+		table = MessageTable(UniversalParser.parse({
+			'age': ['integer', is_even],
+			'code': 'test_message_table_rule',
+		}), {})
+		assert table.get_missing() == (('age', 'is_even'), ('code', 'test_message_table_rule'))
+		assert table.get_templates('age')['is_even'] == 'Validation failed for: is_even'
+		with pytest.warns(UserWarning, match='age.is_even, code.test_message_table_rule'):
+			table.warn_missing()
+	finally:
+		del Flaskvel._registered_rules['test_message_table_rule']
+
+def test_fallback_is_escaped():
+	assert MessageTable.get_fallback('{0}').format() == 'Validation failed for: {0}'
+
+def test_type_variant_messages():
+	processor = generate_processor(rules={'name': 'string|min:3', 'tags': 'min:2'}, values={'name': 'ab', 'tags': None})
+	assert processor._run() == False
+	assert processor.get_errors() == {
+		'name': ['The name field must have more than 3 characters.'],
+		'tags': ['The tags field must be at least 2.'],
+	}
+	assert processor.get_field_type('tags') == FieldTypes.UNKOWN
+
+def test_table_shared_between_validators():
+	class MessagesValidator(Validator):
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.rules = {'name': 'required'}
+			self.messages = {'name.required': 'Who are you?'}
+
+	tables = []
+	for _ in range(2):
+		validator = MessagesValidator(RequestMockup(form={}, json=None, files=[]))
+		assert validator.passes() == False
+		assert validator.get_validation_errors() == {'name': ['Who are you?']}
+		tables.append(validator.get_processor()._message_table)
+	assert tables[0] is tables[1]
+
+def test_get_missing_messages():
+	class MissingValidator(Validator):
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.rules = {'age': ['integer', is_even], 'name': 'string'}
+
+	with pytest.warns(UserWarning):
+		assert MissingValidator.get_missing_messages() == (('age', 'is_even'),)
+
+def test_missing_messages_reported_on_startup():
+	with pytest.warns(UserWarning, match='age.is_even'):
+		validate_no_validator({'age': ['integer', is_even]})
+
+def test_validator_missing_messages_reported_on_startup():
+	class StartupValidator(Validator):
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.rules = {'code': ['integer', is_even]}
+
+	with pytest.warns(UserWarning, match='code.is_even'):
+		@validate(StartupValidator)
+		def view():
+			return 'ok'
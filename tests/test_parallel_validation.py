@@ -0,0 +1,74 @@
+import pickle
+import multiprocessing
+import pytest
+
+from flaskvel import Flaskvel, Validator, TimezoneProviders
+from flaskvel.Schema import Schema
+from flaskvel.ParallelValidation import ParallelValidation
+from flaskvel.Timezones import Timezones
+from flaskvel.UrlChecker import UrlChecker
+
+rules = {
+	'sku': 'required|string|size:8',
+	'price': 'required|numeric|min:0',
+	'tags.*': 'string|max:5',
+}
+
+records = [
+	{'sku': 'SKU{0:05d}'.format(i), 'price': -1 if i % 7 == 0 else i, 'tags': ['ok', 'too long'] if i % 5 == 0 else ['ok']}
+	for i in range(50)
+]
+
+@pytest.fixture
+def parallel(compile_rules):
+	ParallelValidation.configure(enabled=True, max_workers=2, threshold=10, chunk_size=7)
+	yield
+	ParallelValidation.configure()
+
+def test_schema_pickle():
+	schema = Schema({'name': 'required|regex:/^a+$/', 'items.*.price': 'numeric'})
+	schema.get_compiled()
+	copy = pickle.loads(pickle.dumps(schema))
+	assert dict(copy.get_parsed_rules()) == dict(schema.get_parsed_rules())
+	assert copy.get_wildcard_groups().keys() == schema.get_wildcard_groups().keys()
+	assert copy.get_compiled() is not schema.get_compiled()
+
+def test_parallel_validation(parallel):
+	errors = Validator.validate_many(records, rules=rules, messages={'price.min': 'Negative price'})
+	ParallelValidation.enabled = False
+	assert errors == Validator.validate_many(records, rules=rules, messages={'price.min': 'Negative price'})
+	assert len(errors) == len(records)
+	assert errors[14] == {'price': ['Negative price']}
+	assert errors[15] == {'tags.1': ['The tags.1 field must have less than 5 characters.']}
+	assert errors[1] == {}
+
+def test_parallel_validation_threshold(parallel):
+	assert ParallelValidation.should_run(records)
+	assert not ParallelValidation.should_run(records[:9])
+	# the records of generators can't be split
+	assert not ParallelValidation.should_run(record for record in records)
+
+def test_parallel_validation_unpicklable_rules(parallel):
+	# rules that can't be sent to other processes are validated in this one
+	schema = Schema({'price': [lambda value, **kwargs: value != -1]})
+	assert ParallelValidation.run(schema, None, records, Validator._validate_in_worker) is None
+	errors = Validator.validate_many(records, rules={'price': [lambda value, **kwargs: value != -1]})
+	assert errors[7] == {'price': ['Validation failed for: <lambda>']}
+
+def has_parent_settings(value, **kwargs):
+	return (Timezones._provider == TimezoneProviders.ZONEINFO and UrlChecker.timeout == 1.5
+		and UrlChecker.cache_by_host and Flaskvel._max_field_errors == 2)
+
+def test_parallel_validation_settings():
+	# spawned workers don't inherit the configuration of this process
+	ParallelValidation.configure(enabled=True, max_workers=1, threshold=10, chunk_size=25, mp_context=multiprocessing.get_context('spawn'))
+	Timezones.configure(TimezoneProviders.ZONEINFO)
+	UrlChecker.configure(timeout=1.5, cache_by_host=True)
+	Flaskvel._max_field_errors = 2
+	try:
+		errors = Validator.validate_many(records, rules={'sku': [has_parent_settings]})
+	finally:
+		ParallelValidation.configure()
+		Timezones.configure()
+		UrlChecker.configure()
+	assert errors == [{}] * len(records)
@@ -1,9 +1,14 @@
+import re
+from datetime import datetime
 import pytest
 
 from flaskvel.Parsers.ArrayParser import ArrayParser
 from flaskvel.Parsers.PipedStringParser import PipedStringParser
 from flaskvel.Parsers.UniversalParser import UniversalParser
+from flaskvel.Parsers.ArrayLiteralParser import ArrayLiteralParser
+from flaskvel.Parsers.DateParser import DateParser
 from flaskvel.ParsedRule import ParsedRule
+from flaskvel.DimensionConstraints import DimensionConstraints
 from flaskvel import Rules
 
 @pytest.fixture
@@ -45,3 +50,84 @@ def test_PipedString_parse(piped_string_rules, expected_parsed_rules):
 def test_UniversalParser_parse(array_rules, piped_string_rules, expected_parsed_rules):
 	assert UniversalParser.parse(array_rules) == expected_parsed_rules
 	assert UniversalParser.parse(piped_string_rules) == expected_parsed_rules
+
+def test_ArrayParser_parse_regex():
+	parsed_rules = ArrayParser.parse([r'regex:^\d{1,3},\d{2}:[a-z]+$', r'not_regex:^(a|b)$'])
+	assert parsed_rules == [ParsedRule('regex', [r'^\d{1,3},\d{2}:[a-z]+$']), ParsedRule('not_regex', [r'^(a|b)$'])]
+	assert isinstance(parsed_rules[0].get_compiled_params()[0], re.Pattern)
+	assert parsed_rules[0].get_compiled_params()[0].match('123,45:abc') is not None
+	assert parsed_rules[1].get_compiled_params()[0].match('b') is not None
+
+def test_ArrayParser_parse_precompiled_regex():
+	pattern = re.compile(r'^[a-z]+$', re.IGNORECASE)
+	parsed_rules = ArrayParser.parse([ParsedRule(Rules.REGEX, [pattern])])
+	assert parsed_rules[0].get_compiled_params() == [pattern]
+
+def test_ArrayParser_parse_invalid_regex():
+	with pytest.raises(Exception, match='invalid pattern'):
+		ArrayParser.parse(['regex:^[a-z+$'])
+
+def test_ArrayLiteralParser_parse():
+	assert ArrayLiteralParser.parse('[]') == []
+	assert ArrayLiteralParser.parse(' [0, 1.5, -2, 1e3] ') == [0, 1.5, -2, 1000.0]
+	assert ArrayLiteralParser.parse('["a", \'b\', "c\\"d", \'e\\\'f\', "\\u0041"]') == ['a', 'b', 'c"d', "e'f", 'A']
+	assert ArrayLiteralParser.parse('[true, false, null, True, False, None]') == [True, False, None, True, False, None]
+	assert ArrayLiteralParser.parse('[[1, [2]], {"a": [3], "b": {}}, 4,]') == [[1, [2]], {'a': [3], 'b': {}}, 4]
+
+@pytest.mark.parametrize('text', [
+	'', '[', ']', '[1,,2]', '[,]', '[1 2]', '{"a": 1}', '"[1]"', '[1] 2', '[truex]', '[{"a" 1}]', '[{[1]: 2}]', '[1}', None, 1,
+])
+def test_ArrayLiteralParser_parse_invalid(text):
+	with pytest.raises(ValueError):
+		ArrayLiteralParser.parse(text)
+
+def test_ArrayLiteralParser_parse_value():
+	assert ArrayLiteralParser.parse_value('5') == 5
+	assert ArrayLiteralParser.parse_value("'a'") == 'a'
+	assert ArrayLiteralParser.parse_value('None') is None
+	assert ArrayLiteralParser.parse_value("{'a': [1]}") == {'a': [1]}
+	assert ArrayLiteralParser.parse_value('[1]') == [1]
+	for text in ['abc', '5 6', '{"a": 1']:
+		with pytest.raises(ValueError):
+			ArrayLiteralParser.parse_value(text)
+
+def test_ArrayLiteralParser_parse_limits():
+	assert ArrayLiteralParser.parse('[[[1]]]', max_depth=3) == [[[1]]]
+	with pytest.raises(ValueError, match='deeper'):
+		ArrayLiteralParser.parse('[[[[1]]]]', max_depth=3)
+	with pytest.raises(ValueError, match='items'):
+		ArrayLiteralParser.parse('[1, 2, [3]]', max_items=3)
+	with pytest.raises(ValueError, match='longer'):
+		ArrayLiteralParser.parse('[1, 2, 3]', max_length=8)
+	with pytest.raises(ValueError, match='deeper'):
+		ArrayLiteralParser.parse('[' * 100000)
+
+def test_ArrayParser_parse_dates():
+	parsed_rules = ArrayParser.parse(['after:2020-07-10', 'before:July 20 2020 10:00', 'date_equals:10:00'])
+	assert parsed_rules[0].get_compiled_params() == [datetime(2020, 7, 10)]
+	assert parsed_rules[1].get_compiled_params() == [datetime(2020, 7, 20, 10, 0)]
+	# depends on the current day, parsed on every request
+	assert parsed_rules[2].get_compiled_params() == ['10:00']
+	with pytest.raises(Exception, match='invalid date'):
+		ArrayParser.parse(['after:not a date'])
+
+def test_ArrayParser_parse_dimensions():
+	parsed_rules = ArrayParser.parse(['dimensions:min_width=100,max_height=200,ratio=3/2'])
+	constraints = parsed_rules[0].get_compiled_params()[0]
+	assert isinstance(constraints, DimensionConstraints)
+	assert (constraints.min_width, constraints.max_height, constraints.ratio) == (100, 200, (3, 2))
+	assert constraints.get_params() == ['min_width=100', 'max_height=200', 'ratio=3/2']
+	assert constraints.check(150, 100) == True
+	assert constraints.check(99, 66) == False
+	assert constraints.check(300, 201) == False
+	assert constraints.check(151, 100) == False
+
+@pytest.mark.parametrize('rule', ['dimensions:min_width=abc', 'dimensions:depth=3', 'dimensions:width=100px', 'dimensions:ratio=16/0', 'dimensions:ratio=1.5'])
+def test_ArrayParser_parse_invalid_dimensions(rule):
+	with pytest.raises(Exception, match='Invalid parameters'):
+		ArrayParser.parse([rule])
+
+def test_DateParser_parse():
+	assert DateParser.parse('2020-07-10') == datetime(2020, 7, 10)
+	assert DateParser.parse('2020-07-10T10:00:00+00:00') == DateParser.parse('July 10 2020 10:00 UTC')
+	assert DateParser.parse('10 July 2020') == datetime(2020, 7, 10)
@@ -1,11 +1,13 @@
 import pytest
 
 from flaskvel.Processor import Processor
-from flaskvel import Validator
-from flaskvel import FieldTypes
+from flaskvel import Flaskvel, Validator, BodyFormats
+from flaskvel import FieldTypes, FailModes
 from flaskvel.ParsedRule import ParsedRule
+from flaskvel.Parsers.ArrayLiteralParser import ArrayLiteralParser
+from flaskvel.Parsers.UniversalParser import UniversalParser
 
-from tests.test_processor_handlers import generate_processor, mockup_files
+from tests.test_processor_handlers import generate_processor, mockup_files, RequestMockup
 
 def generic_test(data, func):
 	count = len(data['input'])
@@ -393,3 +395,87 @@ def test_should_bail(should_bail_data):
 	generic_test(should_bail_data, 'should_bail')
 
 # ==================================================================================================== #
+
+def test_field_values_resolved_once():
+	processor = generate_processor(rules={'user.name': 'required'}, values={'user': '{"name": "John"}'})
+	assert processor.get_field_value('user.name') == 'John'
+	assert processor.is_field_present('user') == True
+	processor._request.form = {}
+	assert processor.get_field_value('user.name') == 'John'
+	assert processor.is_field_present('user') == True
+	assert processor.get_field_value('missing') is None
+	assert processor.is_field_present('missing') == False
+
+# ==================================================================================================== #
+
+def test_field_type_inferred_once(monkeypatch):
+	calls = []
+	parse = ArrayLiteralParser.parse
+	def counting_parse(value):
+		calls.append(value)
+		return parse(value)
+	monkeypatch.setattr(ArrayLiteralParser, 'parse', counting_parse)
+
+	processor = generate_processor(rules={'field': 'array|size:3|starts_with:0'}, values={'field': '[0,1,2]'})
+	assert processor.get_field_type('field') == FieldTypes.ARRAY
+	assert processor.get_field_type('field') == FieldTypes.ARRAY
+	assert processor.handler_size(field_name='field', value='[0,1,2]', params=['3']) == True
+	assert processor.handler_max(field_name='field', value='[0,1,2]', params=['2']) == False
+	assert processor.handler_starts_with(field_name='field', value='[0,1,2]', params=[0]) == True
+	assert len(calls) == 1
+
+# ==================================================================================================== #
+
+def test_errors_rendered_when_read(monkeypatch):
+	rendered = []
+	generate_errors = Processor._generate_errors
+	def counting_generate_errors(self, field_name):
+		rendered.append(field_name)
+		return generate_errors(self, field_name)
+	monkeypatch.setattr(Processor, '_generate_errors', counting_generate_errors)
+
+	processor = generate_processor(rules={'name': 'string|min:3', 'age': 'integer'}, values={'name': 'ab', 'age': 'x'})
+	assert processor._run() == False
+	assert list(processor.get_failed_validations().keys()) == ['name', 'age']
+	assert rendered == []
+	assert processor.get_errors() == {
+		'name': ['The name field must have more than 3 characters.'],
+		'age': ['The age field must be an integer.'],
+	}
+	assert processor.get_errors() is processor.get_errors()
+	assert rendered == ['name', 'age']
+
+def test_validator_passes(monkeypatch):
+	monkeypatch.setattr(Processor, '_generate_errors', lambda self, field_name: pytest.fail('messages rendered'))
+	validator = Validator(RequestMockup(json=None, form={'name': 'ab'}, files=[]))
+	validator.rules = {'name': 'string|min:3'}
+	assert validator.passes() == False
+	assert validator.fails() == True
+	validator = Validator(RequestMockup(json=None, form={'name': 'abc'}, files=[]))
+	validator.rules = {'name': 'string|min:3'}
+	assert validator.passes() == True
+
+def test_validator_passes_body_format():
+	validator = Validator(RequestMockup(json=None, form={'name': 'abc'}, files=[]), BodyFormats.JSON)
+	validator.rules = {'name': 'string|min:3'}
+	assert validator.passes() == False
+	assert validator.fails() == True
+	assert validator.get_validation_errors() == 'Request body is not a valid json'
+	with pytest.raises(Flaskvel._exception_class) as e:
+		validator.validate()
+	assert e.value.args[0] == 'Request body is not a valid json'
+	validator = Validator(RequestMockup(json={'name': 'abc'}, form={}, files=[]), BodyFormats.JSON)
+	validator.rules = {'name': 'string|min:3'}
+	assert validator.passes() == True
+	assert validator.get_validation_errors() == {}
+
+def test_plan_field():
+	rules = UniversalParser.parse({'field': 'bail|nullable|required|integer|min:1'})['field']
+	plan = Processor.plan_field(rules, FailModes.FIRST_PER_FIELD)
+	plan_rules, nullable, stop, first_per_field, checks = plan
+	assert plan_rules is rules
+	assert (nullable, stop, first_per_field) == (True, True, True)
+	assert [check[1] for check in checks] == ['required', 'integer', 'min']
+	# required still runs on None values, the other rules are skipped
+	assert [check[6] for check in checks] == [False, True, True]
+	assert Processor.plan_field(rules[2:])[1:4] == (False, False, False)
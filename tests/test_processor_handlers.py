@@ -57,6 +57,12 @@ mockup_files = {
 		content_type='image/webp',
 		name='field'
 	),
+	'fake_image': FileStorage(
+		stream=open('tests/files/file_alphabet', 'rb'),
+		filename='tests/files/file_alphabet.png',
+		content_type='image/png',
+		name='field'
+	),
 	'1280x720': FileStorage(
 		stream=open('tests/files/photo2.jpg', 'rb'),
 		filename='tests/files/photo2.jpg',
@@ -1194,14 +1200,41 @@ def pass_data_distinct():
 
 @pytest.fixture
 def fail_data_distinct():
-	return {
-		'rules': {
-			'field': 'distinct'
+	return [
+		{
+			'rules': {
+				'field': 'distinct'
+			},
+			'values': {
+				'field': [1,1,2,3]
+			}
 		},
-		'values': {
-			'field': [1,1,2,3]
+		{
+			'rules': {
+				'field': 'distinct'
+			},
+			'values': {
+				'field': '[1, 1]'
+			}
+		},
+		# literals that aren't arrays
+		{
+			'rules': {
+				'field': 'distinct'
+			},
+			'values': {
+				'field': '5'
+			}
+		},
+		{
+			'rules': {
+				'field': 'distinct'
+			},
+			'values': {
+				'field': "{'a': 1}"
+			}
 		}
-	}
+	]
 
 def test_handler_distinct(pass_data_distinct, fail_data_distinct):
 	generic_test(pass_data_distinct, fail_data_distinct)
@@ -1794,6 +1827,14 @@ def fail_data_image():
 				'field': None
 			}
 		},
+		{
+			'rules': {
+				'field': 'image'
+			},
+			'values': {
+				'field': mockup_files['fake_image']
+			}
+		},
 		{
 			'rules': {
 				'field': 'image'
@@ -0,0 +1,96 @@
+from flaskvel import Flaskvel, Validator, FailModes
+from flaskvel.Schema import Schema
+from flaskvel.RuleOptimizer import RuleOptimizer
+from flaskvel.Parsers.UniversalParser import UniversalParser
+
+from tests.test_processor_handlers import RequestMockup
+
+def is_even(value, **kwargs):
+	return int(value) % 2 == 0
+
+def get_predicates(rules):
+	return [parsed_rule.get_predicate() for parsed_rule in rules]
+
+def run_validation(rules, values, optimize_rules, fail_mode=FailModes.COLLECT_ALL):
+	Flaskvel._optimize_rules = optimize_rules
+	validator = Validator(RequestMockup(form=values, json=None, files=[]))
+	validator.rules = rules
+	validator.fail_mode = fail_mode
+	validator._schema = Schema(rules)
+	validator._parsed_rules = validator._schema.get_parsed_rules()
+	processor = validator.get_processor()
+	return processor._run(), processor.get_failed_validations(), processor.get_errors()
+
+def test_optimize_field():
+	rules = UniversalParser.parse({
+		'website': 'active_url|string|max:255',
+		'avatar': 'dimensions:min_width=10|image|nullable|file|max:100',
+		'password': ['regex:^[a-z]+$', is_even, 'min:8', 'required', 'confirmed', 'string'],
+		'start': 'date|after:2020-01-01|same:begin|integer',
+	})
+	optimized = RuleOptimizer.optimize(rules)
+	assert get_predicates(optimized['website']) == ['string', 'max', 'active_url']
+	assert get_predicates(optimized['avatar']) == ['nullable', 'file', 'dimensions', 'image', 'max']
+	assert get_predicates(optimized['password']) == ['required', 'confirmed', 'string', 'min', 'regex', is_even]
+	assert get_predicates(optimized['start']) == ['same', 'integer', 'date', 'after']
+
+def test_ip_rules_cost():
+	optimized = RuleOptimizer.optimize(UniversalParser.parse({
+		'v4': 'date|ipv4',
+		'v6': 'image|ipv6',
+	}))
+	assert get_predicates(optimized['v4']) == ['ipv4', 'date']
+	assert get_predicates(optimized['v6']) == ['ipv6', 'image']
+
+def test_registered_rules_cost():
+	Flaskvel.register_rule('string', lambda **kwargs: True)
+	optimized = RuleOptimizer.optimize(UniversalParser.parse({'field': 'string|regex:^a$'}))
+	assert get_predicates(optimized['field']) == ['regex', 'string']
+
+def test_errors_order():
+	rules = {'field': 'regex:^a+$|alpha_num|string|min:5'}
+	values = {'field': '#'}
+	result, failed_validations, errors = run_validation(rules, values, True)
+	assert result == False
+	assert list(failed_validations['field'].keys()) == ['regex', 'alpha_num', 'min']
+	assert (result, failed_validations, errors) == run_validation(rules, values, False)
+
+def test_fail_mode_skips_expensive_rules(monkeypatch):
+	calls = []
+	monkeypatch.setattr('flaskvel.Processor.UrlChecker.is_active', lambda url: calls.append(url) or False)
+	rules = {'website': 'bail|active_url|string|max:255'}
+	result, failed_validations, errors = run_validation(rules, {'website': 1234}, True)
+	assert result == False
+	assert list(failed_validations['website'].keys()) == ['string']
+	assert calls == []
+
+	result, failed_validations, errors = run_validation(rules, {'website': 1234}, False)
+	assert list(failed_validations['website'].keys()) == ['active_url']
+	assert calls == [1234]
+
+def test_disabled():
+	schema = Schema({'field': 'active_url|string'})
+	assert Flaskvel._optimize_rules == False
+	assert schema.get_execution_rules() is schema.get_parsed_rules()
+	Flaskvel._optimize_rules = True
+	assert get_predicates(schema.get_execution_rules()['field']) == ['string', 'active_url']
+	Flaskvel._optimize_rules = False
+	assert get_predicates(schema.get_parsed_rules()['field']) == ['active_url', 'string']
+
+def test_size_rules_after_type_rules():
+	optimized = RuleOptimizer.optimize(UniversalParser.parse({
+		'tags': 'bail|array|max:3',
+		'codes': 'max:3|json',
+		'avatar': 'max:100|image',
+		'name': 'min:2|regex:^a+$',
+	}))
+	assert get_predicates(optimized['tags']) == ['bail', 'array', 'max']
+	assert get_predicates(optimized['codes']) == ['json', 'max']
+	assert get_predicates(optimized['avatar']) == ['image', 'max']
+	# no rule declares the type
+	assert get_predicates(optimized['name']) == ['min', 'regex']
+
+def test_bail_type_error_kept():
+	rules = {'tags': 'bail|array|max:3'}
+	assert run_validation(rules, {'tags': 'abc'}, True)[2] == {'tags': ['The tags field must be an array.']}
+	assert run_validation(rules, {'tags': 'abc'}, True) == run_validation(rules, {'tags': 'abc'}, False)
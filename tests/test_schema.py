@@ -0,0 +1,91 @@
+import pytest
+
+from flaskvel import Validator, ParsedRule
+from flaskvel.Schema import Schema
+
+from tests.test_processor_handlers import RequestMockup
+
+class CachedValidator(Validator):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.rules = {
+			'username': 'required|string',
+			'password': ['required', 'min:8'],
+		}
+
+class BoundRuleValidator(Validator):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.rules = {
+			'username': ['required', self.is_valid_username],
+		}
+
+	def is_valid_username(self, **kwargs):
+		return True
+
+def generate_validator(validator_class, values):
+	return validator_class(RequestMockup(form=values, json=None, files=[]))
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+	Schema.clear_cache()
+	yield
+	Schema.clear_cache()
+
+def test_schema_shared_between_instances():
+	validator_a = generate_validator(CachedValidator, {'username': 'john', 'password': '12345678'})
+	validator_b = generate_validator(CachedValidator, {'username': 'jane', 'password': '87654321'})
+	assert validator_a.validate() == True
+	assert validator_b.validate() == True
+	assert validator_a.get_schema() is validator_b.get_schema()
+	assert validator_a.get_parsed_rules() is validator_b.get_parsed_rules()
+	assert validator_a.get_parsed_rules()['password'] == (ParsedRule('required'), ParsedRule('min', ['8']))
+
+def test_schema_is_frozen():
+	schema = Schema.compile({'field': 'required'}, key='frozen')
+	with pytest.raises(TypeError):
+		schema.get_parsed_rules()['field'] = []
+
+def test_schema_recompiled_when_rules_change():
+	schema_a = Schema.compile({'field': 'required'}, key='changing')
+	schema_b = Schema.compile({'field': 'required'}, key='changing')
+	schema_c = Schema.compile({'field': 'required|string'}, key='changing')
+	assert schema_a is schema_b
+	assert schema_a is not schema_c
+	assert schema_c.get_parsed_rules()['field'] == (ParsedRule('required'), ParsedRule('string'))
+
+def test_schema_not_shared_with_bound_rules():
+	validator_a = generate_validator(BoundRuleValidator, {'username': 'john'})
+	validator_b = generate_validator(BoundRuleValidator, {'username': 'jane'})
+	assert validator_a.validate() == True
+	assert validator_b.validate() == True
+	assert validator_a.get_schema() is not validator_b.get_schema()
+	assert not validator_a.get_schema().is_cacheable()
+	assert validator_b.get_parsed_rules()['username'][1].get_predicate().__self__ is validator_b
+
+class LocalRuleValidator(Validator):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		def is_valid_username(**kwargs):
+			return True
+		self.rules = {
+			'username': ['required', is_valid_username, ParsedRule(lambda **kwargs: True)],
+		}
+
+def is_valid_username(**kwargs):
+	return True
+
+def test_schema_not_cached_with_local_rules():
+	validator = generate_validator(LocalRuleValidator, {'username': 'john'})
+	assert validator.validate() == True
+	assert not validator.get_schema().is_cacheable()
+	assert LocalRuleValidator not in Schema._cache
+	assert Schema.compile({'username': [is_valid_username, len]}, key='module_level').is_cacheable()
+
+def test_schema_cache_eviction(monkeypatch):
+	monkeypatch.setattr(Schema, 'cache_size', 2)
+	first = Schema.compile({'field': 'required'}, key='a')
+	Schema.compile({'field': 'required'}, key='b')
+	assert Schema.compile({'field': 'required'}, key='a') is first
+	Schema.compile({'field': 'required'}, key='c')
+	assert list(Schema._cache.keys()) == ['a', 'c']
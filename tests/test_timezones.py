@@ -0,0 +1,30 @@
+import pytest
+
+from flaskvel import TimezoneProviders
+from flaskvel.Timezones import Timezones
+
+@pytest.fixture(autouse=True)
+def reset_provider():
+	yield
+	Timezones.configure(TimezoneProviders.PYTZ)
+
+@pytest.mark.parametrize('provider', [TimezoneProviders.PYTZ, TimezoneProviders.ZONEINFO])
+def test_timezones_is_valid(provider):
+	Timezones.configure(provider)
+	assert Timezones.is_valid('Europe/Bucharest') == True
+	assert Timezones.is_valid('America/New_York') == True
+	assert Timezones.is_valid('Europe/Nowhere') == False
+	assert Timezones.is_valid(None) == False
+	assert Timezones.is_valid(['UTC']) == False
+
+def test_timezones_preload():
+	Timezones.configure(TimezoneProviders.ZONEINFO, preload=True)
+	assert Timezones._index is not None
+	index = Timezones.get_index()
+	assert isinstance(index, frozenset)
+	Timezones.configure(TimezoneProviders.ZONEINFO)
+	assert Timezones.get_index() is index
+
+def test_timezones_invalid_provider():
+	with pytest.raises(Exception):
+		Timezones.configure('unknown')
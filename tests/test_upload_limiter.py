@@ -0,0 +1,151 @@
+import io
+import socket
+import threading
+import pytest
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+from flask import Flask, request
+
+from flaskvel import Flaskvel, validate_no_validator
+from flaskvel.Schema import Schema
+from flaskvel.UploadLimiter import UploadLimiter
+
+rules = {
+	'name': 'required|string',
+	'avatar': 'file|max:5',
+	'document': 'nullable|file|between:1,20',
+}
+
+@pytest.fixture(params=[True, False])
+def limit_uploads(request):
+	return request.param
+
+@pytest.fixture
+def client(limit_uploads):
+	app = Flask(__name__)
+	Flaskvel(app, limit_uploads=limit_uploads)
+
+	@app.route('/upload', methods=['POST'])
+	@validate_no_validator(rules)
+	def upload():
+		return 'ok'
+
+	@app.after_request
+	def remaining_body(response):
+		response.headers['X-Remaining-Body'] = str(len(request.stream.read()))
+		return response
+
+	return app.test_client()
+
+def post(client, avatar_size, document_size=2048):
+	return client.post('/upload', data={
+		'name': 'John',
+		'avatar': (io.BytesIO(b'a' * avatar_size), 'avatar.png'),
+		'document': (io.BytesIO(b'd' * document_size), 'document.pdf'),
+	})
+
+def test_upload_within_limit(client):
+	response = post(client, 5 * 1024)
+	assert response.status_code == 200
+	assert response.headers['X-Remaining-Body'] == '0'
+
+def test_upload_over_limit(client):
+	response = post(client, 1024 * 1024)
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == {'avatar': ['The avatar file must be smaller than 5 kBs.']}
+	if Flaskvel._limit_uploads:
+		# the upload is aborted after the first chunk read by the parser
+		assert int(response.headers['X-Remaining-Body']) > 900 * 1024
+		assert 'Connection' not in response.headers
+	else:
+		assert response.headers['X-Remaining-Body'] == '0'
+
+def test_upload_on_the_edge(client):
+	# 5.5 kilobytes round to 6, the rule fails although the upload isn't aborted
+	response = post(client, 5 * 1024 + 512)
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == {'avatar': ['The avatar file must be smaller than 5 kBs.']}
+	assert response.headers['X-Remaining-Body'] == '0'
+
+def test_upload_between(client):
+	response = post(client, 1024, 30 * 1024)
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == {'document': ['The document field must be between 1 and 20 kilobytes.']}
+
+def test_get_limits():
+	limits = Schema({
+		'avatar': 'file|max:5',
+		'image': 'image|max:10|size:8',
+		'document': 'file|between:1,20',
+		'digits': 'file|numeric|max:5',
+		'text': 'string|max:5',
+		'nested.file': 'file|max:5',
+		'invalid': 'file|max:abc',
+	}).get_upload_limits()
+	assert {field_name: limit[0] for field_name, limit in limits.items()} == {
+		'avatar': 5 * 1024 + 512,
+		'image': 8 * 1024 + 512,
+		'document': 20 * 1024 + 512,
+	}
+	assert limits['image'][1].get_predicate() == 'size'
+
+def test_install_small_body():
+	app = Flask(__name__)
+	limits = Schema(rules).get_upload_limits()
+	with app.test_request_context('/', method='POST', data={'avatar': (io.BytesIO(b'a' * 1024), 'avatar.png')}):
+		UploadLimiter.install(request, limits)
+		assert 'form_data_parser_class' not in request.__dict__
+	with app.test_request_context('/', method='POST', data={'avatar': (io.BytesIO(b'a' * 10 * 1024), 'avatar.png')}):
+		UploadLimiter.install(request, limits)
+		assert 'form_data_parser_class' in request.__dict__
+
+def test_unsupported_werkzeug(client, monkeypatch):
+	# the stock parser is kept, the rules still reject the file once it was received
+	monkeypatch.setattr(UploadLimiter, '_supported', False)
+	response = post(client, 1024 * 1024)
+	assert response.status_code == 400
+	assert response.get_json()['errors'] == {'avatar': ['The avatar file must be smaller than 5 kBs.']}
+	assert response.headers['X-Remaining-Body'] == '0'
+
+class QuietRequestHandler(WSGIRequestHandler):
+	def log_message(self, *args):
+		pass
+
+def test_upload_over_limit_wsgiref():
+	app = Flask(__name__)
+	Flaskvel(app)
+
+	@app.route('/upload', methods=['POST'])
+	@validate_no_validator(rules)
+	def upload():
+		return 'ok'
+
+	httpd = make_server('127.0.0.1', 0, app, handler_class=QuietRequestHandler)
+	thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+	thread.start()
+	body = (b'--boundary\r\nContent-Disposition: form-data; name="avatar"; filename="avatar.png"\r\n'
+		+ b'Content-Type: image/png\r\n\r\n' + b'a' * 1024 * 1024 + b'\r\n--boundary--\r\n')
+	connection = socket.create_connection(httpd.server_address)
+	def send():
+		try:
+			connection.sendall('POST /upload HTTP/1.0\r\nHost: localhost\r\nContent-Type: multipart/form-data; boundary=boundary\r\nContent-Length: {0}\r\n\r\n'.format(len(body)).encode())
+			connection.sendall(body)
+		except OSError:
+			pass
+	sender = threading.Thread(target=send, daemon=True)
+	sender.start()
+	response = b''
+	try:
+		while not response.endswith(b'}\n'):
+			data = connection.recv(65536)
+			if not data:
+				break
+			response += data
+	except ConnectionResetError:
+		pass
+	finally:
+		sender.join(1)
+		connection.close()
+		httpd.shutdown()
+		httpd.server_close()
+	assert response.startswith(b'HTTP/1.0 400')
+	assert b'The avatar file must be smaller than 5 kBs.' in response
@@ -0,0 +1,137 @@
+import time
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from flaskvel import FailModes
+from flaskvel.UrlChecker import UrlChecker
+
+from tests.test_processor_handlers import generate_processor
+
+class RequestHandler(BaseHTTPRequestHandler):
+	hits = []
+
+	def do_HEAD(self):
+		RequestHandler.hits.append(self.path)
+		if self.path == '/slow':
+			time.sleep(1)
+		self.send_response(404 if self.path == '/missing' else 200)
+		self.send_header('Content-Length', '0')
+		self.end_headers()
+
+	def log_message(self, *args):
+		pass
+
+@pytest.fixture(scope='module')
+def server():
+	httpd = ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+	thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+	thread.start()
+	yield 'http://127.0.0.1:{0}'.format(httpd.server_address[1])
+	httpd.shutdown()
+	httpd.server_close()
+
+@pytest.fixture(autouse=True)
+def checker():
+	UrlChecker.configure()
+	RequestHandler.hits.clear()
+	yield
+	UrlChecker.configure()
+
+def test_is_active(server):
+	assert UrlChecker.is_active(server + '/ok') == True
+	assert UrlChecker.is_active(server + '/missing') == False
+	assert UrlChecker.is_active('not an url') == False
+	assert UrlChecker.is_active(None) == False
+	assert UrlChecker.is_active(['unhashable']) == False
+
+def test_timeout(server):
+	UrlChecker.configure(timeout=0.2)
+	start = time.monotonic()
+	assert UrlChecker.is_active(server + '/slow') == False
+	assert time.monotonic() - start < 0.9
+	with pytest.raises(Exception):
+		UrlChecker.configure(timeout=None)
+
+def test_cache(server):
+	assert UrlChecker.is_active(server + '/ok') == True
+	assert UrlChecker.is_active(server + '/ok') == True
+	assert UrlChecker.is_active(server + '/missing') == False
+	assert UrlChecker.is_active(server + '/missing') == False
+	assert RequestHandler.hits == ['/ok', '/missing']
+
+def test_cache_disabled(server):
+	UrlChecker.configure(cache_ttl=0)
+	UrlChecker.is_active(server + '/ok')
+	UrlChecker.is_active(server + '/ok')
+	assert RequestHandler.hits == ['/ok', '/ok']
+
+def test_cache_expiration(server):
+	UrlChecker.configure(cache_ttl=0.1)
+	UrlChecker.is_active(server + '/ok')
+	time.sleep(0.2)
+	UrlChecker.is_active(server + '/ok')
+	assert RequestHandler.hits == ['/ok', '/ok']
+
+def test_cache_eviction(server):
+	UrlChecker.configure(cache_size=1)
+	UrlChecker.is_active(server + '/ok')
+	UrlChecker.is_active(server + '/missing')
+	UrlChecker.is_active(server + '/ok')
+	assert RequestHandler.hits == ['/ok', '/missing', '/ok']
+
+def test_cache_by_host(server):
+	UrlChecker.configure(cache_by_host=True)
+	assert UrlChecker.is_active(server + '/ok') == True
+	assert UrlChecker.is_active(server + '/missing') == True
+	assert RequestHandler.hits == ['/ok']
+
+def test_check_many(server):
+	UrlChecker.configure(timeout=2)
+	start = time.monotonic()
+	results = UrlChecker.check_many([server + '/slow?a', server + '/slow?b', server + '/missing', server + '/slow?a'])
+	assert time.monotonic() - start < 1.9
+	assert results == {server + '/slow?a': True, server + '/slow?b': True, server + '/missing': False}
+	assert len(RequestHandler.hits) == 3
+
+def test_parallel_checks(server):
+	UrlChecker.configure(timeout=2, parallel_checks=True)
+	processor = generate_processor({'a': 'active_url', 'b': 'active_url', 'c': 'nullable|active_url'},
+		{'a': server + '/slow?a', 'b': server + '/slow?b', 'c': server + '/missing'})
+	start = time.monotonic()
+	assert processor._run() == False
+	assert time.monotonic() - start < 1.9
+	assert list(processor.get_failed_validations().keys()) == ['c']
+	assert len(RequestHandler.hits) == 3
+
+def test_parallel_checks_without_cache(server):
+	UrlChecker.configure(cache_ttl=0, parallel_checks=True)
+	processor = generate_processor({'a': 'active_url', 'b': 'active_url'}, {'a': server + '/ok?a', 'b': server + '/missing'})
+	assert processor._run() == False
+	# the prefetched results are used by the rules, every URL is requested once
+	assert sorted(RequestHandler.hits) == ['/missing', '/ok?a']
+
+def test_parallel_checks_fail_modes(server):
+	UrlChecker.configure(parallel_checks=True)
+	body = {'a': server + '/ok?a', 'b': server + '/ok?b', 'c': server + '/ok?c'}
+	# a fails integer, its URL is never requested
+	processor = generate_processor({'a': 'integer|active_url', 'c': 'active_url'}, body)
+	processor._validator.fail_mode = FailModes.FIRST_PER_FIELD
+	processor._run()
+	assert processor._active_urls == {}
+	assert RequestHandler.hits == ['/ok?c']
+	RequestHandler.hits.clear()
+	UrlChecker.clear_cache()
+	# b fails integer and bails, c is never validated
+	processor = generate_processor({'a': 'integer|active_url', 'b': 'bail|integer|active_url', 'c': 'active_url'}, body)
+	processor._run()
+	assert processor._active_urls == {}
+	assert RequestHandler.hits == ['/ok?a']
+
+def test_configure_closes_session():
+	session = UrlChecker.get_session()
+	closed = []
+	session.close = lambda: closed.append(True)
+	UrlChecker.configure()
+	assert closed == [True]
+	assert UrlChecker.get_session() is not session
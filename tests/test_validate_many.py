@@ -0,0 +1,67 @@
+import pytest
+
+from flaskvel import Flaskvel, Validator, FailModes
+
+from tests.test_processor_handlers import RequestMockup
+from tests.test_compiler import rules, values
+
+class ProductValidator(Validator):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.rules = {
+			'sku': 'required|string|size:8',
+			'price': 'required|numeric|min:0',
+			'stock': 'nullable|integer',
+			'category': 'required|in:books,music',
+			'details.color': 'nullable|string',
+		}
+		self.messages = {
+			'sku.size': 'Invalid SKU',
+		}
+
+records = [
+	{'sku': 'SKU00001', 'price': 10, 'stock': None, 'category': 'books'},
+	{'sku': 'SKU2', 'price': -1, 'stock': 'abc', 'category': 'food'},
+	{'sku': 'SKU00003', 'price': '5.5', 'category': 'music', 'details': {'color': 5}},
+	{},
+	'not a record',
+]
+
+def validate_one(validator_class, record, rules=None):
+	validator = validator_class(RequestMockup(form={}, json=record if isinstance(record, dict) else {}, files=[]))
+	if rules is not None:
+		validator.rules = rules
+	try:
+		validator.validate()
+		return {}
+	except Flaskvel._exception_class as e:
+		return e.args[0]
+
+def test_validate_many(compile_rules):
+	errors = ProductValidator.validate_many(records)
+	assert errors == [validate_one(ProductValidator, record) for record in records]
+	assert errors[0] == {}
+	assert errors[1]['sku'] == ['Invalid SKU']
+	assert set(errors[3].keys()) == {'sku', 'price', 'category'}
+	assert errors[4] == errors[3]
+
+def test_validate_many_generator(compile_rules):
+	errors = ProductValidator.validate_many((record for record in records), chunk_size=2)
+	assert errors == ProductValidator.validate_many(records)
+
+def test_validate_many_rules(compile_rules, rules, values):
+	data = [{key: value for key, value in record.items() if key != 'upload'} for record in values]
+	assert Validator.validate_many(data, rules=rules) == [validate_one(Validator, record, rules) for record in data]
+
+@pytest.mark.parametrize('fail_mode', [FailModes.FIRST_PER_FIELD, FailModes.STOP_AT_FIRST])
+def test_validate_many_fail_modes(compile_rules, fail_mode):
+	errors = ProductValidator.validate_many(records, fail_mode=fail_mode)
+	for record, record_errors in zip(records, errors):
+		validator = ProductValidator(RequestMockup(form={}, json=record if isinstance(record, dict) else {}, files=[]))
+		validator.fail_mode = fail_mode
+		try:
+			validator.validate()
+			assert record_errors == {}
+		except Flaskvel._exception_class as e:
+			assert record_errors == e.args[0]
+	assert len(errors[1]) == (1 if fail_mode == FailModes.STOP_AT_FIRST else 4)
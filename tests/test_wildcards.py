@@ -0,0 +1,121 @@
+import pytest
+
+from flaskvel import Flaskvel, Validator, FailModes
+from flaskvel.WildcardFields import WildcardFields
+from flaskvel.Parsers.UniversalParser import UniversalParser
+
+from tests.test_processor_handlers import RequestMockup
+
+def validate(rules, body, messages=None, fail_mode=None):
+	validator = Validator(RequestMockup(form={}, json=body, files=[]))
+	validator.rules = rules
+	if messages is not None:
+		validator.messages = messages
+	validator.fail_mode = fail_mode
+	try:
+		validator.validate()
+		return {}
+	except Flaskvel._exception_class as e:
+		return e.args[0]
+
+order_rules = {
+	'customer': 'required|string',
+	'items': 'required|array',
+	'items.*.price': 'required|numeric|min:0',
+	'items.*.name': 'required|string',
+	'items.*.tags.*': 'string|max:5',
+}
+
+def test_group():
+	groups = WildcardFields.group(UniversalParser.parse(order_rules))
+	assert list(groups.keys()) == ['items.*.price', 'items.*.name', 'items.*.tags.*']
+	assert groups['items.*.name'] is None and groups['items.*.tags.*'] is None
+	list_field, fields = groups['items.*.price']
+	assert list_field == 'items'
+	assert [(field_name, keys) for field_name, keys, rules in fields] == [
+		('items.*.price', ('price',)),
+		('items.*.name', ('name',)),
+		('items.*.tags.*', ('tags', '*')),
+	]
+
+def test_expand():
+	element = {'price': 3, 'tags': ['a', 'b']}
+	assert list(WildcardFields.expand(element, ('price',), 'items.0')) == [('items.0.price', 3)]
+	assert list(WildcardFields.expand(element, ('tags', '*'), 'items.0')) == [('items.0.tags.0', 'a'), ('items.0.tags.1', 'b')]
+	assert list(WildcardFields.expand(element, ('missing', '*'), 'items.0')) == []
+	assert list(WildcardFields.expand(element, ('missing', 'key'), 'items.0')) == [('items.0.missing.key', None)]
+
+def test_wildcards(compile_rules):
+	errors = validate(order_rules, {
+		'customer': 'John',
+		'items': [
+			{'price': 10, 'name': 'Book', 'tags': ['new']},
+			{'price': -1, 'name': 'Pen', 'tags': ['office', 'ok']},
+			{'price': '3', 'name': 5},
+			{'name': 'Ink'},
+		],
+	}, fail_mode=FailModes.FIRST_PER_FIELD)
+	assert errors == {
+		'items.1.price': ['The items.1.price field must be greater than 0.'],
+		'items.1.tags.0': ['The items.1.tags.0 field must have less than 5 characters.'],
+		'items.2.name': ['The items.2.name field must be a string.'],
+		'items.3.price': ['The items.3.price field is required.'],
+	}
+
+def test_wildcards_without_list(compile_rules):
+	assert validate({'items.*.price': 'required|numeric'}, {}) == {}
+	assert validate({'items.*.price': 'required|numeric'}, {'items': 'abc'}) == {}
+	assert validate({'items.*': 'integer'}, {'items': [1, 'a']}) == {'items.1': ['The items.1 field must be an integer.']}
+
+def test_wildcards_nested_list_field(compile_rules):
+	errors = validate({'order.items.*.id': 'integer'}, {'order': {'items': [{'id': 1}, {'id': 'x'}]}})
+	assert errors == {'order.items.1.id': ['The order.items.1.id field must be an integer.']}
+
+def test_wildcards_form():
+	validator = Validator(RequestMockup(form={'items': '[{"price": 1}, {"price": "x"}]'}, json=None, files=[]))
+	validator.rules = {'items.*.price': 'numeric'}
+	with pytest.raises(Flaskvel._exception_class) as e:
+		validator.validate()
+	assert e.value.args[0] == {'items.1.price': ['The items.1.price field must be a number.']}
+
+def test_wildcards_messages(compile_rules):
+	errors = validate({'items.*.price': 'required'}, {'items': [{}]}, messages={'items.*.price.required': 'Every item needs a price'})
+	assert errors == {'items.0.price': ['Every item needs a price']}
+
+def test_wildcards_fail_modes(compile_rules):
+	body = {'items': [{'price': 'a'}, {'price': 'b'}], 'name': 1}
+	rules = {'items.*.price': 'numeric|min:1', 'name': 'string'}
+	assert list(validate(rules, body, fail_mode=FailModes.STOP_AT_FIRST).keys()) == ['items.0.price']
+	assert list(validate(rules, body).keys()) == ['items.0.price', 'items.1.price', 'name']
+	assert list(validate({'items.*.price': 'bail|numeric', 'name': 'string'}, body).keys()) == ['items.0.price']
+
+def test_wildcards_field_type(compile_rules):
+	# the rules of the wildcard field declare the type of its elements
+	errors = validate({'items.*.tags': 'array|max:1'}, {'items': [{'tags': ['a', 'b']}]})
+	assert errors == {'items.0.tags': ['The items.0.tags field must have less than 1 items.']}
+
+def test_wildcards_concrete_fields(compile_rules):
+	assert validate({'items.0.price': 'required|integer'}, {'items': [{'price': 'a'}]}) == {
+		'items.0.price': ['The items.0.price field must be an integer.'],
+	}
+	assert validate({'items.1': 'present'}, {'items': [1]}) == {'items.1': ['The items.1 field must be present.']}
+
+def test_wildcards_validate_many(compile_rules):
+	records = [{'items': [{'price': 1}]}, {'items': [{'price': 'a'}]}]
+	assert Validator.validate_many(records, rules={'items.*.price': 'numeric'}) == [
+		{},
+		{'items.0.price': ['The items.0.price field must be a number.']},
+	]
+
+def test_wildcards_large_list(compile_rules):
+	items = [{'price': i} for i in range(100000)]
+	items[50000]['price'] = 'x'
+	validator = Validator(RequestMockup(form={}, json={'items': items}, files=[]))
+	validator.rules = {'items.*.price': 'required|integer'}
+	with pytest.raises(Flaskvel._exception_class) as e:
+		validator.validate()
+	assert list(e.value.args[0].keys()) == ['items.50000.price']
+	# the values of the elements aren't kept once validated, except the failed ones for their messages
+	processor = validator.get_processor()
+	assert len(processor._field_values) < 5
+	assert processor._wildcard_patterns == {'items.50000.price': 'items.*.price'}